@@ -2,9 +2,13 @@ from sqlalchemy.orm import Session
 from backend.schemas.Auth_Schema import UserCreate, VerifyOTPAndCreateUser
 from backend.Models.Auth_models import User, OTP
 from fastapi import HTTPException, status
+from backend.logging_config import redact_email
 import bcrypt
+import logging
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 def hash_password(password: str) -> str:
     """Hash password using bcrypt"""
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
@@ -58,11 +62,11 @@ def store_otp(db: Session, email: str, otp: str):
         
         db.add(otp_record)
         db.commit()
-        print(f"OTP stored successfully for {email}")
+        logger.info("OTP stored", extra={"recipient": redact_email(email)})
         
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Error storing OTP: {str(e)}")
+        logger.exception("Error storing OTP", extra={"recipient": redact_email(email)})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to store OTP"
@@ -126,12 +130,12 @@ def verify_otp_and_create_user(db: Session, user_data: VerifyOTPAndCreateUser):
         db.commit()
         db.refresh(db_user)
         
-        print(f"User created successfully: {db_user.email} with role: {db_user.role}")
+        logger.info("User created", extra={"user_id": db_user.id, "role": db_user.role})
         return db_user
         
-    except Exception as e:
+    except Exception:
         db.rollback()
-        print(f"Error creating user: {str(e)}")
+        logger.exception("Error creating user")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create user"
@@ -142,7 +146,7 @@ def cleanup_expired_otps(db: Session):
     try:
         expired_count = db.query(OTP).filter(OTP.expires_at <= datetime.utcnow()).delete()
         db.commit()
-        print(f"Cleaned up {expired_count} expired OTPs")
-    except Exception as e:
+        logger.info("Cleaned up expired OTPs", extra={"deleted": expired_count})
+    except Exception:
         db.rollback()
-        print(f"Error cleaning up OTPs: {str(e)}")
\ No newline at end of file
+        logger.exception("Error cleaning up OTPs")
\ No newline at end of file
@@ -0,0 +1,96 @@
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from Models.Application_models import Application, InterestStatus
+from Models.Dashboard_models import DashboardCounter
+
+COUNTER_FIELDS = ['sent_decks', 'received_decks', 'interested', 'not_interested']
+
+def compute_counts(db: Session, user_id: int) -> dict:
+    """Count dashboard totals for a user straight from the source tables"""
+    sent_decks = db.query(func.count(Application.id)).filter(Application.startup_id == user_id).scalar()
+    received_decks = db.query(func.count(Application.id)).filter(Application.investor_id == user_id).scalar()
+
+    interest_rows = db.query(InterestStatus.status, func.count(InterestStatus.id)).filter(
+        or_(InterestStatus.startup_id == user_id, InterestStatus.investor_id == user_id)
+    ).group_by(InterestStatus.status).all()
+    interest_counts = dict(interest_rows)
+
+    return {
+        "sent_decks": sent_decks or 0,
+        "received_decks": received_decks or 0,
+        "interested": interest_counts.get("interested", 0),
+        "not_interested": interest_counts.get("not_interested", 0)
+    }
+
+def get_or_create_counter(db: Session, user_id: int) -> DashboardCounter:
+    """Get the counter row for a user, seeding it from the source tables if missing"""
+    counter = db.query(DashboardCounter).filter(DashboardCounter.user_id == user_id).first()
+    if counter:
+        return counter
+
+    # Two first writers for the same user (two startups sending to one investor)
+    # both get here; the insert must not fail for whichever comes second
+    values = {"user_id": user_id, **compute_counts(db, user_id)}
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        db.execute(insert(DashboardCounter).values(**values).on_conflict_do_nothing(index_elements=["user_id"]))
+    else:
+        try:
+            with db.begin_nested():
+                db.add(DashboardCounter(**values))
+        except IntegrityError:
+            pass
+    return db.query(DashboardCounter).filter(DashboardCounter.user_id == user_id).one()
+
+def bump_counters(db: Session, user_id: int, **deltas):
+    """
+    Apply relative changes to a user's counters without committing.
+    Call this before adding the row being counted so a freshly seeded counter
+    does not include it twice; the caller's commit makes both changes atomic.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    get_or_create_counter(db, user_id)
+
+    # Increment in SQL so concurrent writers don't lose updates
+    db.query(DashboardCounter).filter(DashboardCounter.user_id == user_id).update(
+        {getattr(DashboardCounter, field): getattr(DashboardCounter, field) + delta for field, delta in deltas.items()},
+        synchronize_session=False
+    )
+
+def interest_deltas(old_status, new_status) -> dict:
+    """Counter changes for an interest status moving from old_status to new_status"""
+    deltas = {}
+    if old_status == new_status:
+        return deltas
+    if old_status in ('interested', 'not_interested'):
+        deltas[old_status] = deltas.get(old_status, 0) - 1
+    if new_status in ('interested', 'not_interested'):
+        deltas[new_status] = deltas.get(new_status, 0) + 1
+    return deltas
+
+def find_counter_drift(db: Session, fix: bool = False) -> list:
+    """
+    Compare every stored counter row with the source tables.
+    Returns one entry per drifted user; with fix=True the rows are corrected and committed.
+    """
+    drifted = []
+    counters = db.query(DashboardCounter).all()
+    for counter in counters:
+        actual = compute_counts(db, counter.user_id)
+        stored = {field: getattr(counter, field) for field in COUNTER_FIELDS}
+        if stored != actual:
+            drifted.append({"user_id": counter.user_id, "stored": stored, "actual": actual})
+            if fix:
+                for field, value in actual.items():
+                    setattr(counter, field, value)
+
+    if fix and drifted:
+        db.commit()
+    return drifted
@@ -0,0 +1,28 @@
+import os
+import uuid
+from sqlalchemy.orm import Session
+from Models.Startup_profile_models import StartupProfile, PitchDeckVersion
+
+PITCH_DECK_DIR = "uploads/pitch_decks"
+
+def new_pitch_deck_key(user_id: int, filename: str) -> str:
+    """Storage key for a new upload; unique per version, so a stored deck is never overwritten"""
+    return f"{PITCH_DECK_DIR}/{user_id}_{uuid.uuid4().hex[:12]}_{os.path.basename(filename)}"
+
+def add_pitch_deck_version(db: Session, profile: StartupProfile, file_key: str, filename: str,
+                           file_size: int, content_type: str) -> PitchDeckVersion:
+    """Record a stored deck as a new version and make it the profile's current deck; the caller commits"""
+    version = PitchDeckVersion(
+        user_id=profile.user_id,
+        filename=filename,
+        file_path=file_key,
+        file_size=file_size,
+        content_type=content_type
+    )
+    db.add(version)
+    profile.pitch_deck_version = version
+    profile.pitch_deck_filename = filename
+    profile.pitch_deck_file_path = file_key
+    profile.pitch_deck_file_size = file_size
+    profile.pitch_deck_content_type = content_type
+    return version
@@ -0,0 +1,62 @@
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from Models.Auth_models import RefreshToken, RevokedSession
+from token_revocation import revocation_list
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def new_session_id() -> str:
+    """Id shared by the access and refresh tokens of one login"""
+    return uuid.uuid4().hex
+
+def issue_refresh_token(db: Session, user_id: int, session_id: str, expire_days: int) -> str:
+    """Create a refresh token and store its hash; the caller commits"""
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(token),
+        session_id=session_id,
+        expires_at=datetime.utcnow() + timedelta(days=expire_days)
+    ))
+    return token
+
+def find_refresh_token(db: Session, token: str) -> Optional[RefreshToken]:
+    return db.query(RefreshToken).filter(RefreshToken.token_hash == hash_refresh_token(token)).first()
+
+def rotate_refresh_token(db: Session, token: str, reuse_grace_seconds: float,
+                         access_token_ttl: timedelta) -> Optional[RefreshToken]:
+    """
+    Mark a refresh token as used and return it; the caller issues the
+    replacement and commits. Returns None for unknown, expired or already used
+    tokens. A token presented again after the grace period (which covers two
+    tabs refreshing at once) means it was copied, so its session is revoked.
+    """
+    now = datetime.utcnow()
+    row = find_refresh_token(db, token)
+    if row is None or row.expires_at <= now:
+        return None
+
+    # Conditional update, so of two concurrent refreshes only one wins
+    claimed = db.query(RefreshToken).filter(
+        RefreshToken.id == row.id,
+        RefreshToken.rotated_at.is_(None)
+    ).update({"rotated_at": now}, synchronize_session=False)
+    if claimed:
+        return row
+
+    if row.rotated_at is not None and (now - row.rotated_at).total_seconds() > reuse_grace_seconds:
+        revoke_session(db, row.session_id, access_token_ttl)
+    return None
+
+def revoke_session(db: Session, session_id: str, access_token_ttl: timedelta):
+    """Delete the session's refresh tokens and refuse its access tokens until they expire; commits"""
+    expires_at = datetime.utcnow() + access_token_ttl
+    db.query(RefreshToken).filter(RefreshToken.session_id == session_id).delete(synchronize_session=False)
+    db.add(RevokedSession(session_id=session_id, expires_at=expires_at))
+    db.commit()
+    revocation_list.add(session_id, expires_at)
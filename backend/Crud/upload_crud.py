@@ -0,0 +1,61 @@
+import json
+import os
+from sqlalchemy import exists
+from sqlalchemy.orm import Session
+from Models.Application_models import Application
+from Models.Startup_profile_models import StartupProfile, Founder, PitchDeckVersion
+from Models.Investor_profile_models import InvestorProfile
+from image_pipeline import variant_keys
+from storage import storage_key
+
+# Columns holding a path or URL of an uploaded file
+FILE_REFERENCE_COLUMNS = [
+    StartupProfile.pitch_deck_file_path,
+    Application.pitch_deck_file_path,
+    InvestorProfile.profile_photo_file_path,
+    Founder.photo_url,
+]
+
+def _path_keys(path: str) -> set:
+    """Storage keys a stored path can resolve to, including the pitch deck download fallback"""
+    return {storage_key(path), f"uploads/pitch_decks/{os.path.basename(path)}"}
+
+def referenced_upload_keys(db: Session, batch_size: int = 1000) -> set:
+    """Every storage key referenced by a profile, founder or application row"""
+    keys = set()
+    for column in FILE_REFERENCE_COLUMNS:
+        rows = db.query(column).filter(column.isnot(None)).distinct().yield_per(batch_size)
+        for (path,) in rows:
+            keys |= _path_keys(path)
+
+    variant_rows = db.query(InvestorProfile.profile_photo_variants).filter(
+        InvestorProfile.profile_photo_variants.isnot(None)
+    ).yield_per(batch_size)
+    for (variants,) in variant_rows:
+        try:
+            keys |= variant_keys(json.loads(variants))
+        except ValueError:
+            continue
+    return keys
+
+def still_referenced(db: Session, keys: list) -> set:
+    """
+    Re-check candidate keys against the path columns right before deleting,
+    so a file that was re-uploaded and committed during a scan is kept.
+    """
+    paths = set(keys) | {f"/{key}" for key in keys}
+    found = set()
+    for column in FILE_REFERENCE_COLUMNS:
+        for (path,) in db.query(column).filter(column.in_(paths)).distinct():
+            found.add(storage_key(path))
+    return found
+
+def delete_orphaned_versions(db: Session, keys: list) -> int:
+    """Drop version rows of deleted deck files that no profile or application pins; commits"""
+    deleted = db.query(PitchDeckVersion).filter(
+        PitchDeckVersion.file_path.in_(keys),
+        ~exists().where(StartupProfile.pitch_deck_version_id == PitchDeckVersion.id),
+        ~exists().where(Application.pitch_deck_version_id == PitchDeckVersion.id)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
@@ -1,7 +1,34 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+import logging
 import os
+import threading
+import time
+from instrumentation import instrument_engine, TimedQueuePool, READ_ROUTING_TOTAL
+
+logger = logging.getLogger(__name__)
+
+# Connection pool (QueuePool), for PostgreSQL and file-based SQLite
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))
+
+# SQLite connection settings, applied to every new connection
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Optional read replica for read-heavy GET endpoints (get_read_db). After a user's
+# request commits a write, that user's reads go to the primary for
+# READ_AFTER_WRITE_SECONDS so they see their own changes despite replication lag.
+# The window is tracked per worker (memory) or shared through Redis (redis).
+READ_AFTER_WRITE_SECONDS = float(os.getenv("READ_AFTER_WRITE_SECONDS", "5"))
+READ_AFTER_WRITE_STORE = os.getenv("READ_AFTER_WRITE_STORE", "memory").lower()
 
 # Get DATABASE_URL from environment
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -13,32 +40,235 @@ if not DATABASE_URL:
     project_root = os.path.dirname(os.path.dirname(current_dir))
     db_path = os.path.join(project_root, "startup_investor.db")
     DATABASE_URL = f"sqlite:///{db_path}"
-    print("Warning: DATABASE_URL not set, using SQLite database")
+    logger.warning("DATABASE_URL not set, using SQLite database")
 
 # For Render, if DATABASE_URL starts with 'postgres://', convert to 'postgresql://'
 if DATABASE_URL and DATABASE_URL.startswith('postgres://'):
     DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
 
-print(f"Using DATABASE_URL: {DATABASE_URL}")
-
-# Configure engine with SSL for production PostgreSQL
-if DATABASE_URL and 'postgresql' in DATABASE_URL:
-    engine = create_engine(
-        DATABASE_URL,
-        pool_pre_ping=True,
-        pool_recycle=300,
-        connect_args={
-            "sslmode": "require" if os.getenv("ENVIRONMENT") == "production" else "prefer"
-        }
-    )
-else:
-    engine = create_engine(DATABASE_URL)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+if DATABASE_READ_URL and DATABASE_READ_URL.startswith('postgres://'):
+    DATABASE_READ_URL = DATABASE_READ_URL.replace('postgres://', 'postgresql://', 1)
+
+def set_sqlite_pragmas(engine, journal_mode=SQLITE_JOURNAL_MODE, synchronous=SQLITE_SYNCHRONOUS,
+                       busy_timeout_ms=SQLITE_BUSY_TIMEOUT_MS, mmap_size=SQLITE_MMAP_SIZE):
+    """
+    WAL lets readers run alongside the single writer, synchronous=NORMAL only
+    syncs at checkpoints (safe in WAL mode), and busy_timeout makes a writer
+    wait for the lock instead of failing with "database is locked".
+    """
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        cursor.close()
+
+def create_configured_engine(database_url: str):
+    """Engine with the pool and connection settings above"""
+    url = make_url(database_url)
+    pool_args = {
+        "poolclass": TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE
+    }
+    if url.get_backend_name() == "postgresql":
+        # Configure engine with SSL for production PostgreSQL
+        return create_engine(
+            url,
+            pool_pre_ping=True,
+            connect_args={
+                "sslmode": "require" if os.getenv("ENVIRONMENT") == "production" else "prefer"
+            },
+            **pool_args
+        )
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases live in a single connection; keep SQLAlchemy's default pool
+            return create_engine(url)
+        # Connections are checked out on one threadpool thread and may be used on another
+        engine = create_engine(url, connect_args={"check_same_thread": False}, **pool_args)
+        set_sqlite_pragmas(engine)
+        return engine
+    return create_engine(url, pool_pre_ping=True, **pool_args)
+
+_engine = None
+_read_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """The primary engine, built on first use so importing this module stays cheap"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                logger.info("Using database", extra={"database_url": make_url(DATABASE_URL).render_as_string(hide_password=True)})
+                new_engine = create_configured_engine(DATABASE_URL)
+                # Attribute SQL statement count and time to the current request
+                instrument_engine(new_engine)
+                _engine = new_engine
+    return _engine
+
+def get_read_engine():
+    """The replica engine when DATABASE_READ_URL is set, otherwise the primary"""
+    global _read_engine
+    if not DATABASE_READ_URL:
+        return get_engine()
+    if _read_engine is None:
+        with _engine_lock:
+            if _read_engine is None:
+                logger.info("Using read replica", extra={"database_url": make_url(DATABASE_READ_URL).render_as_string(hide_password=True)})
+                new_engine = create_configured_engine(DATABASE_READ_URL)
+                instrument_engine(new_engine)
+                _read_engine = new_engine
+    return _read_engine
+
+def _reset_engines_in_child():
+    # A worker forked from a process that already opened connections (gunicorn --preload)
+    # must not reuse the parent's sockets; close=False leaves them to the parent
+    global _engine_lock
+    _engine_lock = threading.Lock()
+    for existing in (_engine, _read_engine):
+        if existing is not None:
+            existing.dispose(close=False)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+os.register_at_fork(after_in_child=_reset_engines_in_child)
+
+def __getattr__(name):
+    # `from Database.db import engine` still works and builds the engine at that point
+    if name == "engine":
+        return get_engine()
+    if name == "read_engine":
+        return get_read_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class PrimarySession(Session):
+    """Session bound to the primary engine on first use"""
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        return self.bind if self.bind is not None else get_engine()
+
+
+SessionLocal = sessionmaker(class_=PrimarySession, autocommit=False, autoflush=False)
 Base = declarative_base()
 
-def get_db():
+
+class MemoryRecentWriters:
+    def __init__(self):
+        self._until = {}  # user id -> end of the window on the monotonic clock
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: int, seconds: float):
+        now = time.monotonic()
+        with self._lock:
+            self._until[user_id] = now + seconds
+            if len(self._until) > 10000:
+                self._until = {uid: until for uid, until in self._until.items() if until > now}
+
+    def is_recent(self, user_id: int) -> bool:
+        return self._until.get(user_id, 0) > time.monotonic()
+
+
+class RedisRecentWriters:
+    def __init__(self, url: str):
+        # Imported here: redis-py is only needed for this store and is slow to import
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("READ_AFTER_WRITE_STORE=redis requires the redis package (pip install redis)")
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5)
+        self._errors = redis.RedisError
+
+    def mark(self, user_id: int, seconds: float):
+        try:
+            self.client.set(f"recent_write:{user_id}", 1, px=int(seconds * 1000))
+        except self._errors as e:
+            logger.warning("Failed to record a recent write", extra={"error": str(e)})
+
+    def is_recent(self, user_id: int) -> bool:
+        try:
+            return bool(self.client.exists(f"recent_write:{user_id}"))
+        except self._errors:
+            # Unknown, so read from the primary
+            return True
+
+
+if READ_AFTER_WRITE_STORE == "redis":
+    recent_writers = RedisRecentWriters(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+else:
+    recent_writers = MemoryRecentWriters()
+
+
+if DATABASE_READ_URL:
+    # Note which request sessions committed writes; sessions opened outside a request are ignored
+
+    @event.listens_for(SessionLocal, "after_flush")
+    def _flushed(session, flush_context):
+        session.info["wrote"] = True
+
+    @event.listens_for(SessionLocal, "do_orm_execute")
+    def _bulk_write(orm_execute_state):
+        # query.update()/delete() don't flush
+        if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+            orm_execute_state.session.info["wrote"] = True
+
+    @event.listens_for(SessionLocal, "after_commit")
+    def _committed(session):
+        request = session.info.get("request")
+        user_id = getattr(request.state, "user_id", None) if request is not None else None
+        if session.info.pop("wrote", False) and user_id is not None:
+            recent_writers.mark(user_id, READ_AFTER_WRITE_SECONDS)
+
+    @event.listens_for(SessionLocal, "after_rollback")
+    def _rolled_back(session):
+        session.info.pop("wrote", None)
+
+
+class ReadSession(Session):
+    """
+    Session for read-only request handlers. The first statement picks the
+    engine: the replica, or the primary if the request's user wrote within
+    READ_AFTER_WRITE_SECONDS. The choice holds for the rest of the session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        bind = self.info.get("bind")
+        if bind is None:
+            if DATABASE_READ_URL:
+                request = self.info.get("request")
+                user_id = getattr(request.state, "user_id", None) if request is not None else None
+                use_primary = user_id is not None and recent_writers.is_recent(user_id)
+                bind = get_engine() if use_primary else get_read_engine()
+                READ_ROUTING_TOTAL.inc(("primary" if use_primary else "replica",))
+            else:
+                bind = get_engine()
+            self.info["bind"] = bind
+        return bind
+
+
+ReadSessionLocal = sessionmaker(class_=ReadSession, autocommit=False, autoflush=False)
+
+def get_db(request: Request = None):
     db = SessionLocal()
+    # Lets the commit hooks attribute writes to the request's user
+    db.info["request"] = request
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_db(request: Request):
+    """
+    Session for GET endpoints that only read; uses DATABASE_READ_URL when set.
+    Don't write through it.
+    """
+    db = ReadSessionLocal()
+    db.info["request"] = request
     try:
         yield db
     finally:
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
@@ -10,6 +10,7 @@ class Application(Base):
     investor_id = Column(Integer, ForeignKey("users.id"))
     pitch_deck_filename = Column(String, nullable=False)
     pitch_deck_file_path = Column(String, nullable=False)
+    pitch_deck_version_id = Column(Integer, ForeignKey("pitch_deck_versions.id"), nullable=True)  # Deck as it was when sent
     status = Column(String, default="sent")  # sent, viewed, interested, rejected, etc.
     sent_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -19,6 +20,12 @@ class Application(Base):
     startup = relationship("User", foreign_keys=[startup_id])
     investor = relationship("User", foreign_keys=[investor_id])
     logs = relationship("ApplicationLog", back_populates="application")
+    pitch_deck_version = relationship("PitchDeckVersion")
+
+    __table_args__ = (
+        # Serves the duplicate-send check and the available-investors anti-join
+        Index("ix_applications_startup_investor", "startup_id", "investor_id"),
+    )
 
 class InterestStatus(Base):
     __tablename__ = "interest_status"
@@ -39,7 +46,7 @@ class ApplicationLog(Base):
     application_id = Column(Integer, ForeignKey("applications.id"))
     action = Column(String, nullable=False)  # sent, viewed, interested, etc.
     actor_id = Column(Integer, ForeignKey("users.id"))
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     details = Column(Text)
 
     application = relationship("Application", back_populates="logs")
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from .base import Base
+
+class DashboardCounter(Base):
+    __tablename__ = "dashboard_counters"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, index=True, nullable=False)
+    
+    # Denormalized counts, kept in step with applications and interest_status
+    sent_decks = Column(Integer, default=0, nullable=False)  # Applications sent by a startup
+    received_decks = Column(Integer, default=0, nullable=False)  # Applications received by an investor
+    interested = Column(Integer, default=0, nullable=False)  # Interest rows with status "interested"
+    not_interested = Column(Integer, default=0, nullable=False)  # Interest rows with status "not_interested"
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    user = relationship("User")
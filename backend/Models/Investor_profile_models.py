@@ -54,6 +54,7 @@ class InvestorProfile(Base):
     profile_photo_file_path = Column(String, nullable=True)
     profile_photo_file_size = Column(Integer, nullable=True)
     profile_photo_content_type = Column(String, nullable=True)
+    profile_photo_variants = Column(Text, nullable=True)  # JSON: {thumb|card|full: {width, height, webp, jpeg}}
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
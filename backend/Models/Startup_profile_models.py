@@ -34,6 +34,7 @@ class StartupProfile(Base):
     pitch_deck_file_path = Column(String, nullable=True)  # Server file path
     pitch_deck_file_size = Column(Integer, nullable=True)  # File size in bytes
     pitch_deck_content_type = Column(String, nullable=True)  # MIME type
+    pitch_deck_version_id = Column(Integer, ForeignKey("pitch_deck_versions.id"), nullable=True)  # Current deck
     product_demo_video_link = Column(String, nullable=False)  # YouTube/Vimeo link
     
     # Funding Status - Basic
@@ -55,6 +56,10 @@ class StartupProfile(Base):
     founders = relationship("Founder", back_populates="startup_profile")
     revenue_metrics = relationship("StartupRevenueMetrics", back_populates="startup_profile", uselist=False)
     fund_usage = relationship("FundUsage", back_populates="startup_profile", uselist=False)
+    pitch_deck_version = relationship("PitchDeckVersion", foreign_keys=[pitch_deck_version_id])
+    
+    # Fetch server-generated timestamps with RETURNING on INSERT/UPDATE instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
     
 class Founder(Base):
     __tablename__ = "founders"
@@ -101,3 +106,15 @@ class FundUsage(Base):
     
     startup_profile = relationship("StartupProfile", back_populates="fund_usage")
     
+
+class PitchDeckVersion(Base):
+    """One uploaded deck. Rows and their files never change; every upload adds a new version."""
+    __tablename__ = "pitch_deck_versions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    filename = Column(String, nullable=False)  # Original filename
+    file_path = Column(String, nullable=False, index=True)  # Storage key
+    file_size = Column(Integer, nullable=True)
+    content_type = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
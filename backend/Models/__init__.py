@@ -1,20 +1,25 @@
 # Import all models to ensure they are registered with SQLAlchemy
 from .base import Base
-from .Auth_models import User, OTP
-from .Startup_profile_models import StartupProfile, Founder, StartupRevenueMetrics, FundUsage
+from .Auth_models import User, OTP, RefreshToken, RevokedSession
+from .Startup_profile_models import StartupProfile, Founder, StartupRevenueMetrics, FundUsage, PitchDeckVersion
 from .Investor_profile_models import InvestorProfile
 from .Application_models import Application, ApplicationLog, InterestStatus
+from .Dashboard_models import DashboardCounter
 
 __all__ = [
     'Base',
     'User',
     'OTP', 
+    'RefreshToken',
+    'RevokedSession',
     'StartupProfile',
     'Founder',
     'StartupRevenueMetrics',
     'FundUsage',
+    'PitchDeckVersion',
     'InvestorProfile',
     'Application',
     'ApplicationLog',
-    'InterestStatus'
+    'InterestStatus',
+    'DashboardCounter'
 ]
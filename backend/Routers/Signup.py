@@ -1,17 +1,44 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from Database.db import get_db
-from Models.Auth_models import User, OTP
-from schemas.Auth_Schema import OTPRequest, OTPVerify, OTPVerifyAndSignup, UserLogin, LoginResponse, UserResponse, OTPResponse
-from utils import generate_otp, send_otp_email, create_access_token, get_current_user
-import bcrypt
-from datetime import datetime, timedelta
+from Models.Auth_models import User
+from schemas.Auth_Schema import OTPRequest, OTPVerify, OTPVerifyAndSignup, UserLogin, LoginResponse, UserResponse, OTPResponse, RefreshRequest
+from utils import (
+    generate_otp, send_otp_email, create_user_access_token, get_current_user_record,
+    ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS, REFRESH_TOKEN_REUSE_GRACE_SECONDS
+)
+from Crud.token_crud import new_session_id, issue_refresh_token, rotate_refresh_token, find_refresh_token, revoke_session
+from datetime import timedelta
+import logging
+from otp_store import get_otp_store
+from logging_config import redact_email
+from rate_limit import (
+    enforce_rate_limit, get_client_ip, OTP_PER_IP, OTP_PER_EMAIL, LOGIN_PER_IP, LOGIN_PER_EMAIL,
+    OTP_VERIFY_PER_IP, OTP_VERIFY_PER_EMAIL
+)
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def _token_response(db: Session, user: User, session_id: str = None) -> LoginResponse:
+    """Access and refresh tokens for a user; a new session unless session_id is given. Commits."""
+    session_id = session_id or new_session_id()
+    refresh_token = issue_refresh_token(db, user.id, session_id, REFRESH_TOKEN_EXPIRE_DAYS)
+    db.commit()
+    return LoginResponse(
+        access_token=create_user_access_token(user, session_id),
+        token_type="bearer",
+        user_id=user.id,
+        role=user.role,
+        email=user.email,
+        refresh_token=refresh_token,
+        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    )
 
 @router.post("/send-otp", response_model=OTPResponse)
-def send_otp(request: OTPRequest, db: Session = Depends(get_db)):
+def send_otp(request: OTPRequest, client_ip: str = Depends(get_client_ip), db: Session = Depends(get_db)):
     """Send OTP to user's email"""
+    enforce_rate_limit((OTP_PER_IP, client_ip), (OTP_PER_EMAIL, request.email.lower()))
     try:
         # Check if user already exists
         existing_user = db.query(User).filter(User.email == request.email).first()
@@ -24,30 +51,14 @@ def send_otp(request: OTPRequest, db: Session = Depends(get_db)):
         # Generate OTP
         otp = generate_otp()
         
-        # Delete any existing OTP for this email
-        try:
-            db.query(OTP).filter(OTP.email == request.email).delete()
-            db.commit()
-        except Exception as e:
-            print(f"Warning: Could not delete existing OTP: {e}")
-            db.rollback()
-        
-        # Create new OTP
+        # Store the OTP, replacing any earlier one for this email
         try:
-            otp_record = OTP(
-                email=request.email,
-                otp=otp,
-                expires_at=datetime.utcnow() + timedelta(seconds=120)
-            )
-            db.add(otp_record)
-            db.commit()
-            db.refresh(otp_record)
-        except Exception as e:
-            print(f"Error creating OTP record: {e}")
-            db.rollback()
+            get_otp_store().put(request.email, otp)
+        except Exception:
+            logger.exception("Error storing OTP", extra={"recipient": redact_email(request.email)})
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create OTP record"
+                detail="Failed to store OTP"
             )
         
         # Send email
@@ -57,7 +68,7 @@ def send_otp(request: OTPRequest, db: Session = Depends(get_db)):
             return {"message": "OTP sent successfully", "email": request.email}
         else:
             # If email fails, still return success but log the issue
-            print(f"⚠️ Email failed to send to {request.email}, but OTP was generated")
+            logger.warning("OTP generated but the email failed to send", extra={"recipient": redact_email(request.email)})
             return {
                 "message": "OTP generated successfully", 
                 "email": request.email,
@@ -66,8 +77,8 @@ def send_otp(request: OTPRequest, db: Session = Depends(get_db)):
             
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error in send_otp: {e}")
+    except Exception:
+        logger.exception("Error in send_otp", extra={"recipient": redact_email(request.email)})
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -75,17 +86,13 @@ def send_otp(request: OTPRequest, db: Session = Depends(get_db)):
         )
 
 @router.post("/verify-otp-and-signup", response_model=LoginResponse)
-def verify_otp_and_signup(request: OTPVerifyAndSignup, db: Session = Depends(get_db)):
-    
+def verify_otp_and_signup(request: OTPVerifyAndSignup, client_ip: str = Depends(get_client_ip), db: Session = Depends(get_db)):
+    # Every attempt takes a token, so guessing the OTP takes far longer than it lives
+    enforce_rate_limit((OTP_VERIFY_PER_IP, client_ip), (OTP_VERIFY_PER_EMAIL, request.email.lower()))
     try:
         # Verify OTP
-        otp_record = db.query(OTP).filter(
-            OTP.email == request.email,
-            OTP.otp == request.otp,
-            OTP.expires_at > datetime.utcnow()
-        ).first()
-        
-        if not otp_record:
+        otp_store = get_otp_store()
+        if not otp_store.verify(request.email, request.otp):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid or expired OTP"
@@ -99,7 +106,8 @@ def verify_otp_and_signup(request: OTPVerifyAndSignup, db: Session = Depends(get
                 detail="User with this email already exists"
             )
         
-        # Hash password
+        # Hash password (bcrypt is imported on first use to keep startup fast)
+        import bcrypt
         hashed_password = bcrypt.hashpw(request.password.encode('utf-8'), bcrypt.gensalt())
         
         # Create user
@@ -114,35 +122,24 @@ def verify_otp_and_signup(request: OTPVerifyAndSignup, db: Session = Depends(get
         db.commit()
         db.refresh(new_user)
         
-        # Delete OTP record
-        db.delete(otp_record)
-        db.commit()
+        # The OTP is single-use
+        otp_store.discard(request.email)
         
-        # Create access token with user_id
-        access_token = create_access_token(
-            data={"sub": str(new_user.id), "email": new_user.email, "role": new_user.role}
-        )
-        
-        return LoginResponse(
-            access_token=access_token,
-            token_type="bearer",
-            user_id=new_user.id,
-            role=new_user.role,
-            email=new_user.email
-        )
+        return _token_response(db, new_user)
         
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error in verify_otp_and_signup: {e}")
+    except Exception:
+        logger.exception("Error in verify_otp_and_signup", extra={"email": redact_email(request.email)})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create account"
         )
 
 @router.post("/login", response_model=LoginResponse)
-def login(request: UserLogin, db: Session = Depends(get_db)):
+def login(request: UserLogin, client_ip: str = Depends(get_client_ip), db: Session = Depends(get_db)):
     """Login user and return JWT token"""
+    enforce_rate_limit((LOGIN_PER_IP, client_ip), (LOGIN_PER_EMAIL, request.email.lower()))
     try:
         # Find user
         user = db.query(User).filter(User.email == request.email).first()
@@ -153,24 +150,14 @@ def login(request: UserLogin, db: Session = Depends(get_db)):
             )
         
         # Verify password
+        import bcrypt
         if not bcrypt.checkpw(request.password.encode('utf-8'), user.password.encode('utf-8')):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
         
-        # Create access token with user_id and role
-        access_token = create_access_token(
-            data={"sub": str(user.id), "email": user.email, "role": user.role}
-        )
-        
-        return LoginResponse(
-            access_token=access_token,
-            token_type="bearer",
-            user_id=user.id,
-            role=user.role,
-            email=user.email
-        )
+        return _token_response(db, user)
         
     except HTTPException:
         raise
@@ -182,8 +169,37 @@ def login(request: UserLogin, db: Session = Depends(get_db)):
 
 
 
+@router.post("/refresh", response_model=LoginResponse)
+def refresh(request: RefreshRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new access token and a new refresh token; the old one stops working"""
+    access_token_ttl = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    token = rotate_refresh_token(db, request.refresh_token, REFRESH_TOKEN_REUSE_GRACE_SECONDS, access_token_ttl)
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token"
+        )
+
+    # Claims are re-read here, so role changes reach the client within one access token lifetime
+    user = db.query(User).filter(User.id == token.user_id).first()
+    if user is None:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    return _token_response(db, user, token.session_id)
+
+@router.post("/logout")
+def logout(request: RefreshRequest, db: Session = Depends(get_db)):
+    """End the refresh token's session; its access tokens are refused from now on"""
+    token = find_refresh_token(db, request.refresh_token)
+    if token is not None:
+        revoke_session(db, token.session_id, timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    return {"message": "Logged out successfully"}
+
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: User = Depends(get_current_user_record)):
     """Get current user information"""
     return current_user
 
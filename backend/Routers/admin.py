@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from schemas.Auth_Schema import CurrentUser
+from profiling import list_profiles, profile_path, profiling_enabled, SLOW_REQUEST_THRESHOLD_MS
+from maintenance import MAINTENANCE_ENABLED, MAINTENANCE_INTERVAL_SECONDS, scheduler as maintenance_scheduler
+from utils import get_admin_user
+
+router = APIRouter()
+
+@router.get("/profiles")
+def get_slow_request_profiles(admin_user: CurrentUser = Depends(get_admin_user)):
+    """List stored slow-request profiles, newest first"""
+    return {
+        "enabled": profiling_enabled(),
+        "threshold_ms": SLOW_REQUEST_THRESHOLD_MS,
+        "profiles": list_profiles()
+    }
+
+@router.get("/profiles/{profile_id}")
+def download_slow_request_profile(
+    profile_id: str,
+    admin_user: CurrentUser = Depends(get_admin_user)
+):
+    """Download one slow-request profile (route, SQL statements and folded stack samples)"""
+    path = profile_path(profile_id)
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    return FileResponse(path=path, filename=f"{profile_id}.json", media_type="application/json")
+
+@router.get("/maintenance")
+def get_maintenance_status(admin_user: CurrentUser = Depends(get_admin_user)):
+    """Last run of each maintenance job in this worker: duration and rows removed"""
+    return {
+        "enabled": MAINTENANCE_ENABLED,
+        "interval_seconds": MAINTENANCE_INTERVAL_SECONDS,
+        "jobs": maintenance_scheduler.last_results
+    }
+
+@router.post("/maintenance/run")
+def run_maintenance(admin_user: CurrentUser = Depends(get_admin_user)):
+    """Run all maintenance jobs now in this worker"""
+    return {"jobs": maintenance_scheduler.run_once()}
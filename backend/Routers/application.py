@@ -1,85 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
-from Database.db import get_db
+from Database.db import get_db, get_read_db
 from Models.Auth_models import User
+from schemas.Auth_Schema import CurrentUser
 from Models.Application_models import Application, ApplicationLog, InterestStatus
 from Models.Startup_profile_models import StartupProfile
 from Models.Investor_profile_models import InvestorProfile
-from schemas.application_schemas import ApplicationSchema, InterestStatusSchema, InterestStatusCreate, InterestStatusUpdate, SendPitchDeckRequest
+from schemas.application_schemas import ApplicationSchema, InterestStatusSchema, InterestStatusCreate, InterestStatusUpdate, SendPitchDeckRequest, AvailableInvestorsPage
+from Crud.dashboard_crud import bump_counters, interest_deltas
 from utils import get_current_user
+from logging_config import HOT_PATH_SAMPLE_RATE
+from storage import get_storage, storage_key, media_type_for
 from datetime import datetime
 from typing import List
+import logging
 import os
 
 router = APIRouter()
-
-def validate_and_resolve_file_path(file_path: str, application_id: int) -> tuple:
-    """
-    Validate and resolve file path for pitch deck download
-    Returns: (full_path, filename)
-    """
-    if not file_path:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Pitch deck file path not found in application"
-        )
-    
-    # Get the project root directory (parent of backend directory)
-    backend_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(backend_dir)
-    
-    # Resolve the file path properly
-    if os.path.isabs(file_path):
-        full_path = file_path
-    else:
-        # If it's a relative path, resolve it from the project root directory
-        full_path = os.path.join(project_root, file_path)
-    
-    # Check if file exists
-    if not os.path.exists(full_path):
-        # Try alternative paths
-        alternative_paths = [
-            os.path.join(project_root, file_path),  # Project root + file_path
-            os.path.join(project_root, "uploads", "pitch_decks", os.path.basename(file_path)),  # Project root + uploads/pitch_decks + filename
-            os.path.join(backend_dir, "uploads", "pitch_decks", os.path.basename(file_path)),  # Backend + uploads/pitch_decks + filename
-            os.path.join(backend_dir, "uploads", os.path.basename(file_path)),  # Backend + uploads + filename
-            file_path  # Try original path as fallback
-        ]
-        
-        for alt_path in alternative_paths:
-            if os.path.exists(alt_path):
-                full_path = alt_path
-                break
-        else:
-            # File not found in any location
-            print(f"File not found in any location:")
-            print(f"  Original path: {file_path}")
-            print(f"  Resolved path: {full_path}")
-            print(f"  Project root: {project_root}")
-            print(f"  Backend directory: {backend_dir}")
-            print(f"  Alternative paths tried: {alternative_paths}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Pitch deck file not found: {os.path.basename(file_path)}"
-            )
-    
-    # Get filename for download
-    filename = os.path.basename(full_path)
-    
-    return full_path, filename
+logger = logging.getLogger(__name__)
 
 @router.post("/send-pitch-deck", response_model=ApplicationSchema)
 def send_pitch_deck(
     request: SendPitchDeckRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Send pitch deck to investor"""
     try:
-        print(f"Send pitch deck request - Current user: {current_user.id}, Role: {current_user.role}")
-        print(f"Investor ID: {request.investor_id}")
-        
         if current_user.role != "startup":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -94,9 +42,6 @@ def send_pitch_deck(
                 detail="Startup profile not found"
             )
         
-        print(f"Startup profile found: {startup_profile.company_name}")
-        print(f"Pitch deck filename: {startup_profile.pitch_deck_filename}")
-        
         # Get investor profile
         investor_profile = db.query(InvestorProfile).filter(InvestorProfile.user_id == request.investor_id).first()
         if not investor_profile:
@@ -105,8 +50,6 @@ def send_pitch_deck(
                 detail="Investor profile not found"
             )
         
-        print(f"Investor profile found: {investor_profile.full_name}")
-        
         # Check if pitch deck already sent
         existing_application = db.query(Application).filter(
             Application.startup_id == current_user.id,
@@ -119,25 +62,34 @@ def send_pitch_deck(
                 detail="Pitch deck already sent to this investor"
             )
         
+        # Update dashboard counters in the same transaction as the application
+        bump_counters(db, current_user.id, sent_decks=1)
+        bump_counters(db, request.investor_id, received_decks=1)
+        
         # Create application
         new_application = Application(
             startup_id=current_user.id,
             investor_id=request.investor_id,
             pitch_deck_filename=startup_profile.pitch_deck_filename,
             pitch_deck_file_path=startup_profile.pitch_deck_file_path,
+            # Pin the deck as it is now; later uploads add new versions
+            pitch_deck_version_id=startup_profile.pitch_deck_version_id,
             status="sent"
         )
         db.add(new_application)
         db.commit()
         db.refresh(new_application)
         
-        print(f"Pitch deck sent successfully! Application ID: {new_application.id}")
+        logger.info(
+            "Pitch deck sent",
+            extra={"application_id": new_application.id, "startup_id": current_user.id, "investor_id": request.investor_id}
+        )
         return new_application
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in send_pitch_deck: {e}")
+        logger.exception("Error in send_pitch_deck")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
@@ -146,8 +98,8 @@ def send_pitch_deck(
 @router.get("/startup/{startup_id}/sent-pitch-decks", response_model=List[ApplicationSchema])
 def get_startup_applications(
     startup_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all pitch decks sent by startup"""
     try:
@@ -171,6 +123,7 @@ def get_startup_applications(
                 "investor_id": app.investor_id,
                 "pitch_deck_filename": app.pitch_deck_filename,
                 "pitch_deck_file_path": app.pitch_deck_file_path,
+                "pitch_deck_version_id": app.pitch_deck_version_id,
                 "status": app.status,
                 "log": app.log,
                 "sent_at": app.sent_at,
@@ -182,17 +135,56 @@ def get_startup_applications(
         
         return response_data
     except Exception as e:
-        print(f"Error in get_startup_applications: {e}")
+        logger.exception("Error in get_startup_applications")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
 
+@router.get("/available-investors/{startup_id}", response_model=AvailableInvestorsPage)
+def get_available_investors(
+    startup_id: int,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get investor profiles the startup has not sent a pitch deck to yet"""
+    if current_user.id != startup_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Can only view available investors for your own startup"
+        )
+    
+    # Anti-join: one NOT EXISTS probe per investor on ix_applications_startup_investor
+    already_contacted = exists().where(
+        Application.startup_id == startup_id,
+        Application.investor_id == InvestorProfile.user_id
+    )
+    
+    # Fetch one extra row to know whether another page exists without a COUNT(*)
+    rows = db.query(
+        InvestorProfile.user_id,
+        InvestorProfile.full_name,
+        InvestorProfile.investor_type,
+        InvestorProfile.district,
+        InvestorProfile.state,
+        InvestorProfile.country,
+        InvestorProfile.profile_photo_file_path
+    ).filter(~already_contacted).order_by(InvestorProfile.id).offset((page - 1) * page_size).limit(page_size + 1).all()
+    
+    return {
+        "items": [dict(row._mapping) for row in rows[:page_size]],
+        "page": page,
+        "page_size": page_size,
+        "has_more": len(rows) > page_size
+    }
+
 @router.get("/investor/{investor_id}/received-pitch-decks", response_model=List[ApplicationSchema])
 def get_investor_applications(
     investor_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all pitch decks received by investor"""
     try:
@@ -216,6 +208,7 @@ def get_investor_applications(
                 "investor_id": app.investor_id,
                 "pitch_deck_filename": app.pitch_deck_filename,
                 "pitch_deck_file_path": app.pitch_deck_file_path,
+                "pitch_deck_version_id": app.pitch_deck_version_id,
                 "status": app.status,
                 "log": app.log,
                 "sent_at": app.sent_at,
@@ -227,7 +220,7 @@ def get_investor_applications(
         
         return response_data
     except Exception as e:
-        print(f"Error in get_investor_applications: {e}")
+        logger.exception("Error in get_investor_applications")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
@@ -236,14 +229,11 @@ def get_investor_applications(
 @router.post("/update-interest", response_model=InterestStatusSchema)
 def update_interest_status(
     interest_data: InterestStatusUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update investor interest in startup"""
     try:
-        print(f"Update interest status - Current user: {current_user.id}, Role: {current_user.role}")
-        print(f"Startup ID: {interest_data.startup_id}, Status: {interest_data.status}")
-        
         if current_user.role != "investor":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -265,15 +255,23 @@ def update_interest_status(
         ).first()
         
         if existing_interest:
-            print(f"Updating existing interest status: {existing_interest.id}")
             # Update existing interest
+            deltas = interest_deltas(existing_interest.status, interest_data.status)
+            bump_counters(db, interest_data.startup_id, **deltas)
+            bump_counters(db, current_user.id, **deltas)
             existing_interest.status = interest_data.status
             db.commit()
             db.refresh(existing_interest)
+            logger.info(
+                "Interest status updated",
+                extra={"interest_id": existing_interest.id, "investor_id": current_user.id, "status": interest_data.status}
+            )
             return existing_interest
         else:
-            print(f"Creating new interest status")
             # Create new interest status
+            deltas = interest_deltas(None, interest_data.status)
+            bump_counters(db, interest_data.startup_id, **deltas)
+            bump_counters(db, current_user.id, **deltas)
             new_interest = InterestStatus(
                 startup_id=interest_data.startup_id,
                 investor_id=current_user.id,
@@ -282,13 +280,16 @@ def update_interest_status(
             db.add(new_interest)
             db.commit()
             db.refresh(new_interest)
-            print(f"New interest status created: {new_interest.id}")
+            logger.info(
+                "Interest status created",
+                extra={"interest_id": new_interest.id, "investor_id": current_user.id, "status": interest_data.status}
+            )
             return new_interest
             
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in update_interest_status: {e}")
+        logger.exception("Error in update_interest_status")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
@@ -297,13 +298,11 @@ def update_interest_status(
 @router.get("/interest-status/investor/{investor_id}", response_model=List[InterestStatusSchema])
 def get_investor_interest_status(
     investor_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all interest statuses set by investor"""
     try:
-        print(f"Getting interest statuses for investor {investor_id}, current user: {current_user.id}")
-        
         if current_user.id != investor_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -311,7 +310,6 @@ def get_investor_interest_status(
             )
         
         interest_statuses = db.query(InterestStatus).filter(InterestStatus.investor_id == investor_id).all()
-        print(f"Found {len(interest_statuses)} interest statuses")
         
         # Manually construct response to match schema
         response_data = []
@@ -330,13 +328,16 @@ def get_investor_interest_status(
             }
             response_data.append(status_data)
         
-        print(f"Returning {len(response_data)} interest statuses")
+        logger.debug(
+            "Returning interest statuses",
+            extra={"investor_id": investor_id, "count": len(response_data), "sample_rate": HOT_PATH_SAMPLE_RATE}
+        )
         return response_data
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in get_investor_interest_status: {e}")
+        logger.exception("Error in get_investor_interest_status")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
@@ -345,8 +346,8 @@ def get_investor_interest_status(
 @router.get("/interest-status/startup/{startup_id}", response_model=List[InterestStatusSchema])
 def get_startup_interest_status(
     startup_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all interest statuses from investors for startup"""
     if current_user.id != startup_id:
@@ -378,7 +379,7 @@ def get_startup_interest_status(
 @router.get("/download-pitch-deck/{application_id}")
 def download_pitch_deck(
     application_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Download pitch deck from application"""
@@ -405,7 +406,7 @@ def download_pitch_deck(
                 detail="You can only download your own pitch decks"
             )
         
-        # Get the file path
+        # The path is the pinned version's storage key, which never changes
         file_path = application.pitch_deck_file_path
         
         if not file_path:
@@ -414,33 +415,28 @@ def download_pitch_deck(
                 detail="Pitch deck file path not found"
             )
         
-        # Resolve the file path properly
-        full_path, filename = validate_and_resolve_file_path(file_path, application_id)
-        
-        print(f"Serving file: {full_path}")
-        print(f"Filename: {filename}")
-        
-        # Determine the correct media type based on file extension
-        file_extension = os.path.splitext(filename)[1].lower()
-        media_type_map = {
-            '.pdf': 'application/pdf',
-            '.ppt': 'application/vnd.ms-powerpoint',
-            '.pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-            '.doc': 'application/msword',
-            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        }
-        media_type = media_type_map.get(file_extension, 'application/octet-stream')
+        key = storage_key(file_path)
+        filename = application.pitch_deck_filename or os.path.basename(key)
         
-        return FileResponse(
-            path=full_path, 
-            filename=filename,
-            media_type=media_type
+        logger.debug(
+            "Serving pitch deck",
+            extra={"application_id": application_id, "key": key, "sample_rate": HOT_PATH_SAMPLE_RATE}
         )
         
+        # Served by the backend directly (file, X-Accel-Redirect or presigned URL)
+        try:
+            return get_storage().download_response(key, filename, media_type_for(filename))
+        except FileNotFoundError:
+            logger.warning("Pitch deck file not found in storage", extra={"application_id": application_id, "key": key})
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Pitch deck file not found: {os.path.basename(key)}"
+            )
+        
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in download_pitch_deck: {e}")
+        logger.exception("Error in download_pitch_deck")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
@@ -449,7 +445,7 @@ def download_pitch_deck(
 @router.get("/debug/pitch-deck-file/{application_id}")
 def debug_pitch_deck_file(
     application_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Debug endpoint to check pitch deck file existence"""
@@ -465,43 +461,19 @@ def debug_pitch_deck_file(
         file_path = application.pitch_deck_file_path
         filename = application.pitch_deck_filename
         
-        # Get the project root directory (parent of backend directory)
-        backend_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(backend_dir)
-        
-        # Try different path resolutions
-        paths_to_check = []
-        if file_path:
-            if os.path.isabs(file_path):
-                paths_to_check.append(file_path)
-            else:
-                paths_to_check.extend([
-                    os.path.join(project_root, file_path),  # Project root + file_path
-                    os.path.join(project_root, "uploads", "pitch_decks", os.path.basename(file_path)),  # Project root + uploads/pitch_decks + filename
-                    os.path.join(backend_dir, "uploads", "pitch_decks", os.path.basename(file_path)),  # Backend + uploads/pitch_decks + filename
-                    os.path.join(backend_dir, "uploads", os.path.basename(file_path)),  # Backend + uploads + filename
-                    file_path  # Try original path as fallback
-                ])
-        
-        # Check each path
-        file_exists = False
-        existing_path = None
-        for path in paths_to_check:
-            if os.path.exists(path):
-                file_exists = True
-                existing_path = path
-                break
+        storage = get_storage()
+        key = storage_key(file_path) if file_path else None
+        file_size = storage.size(key) if key else None
         
         return {
             "application_id": application_id,
             "original_file_path": file_path,
             "original_filename": filename,
-            "project_root": project_root,
-            "backend_directory": backend_dir,
-            "file_exists": file_exists,
-            "existing_path": existing_path,
-            "paths_checked": paths_to_check,
-            "file_size": os.path.getsize(existing_path) if existing_path else None
+            "pitch_deck_version_id": application.pitch_deck_version_id,
+            "storage_backend": storage.name,
+            "storage_key": key,
+            "file_exists": file_size is not None,
+            "file_size": file_size
         }
         
     except Exception as e:
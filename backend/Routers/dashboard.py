@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from Database.db import get_db
+from schemas.Auth_Schema import CurrentUser
+from Models.Dashboard_models import DashboardCounter
+from Crud.dashboard_crud import get_or_create_counter
+from schemas.dashboard_schemas import DashboardSummary
+from utils import get_current_user
+
+router = APIRouter()
+
+@router.get("/summary", response_model=DashboardSummary)
+def get_dashboard_summary(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get dashboard counts for the current user from the denormalized counter row"""
+    counter = db.query(DashboardCounter).filter(DashboardCounter.user_id == current_user.id).first()
+    if not counter:
+        # First visit: seed the row from the source tables once
+        counter = get_or_create_counter(db, current_user.id)
+        db.commit()
+    
+    return {
+        "user_id": current_user.id,
+        "role": current_user.role,
+        "sent_decks": counter.sent_decks,
+        "received_decks": counter.received_decks,
+        "interested": counter.interested,
+        "not_interested": counter.not_interested,
+        "updated_at": counter.updated_at
+    }
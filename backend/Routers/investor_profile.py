@@ -1,22 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Query, Request
 from sqlalchemy.orm import Session
-from Database.db import get_db
-from Models.Auth_models import User
+from Database.db import get_db, get_read_db, SessionLocal
+from schemas.Auth_Schema import CurrentUser
 from Models.Investor_profile_models import InvestorProfile
 from schemas.investor_profile_schemas import InvestorProfileCreate, InvestorProfile as InvestorProfileSchema
 from utils import get_current_user
+from fieldsets import parse_fields, fieldset_key, load_only_columns
+from payload_cache import profile_list_cache, payload_response, INVESTOR_PROFILES
+from image_pipeline import PROFILE_PHOTO_DIR, pipeline_available, build_photo_variants, variant_keys
+from storage import get_storage, storage_key, IMMUTABLE_CACHE_CONTROL
+from starlette.concurrency import run_in_threadpool
 import os
-import shutil
-from typing import List
+from typing import List, Optional
 import json
 import re
+import uuid
+import logging
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @router.post("/", response_model=InvestorProfileSchema)
 def create_investor_profile(
     profile_data: InvestorProfileCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create investor profile"""
@@ -49,6 +56,7 @@ def create_investor_profile(
     )
     db.add(new_profile)
     db.commit()
+    profile_list_cache.invalidate(INVESTOR_PROFILES)
     db.refresh(new_profile)
     
     # Return the profile with proper serialization
@@ -89,25 +97,63 @@ def create_investor_profile(
             "profile_photo_file_path": new_profile.profile_photo_file_path,
             "profile_photo_file_size": new_profile.profile_photo_file_size,
             "profile_photo_content_type": new_profile.profile_photo_content_type,
+            "profile_photo_variants": _photo_variants(new_profile),
             "created_at": new_profile.created_at,
             "updated_at": new_profile.updated_at
         }
         
         return response_data
         
-    except Exception as e:
-        print(f"Error serializing investor profile: {e}")
+    except Exception:
+        logger.exception("Error serializing investor profile")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to serialize profile response"
         )
 
+def _photo_variants(profile: InvestorProfile):
+    """Decoded photo variant URLs, or None until the photo has been processed"""
+    return json.loads(profile.profile_photo_variants) if profile.profile_photo_variants else None
+
+# Columns stored as JSON-encoded lists
+JSON_LIST_FIELDS = {
+    "professional_background", "investment_stages", "geographic_focus", "industry_focus", "areas_of_expertise"
+}
+
 @router.get("/all", response_model=List[InvestorProfileSchema])
 def get_all_investor_profiles(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. full_name,firm_name,investor_type"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all investor profiles"""
+    projection = parse_fields(fields, InvestorProfile)
+    # Every caller sees the same listing, so it's cached per normalized fieldset
+    cache_key = fieldset_key(projection)
+    cached = profile_list_cache.get(INVESTOR_PROFILES, cache_key)
+    if cached:
+        return payload_response(request, cached)
+    version = profile_list_cache.version(INVESTOR_PROFILES)
+    
+    if projection:
+        # Sparse fieldset: select only the requested columns
+        columns, _ = projection
+        profiles = db.query(InvestorProfile).options(load_only_columns(InvestorProfile, columns)).all()
+        
+        response_data = []
+        for profile in profiles:
+            profile_data = {}
+            for name in columns:
+                value = getattr(profile, name)
+                if name in JSON_LIST_FIELDS:
+                    value = json.loads(value) if value else []
+                elif name == "profile_photo_variants":
+                    value = json.loads(value) if value else None
+                profile_data[name] = value
+            response_data.append(profile_data)
+        return payload_response(request, profile_list_cache.set(INVESTOR_PROFILES, cache_key, response_data, version))
+    
     profiles = db.query(InvestorProfile).all()
     
     # Return the profiles with proper serialization
@@ -149,15 +195,17 @@ def get_all_investor_profiles(
                 "profile_photo_file_path": profile.profile_photo_file_path,
                 "profile_photo_file_size": profile.profile_photo_file_size,
                 "profile_photo_content_type": profile.profile_photo_content_type,
+                "profile_photo_variants": _photo_variants(profile),
                 "created_at": profile.created_at,
                 "updated_at": profile.updated_at
             }
             response_data.append(profile_data)
         
-        return response_data
+        # The cached bytes bypass response_model validation, which partial rows wouldn't pass anyway
+        return payload_response(request, profile_list_cache.set(INVESTOR_PROFILES, cache_key, response_data, version))
         
-    except Exception as e:
-        print(f"Error serializing investor profiles: {e}")
+    except Exception:
+        logger.exception("Error serializing investor profiles")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to serialize profiles response"
@@ -166,7 +214,7 @@ def get_all_investor_profiles(
 @router.get("/{user_id}", response_model=InvestorProfileSchema)
 def get_investor_profile(
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get investor profile by user ID"""
@@ -215,14 +263,15 @@ def get_investor_profile(
             "profile_photo_file_path": profile.profile_photo_file_path,
             "profile_photo_file_size": profile.profile_photo_file_size,
             "profile_photo_content_type": profile.profile_photo_content_type,
+            "profile_photo_variants": _photo_variants(profile),
             "created_at": profile.created_at,
             "updated_at": profile.updated_at
         }
         
         return response_data
         
-    except Exception as e:
-        print(f"Error serializing investor profile: {e}")
+    except Exception:
+        logger.exception("Error serializing investor profile")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to serialize profile response"
@@ -231,7 +280,7 @@ def get_investor_profile(
 @router.get("/user/{user_id}", response_model=InvestorProfileSchema)
 def get_investor_profile_by_user(
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get investor profile by user ID (for profile editing)"""
@@ -258,7 +307,7 @@ def get_investor_profile_by_user(
             try:
                 return json.loads(json_str)
             except json.JSONDecodeError as e:
-                print(f"Error parsing {field_name}: {json_str}, Error: {e}")
+                logger.warning("Malformed JSON in investor profile field", extra={"user_id": user_id, "field": field_name, "error": str(e)})
                 # Try to fix common issues
                 try:
                     # Handle single quotes and unquoted strings
@@ -268,7 +317,7 @@ def get_investor_profile_by_user(
                     fixed_str = re.sub(r'([a-zA-Z\s]+)', r'"\1"', fixed_str)
                     return json.loads(fixed_str)
                 except:
-                    print(f"Failed to fix {field_name}, returning empty list")
+                    logger.warning("Could not repair investor profile field, returning an empty list", extra={"user_id": user_id, "field": field_name})
                     return []
         
         # Create a response dict that matches the schema exactly
@@ -307,14 +356,15 @@ def get_investor_profile_by_user(
             "profile_photo_file_path": profile.profile_photo_file_path,
             "profile_photo_file_size": profile.profile_photo_file_size,
             "profile_photo_content_type": profile.profile_photo_content_type,
+            "profile_photo_variants": _photo_variants(profile),
             "created_at": profile.created_at,
             "updated_at": profile.updated_at
         }
         
         return response_data
         
-    except Exception as e:
-        print(f"Error serializing investor profile: {e}")
+    except Exception:
+        logger.exception("Error serializing investor profile")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to serialize profile response"
@@ -324,7 +374,7 @@ def get_investor_profile_by_user(
 def update_investor_profile(
     user_id: int,
     profile_data: InvestorProfileCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update investor profile"""
@@ -354,6 +404,7 @@ def update_investor_profile(
         setattr(profile, field, value)
     
     db.commit()
+    profile_list_cache.invalidate(INVESTOR_PROFILES)
     db.refresh(profile)
     
     # Return the profile with proper serialization
@@ -394,23 +445,84 @@ def update_investor_profile(
             "profile_photo_file_path": profile.profile_photo_file_path,
             "profile_photo_file_size": profile.profile_photo_file_size,
             "profile_photo_content_type": profile.profile_photo_content_type,
+            "profile_photo_variants": _photo_variants(profile),
             "created_at": profile.created_at,
             "updated_at": profile.updated_at
         }
         
         return response_data
         
-    except Exception as e:
-        print(f"Error serializing investor profile: {e}")
+    except Exception:
+        logger.exception("Error serializing investor profile")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to serialize profile response"
         )
 
+def _process_profile_photo_task(user_id: int, photo_key: str):
+    """Background step: replace the raw upload with metadata-free, resized variants"""
+    storage = get_storage()
+    try:
+        data = storage.read(photo_key)
+    except FileNotFoundError:
+        # A later upload for this user replaced it
+        return
+    result = build_photo_variants(data, user_id)
+    if result is None:
+        return
+    variants, files = result
+    
+    db = SessionLocal()
+    try:
+        for key, content, content_type in files:
+            storage.save_bytes(key, content, content_type, cache_control=IMMUTABLE_CACHE_CONTROL)
+        
+        full_path = variants["full"]["jpeg"]
+        # Only if the profile still points at this upload: with two quick uploads the
+        # older task can finish last and must not overwrite the newer photo
+        updated = db.query(InvestorProfile).filter(
+            InvestorProfile.user_id == user_id,
+            InvestorProfile.profile_photo_file_path == "/" + photo_key
+        ).update({
+            InvestorProfile.profile_photo_variants: json.dumps(variants),
+            InvestorProfile.profile_photo_filename: os.path.basename(full_path),
+            InvestorProfile.profile_photo_file_path: full_path,
+            InvestorProfile.profile_photo_file_size: next(len(content) for key, content, _ in files if key == storage_key(full_path)),
+            InvestorProfile.profile_photo_content_type: "image/jpeg"
+        }, synchronize_session=False)
+        db.commit()
+        if updated:
+            profile_list_cache.invalidate(INVESTOR_PROFILES)
+        else:
+            # Superseded: drop the variants written above, keeping any the current
+            # photo shares (an identical image hashes to the same keys)
+            current = db.query(InvestorProfile).filter(InvestorProfile.user_id == user_id).first()
+            in_use = variant_keys(_photo_variants(current)) if current else set()
+            for key, _, _ in files:
+                if key not in in_use:
+                    try:
+                        storage.delete(key)
+                    except Exception:
+                        logger.warning("Could not remove superseded photo variant", extra={"key": key})
+            logger.info("Profile photo replaced during processing", extra={"user_id": user_id, "key": photo_key})
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to store profile photo variants", extra={"user_id": user_id})
+        return
+    finally:
+        db.close()
+    
+    # The raw upload may still carry EXIF/GPS metadata
+    try:
+        storage.delete(photo_key)
+    except Exception:
+        logger.warning("Could not remove raw profile photo", extra={"key": photo_key})
+
 @router.post("/upload-photo")
 async def upload_profile_photo(
+    background_tasks: BackgroundTasks,
     photo: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Upload investor profile photo"""
@@ -427,34 +539,48 @@ async def upload_profile_photo(
             detail="File must be an image"
         )
     
-    # Create uploads directory if it doesn't exist
-    upload_dir = "uploads/profile_photos"
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    # Save file
-    filename = f"{current_user.id}.{photo.filename.split('.')[-1]}"
-    file_path = os.path.join(upload_dir, filename)
+    storage = get_storage()
+    # Unique per upload, so the stored path tells a photo-processing task whether its upload is still current
+    filename = f"{current_user.id}-{uuid.uuid4().hex[:12]}.{photo.filename.split('.')[-1]}"
+    photo_key = f"{PROFILE_PHOTO_DIR}/{filename}"
     
     try:
-        with open(file_path, "wb") as buffer:
-            content = await photo.read()
-            buffer.write(content)
+        # Save file
+        file_size = await run_in_threadpool(storage.save, photo_key, photo.file, photo.content_type)
         
         # Update profile with photo info
         profile = db.query(InvestorProfile).filter(InvestorProfile.user_id == current_user.id).first()
         if profile:
+            previous_keys = variant_keys(_photo_variants(profile))
+            if profile.profile_photo_file_path:
+                # The previous raw upload, when its variants weren't built (yet)
+                previous_keys.add(storage_key(profile.profile_photo_file_path))
             profile.profile_photo_filename = filename
-            profile.profile_photo_file_path = f"/uploads/profile_photos/{filename}"
+            profile.profile_photo_file_path = f"/{photo_key}"
+            profile.profile_photo_file_size = file_size
+            profile.profile_photo_content_type = photo.content_type
+            profile.profile_photo_variants = None
             db.commit()
+            profile_list_cache.invalidate(INVESTOR_PROFILES)
+            
+            # The previous photo and its variants are no longer referenced
+            for key in previous_keys - {photo_key}:
+                try:
+                    await run_in_threadpool(storage.delete, key)
+                except Exception:
+                    logger.warning("Could not remove old photo variant", extra={"key": key})
+            
+            # Resize and strip metadata after the response is sent
+            if pipeline_available():
+                background_tasks.add_task(_process_profile_photo_task, current_user.id, photo_key)
         
-        return {"message": "Photo uploaded successfully", "filename": filename}
+        return {"message": "Photo uploaded successfully", "filename": filename, "variants_pending": bool(profile) and pipeline_available()}
     except Exception as e:
         # Clean up file if it was created
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except:
-                pass
+        try:
+            await run_in_threadpool(storage.delete, photo_key)
+        except Exception:
+            pass
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload photo: {str(e)}"
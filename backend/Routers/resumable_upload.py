@@ -0,0 +1,231 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Header, Response
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from Database.db import get_db
+from schemas.Auth_Schema import CurrentUser
+from Models.Startup_profile_models import StartupProfile
+from schemas.startup_profile_schemas import ResumableUploadCreate, ResumableUploadStatus, ResumableUploadFinalize
+from utils import get_current_user
+from payload_cache import profile_list_cache, STARTUP_PROFILES
+from storage import get_storage
+from Crud.pitch_deck_crud import new_pitch_deck_key, add_pitch_deck_version
+import partial_uploads
+from partial_uploads import OffsetMismatch, UploadBusy, RESUMABLE_UPLOAD_MAX_SIZE
+from typing import Optional
+import hashlib
+import os
+
+router = APIRouter()
+
+ALLOWED_CONTENT_TYPES = ['application/pdf', 'application/vnd.openxmlformats-officedocument.presentationml.presentation', 'application/vnd.ms-powerpoint']
+CHUNK_CONTENT_TYPE = "application/offset+octet-stream"
+
+def _require_startup(current_user: CurrentUser):
+    if current_user.role != "startup":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only startups can upload pitch decks"
+        )
+
+def _get_upload(upload_id: str, current_user: CurrentUser) -> dict:
+    """Upload owned by the current user; 404 for unknown, expired or foreign uploads"""
+    meta = partial_uploads.load_upload(upload_id)
+    if not meta or meta["user_id"] != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found or expired"
+        )
+    return meta
+
+def _offset_headers(meta: dict) -> dict:
+    return {
+        "Upload-Offset": str(meta["offset"]),
+        "Upload-Length": str(meta["size"]),
+        "Cache-Control": "no-store"
+    }
+
+@router.post("", response_model=ResumableUploadStatus, status_code=status.HTTP_201_CREATED)
+def create_resumable_upload(
+    upload: ResumableUploadCreate,
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Start a resumable pitch deck upload; the bytes follow in PATCH requests"""
+    _require_startup(current_user)
+
+    if upload.content_type not in ALLOWED_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be a PDF or PowerPoint presentation"
+        )
+    if upload.size > RESUMABLE_UPLOAD_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File is larger than {RESUMABLE_UPLOAD_MAX_SIZE} bytes"
+        )
+    filename = os.path.basename(upload.filename.replace("\\", "/"))
+    if not filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid filename"
+        )
+
+    created = partial_uploads.create_upload(current_user.id, filename, upload.content_type, upload.size)
+    meta = partial_uploads.load_upload(created["id"])
+    response.headers.update(_offset_headers(meta))
+    response.headers["Location"] = f"/resumable-uploads/{meta['id']}"
+    return meta
+
+@router.head("/{upload_id}")
+def get_resumable_upload_offset(
+    upload_id: str,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Current offset in the Upload-Offset header, so a client knows where to resume"""
+    meta = _get_upload(upload_id, current_user)
+    return Response(status_code=status.HTTP_200_OK, headers=_offset_headers(meta))
+
+@router.get("/{upload_id}", response_model=ResumableUploadStatus)
+def get_resumable_upload(
+    upload_id: str,
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Upload status"""
+    meta = _get_upload(upload_id, current_user)
+    response.headers.update(_offset_headers(meta))
+    return meta
+
+@router.patch("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def append_resumable_upload(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset"),
+    content_type: str = Header(..., alias="Content-Type"),
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Append the request body at Upload-Offset. The offset must equal the bytes
+    already received (409 with the current Upload-Offset otherwise). Bytes
+    that arrive before a dropped connection are kept.
+    """
+    meta = await run_in_threadpool(_get_upload, upload_id, current_user)
+
+    if content_type != CHUNK_CONTENT_TYPE:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be {CHUNK_CONTENT_TYPE}"
+        )
+    declared_length = request.headers.get("content-length")
+    if declared_length and upload_offset + int(declared_length) > meta["size"]:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Chunk extends past the declared upload size"
+        )
+
+    offset = upload_offset
+    try:
+        with partial_uploads.open_for_append(upload_id, upload_offset) as part:
+            async for chunk in request.stream():
+                if offset + len(chunk) > meta["size"]:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="Chunk extends past the declared upload size",
+                        headers={"Upload-Offset": str(offset)}
+                    )
+                await run_in_threadpool(part.write, chunk)
+                offset += len(chunk)
+    except OffsetMismatch as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload-Offset does not match the received bytes ({e.offset})",
+            headers={"Upload-Offset": str(e.offset)}
+        )
+    except UploadBusy:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another request is writing to this upload"
+        )
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT, headers={"Upload-Offset": str(offset)})
+
+@router.post("/{upload_id}/finalize")
+def finalize_resumable_upload(
+    upload_id: str,
+    finalize: Optional[ResumableUploadFinalize] = None,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Store the completed upload and switch the startup's pitch deck to it in one commit"""
+    _require_startup(current_user)
+    meta = _get_upload(upload_id, current_user)
+
+    profile = db.query(StartupProfile).filter(StartupProfile.user_id == current_user.id).first()
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Startup profile not found"
+        )
+
+    storage = get_storage()
+    # A new version under its own key: the current deck stays intact until the commit below
+    file_key = new_pitch_deck_key(current_user.id, meta["filename"])
+    try:
+        with partial_uploads.locked_part(upload_id, "rb") as part:
+            part.seek(0, os.SEEK_END)
+            received = part.tell()
+            if received != meta["size"]:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Upload is incomplete ({received} of {meta['size']} bytes)",
+                    headers={"Upload-Offset": str(received)}
+                )
+            part.seek(0)
+            if finalize and finalize.sha256:
+                digest = hashlib.sha256()
+                for block in iter(lambda: part.read(1024 * 1024), b""):
+                    digest.update(block)
+                if digest.hexdigest() != finalize.sha256.lower():
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail="Checksum does not match the uploaded bytes"
+                    )
+                part.seek(0)
+            file_size = storage.save(file_key, part, meta["content_type"])
+    except UploadBusy:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another request is writing to this upload"
+        )
+
+    try:
+        version = add_pitch_deck_version(db, profile, file_key, meta["filename"], file_size, meta["content_type"])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        storage.delete(file_key)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update pitch deck: {str(e)}"
+        )
+    profile_list_cache.invalidate(STARTUP_PROFILES)
+    partial_uploads.discard_upload(upload_id)
+    # Earlier versions stay for the applications pinned to them; gc_uploads.py removes unreferenced ones
+
+    return {
+        "message": "Pitch deck updated successfully",
+        "filename": meta["filename"],
+        "pitch_deck_file_path": file_key,
+        "pitch_deck_file_size": file_size,
+        "pitch_deck_version_id": version.id
+    }
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_resumable_upload(
+    upload_id: str,
+    current_user: CurrentUser = Depends(get_current_user)
+):
+    """Abandon an upload and remove its partial data"""
+    _get_upload(upload_id, current_user)
+    partial_uploads.discard_upload(upload_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
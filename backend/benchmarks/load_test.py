@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Drive the main API flows concurrently against a running server and report
+throughput and latency percentiles per endpoint as JSON.
+
+Run seed.py first, start the server against the same database, then:
+    python3 benchmarks/load_test.py --base-url http://localhost:8000 \
+        --manifest bench_manifest.json --concurrency 16 --requests 500 --output bench_result.json
+
+Only the standard library is used so the harness runs anywhere the API does.
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Client:
+    def __init__(self, base_url: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, token: str = None, body: dict = None):
+        """Return (status_code, elapsed_seconds, response_bytes)"""
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+        if token:
+            req.add_header("Authorization", f"Bearer {token}")
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                payload = resp.read()
+                return resp.status, time.perf_counter() - start, payload
+        except urllib.error.HTTPError as e:
+            payload = e.read()
+            return e.code, time.perf_counter() - start, payload
+        except (urllib.error.URLError, OSError):
+            return 0, time.perf_counter() - start, b""
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(results: list, wall_time: float) -> dict:
+    latencies = sorted(elapsed for _, elapsed, _ in results)
+    errors = sum(1 for status, _, _ in results if status == 0 or status >= 400)
+    return {
+        "requests": len(results),
+        "errors": errors,
+        "throughput_rps": round(len(results) / wall_time, 2) if wall_time else 0.0,
+        "bytes_received": sum(size for _, _, size in results),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p90": round(percentile(latencies, 90) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0
+        }
+    }
+
+
+def run_scenario(name: str, make_call, count: int, concurrency: int) -> dict:
+    """Issue `count` calls of make_call(i) across `concurrency` threads"""
+    results = []
+    lock = threading.Lock()
+
+    def worker(i):
+        status, elapsed, payload = make_call(i)
+        with lock:
+            results.append((status, elapsed, len(payload)))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(count)))
+    wall_time = time.perf_counter() - start
+
+    summary = summarize(results, wall_time)
+    print(f"{name:>16}: {summary['requests']} req, {summary['errors']} errors, "
+          f"{summary['throughput_rps']} rps, p50 {summary['latency_ms']['p50']} ms, "
+          f"p99 {summary['latency_ms']['p99']} ms")
+    return summary
+
+
+def login_all(client: Client, users: list, password: str) -> dict:
+    tokens = {}
+    for user in users:
+        status, _, payload = client.request("POST", "/auth/login", body={"email": user["email"], "password": password})
+        if status == 200:
+            tokens[user["user_id"]] = json.loads(payload)["access_token"]
+    return tokens
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=backend_dir, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+
+    client = Client(args.base_url, args.timeout)
+    password = manifest["password"]
+    startups = manifest["startups"]
+    investors = manifest["investors"]
+
+    # Authenticate a fixed pool of users up front; the login scenario is measured separately
+    startup_pool = rng.sample(startups, min(args.token_users, len(startups)))
+    investor_pool = rng.sample(investors, min(args.token_users, len(investors)))
+    startup_tokens = login_all(client, startup_pool, password)
+    investor_tokens = login_all(client, investor_pool, password)
+    if not startup_tokens or not investor_tokens:
+        raise SystemExit("Could not log in seeded users; is the server using the seeded database?")
+
+    startup_ids = list(startup_tokens)
+    investor_ids = list(investor_tokens)
+    applications = [app for app in manifest["applications"] if app["investor_id"] in investor_tokens]
+    unsent_pairs = [pair for pair in manifest["unsent_pairs"] if pair[0] in startup_tokens]
+    all_users = startups + investors
+
+    scenarios = {
+        "login": (
+            lambda i: client.request("POST", "/auth/login", body={
+                "email": all_users[i % len(all_users)]["email"], "password": password
+            }),
+            args.requests
+        ),
+        "list_investors": (
+            lambda i: client.request("GET", "/investor-profile/all", startup_tokens[startup_ids[i % len(startup_ids)]]),
+            args.requests
+        ),
+        "list_startups": (
+            lambda i: client.request("GET", "/startup-profile/all", investor_tokens[investor_ids[i % len(investor_ids)]]),
+            args.requests
+        ),
+        "send_pitch_deck": (
+            lambda i: client.request(
+                "POST", "/applications/send-pitch-deck", startup_tokens[unsent_pairs[i][0]],
+                {"investor_id": unsent_pairs[i][1]}
+            ),
+            min(args.requests, len(unsent_pairs))
+        ),
+        "download_deck": (
+            lambda i: client.request(
+                "GET", f"/applications/download-pitch-deck/{applications[i % len(applications)]['id']}",
+                investor_tokens[applications[i % len(applications)]["investor_id"]]
+            ),
+            args.requests if applications else 0
+        ),
+        "interest_update": (
+            lambda i: client.request(
+                "POST", "/applications/update-interest", investor_tokens[investor_ids[i % len(investor_ids)]],
+                {"startup_id": rng.choice(startups)["user_id"], "status": rng.choice(["interested", "not_interested"])}
+            ),
+            args.requests
+        ),
+    }
+
+    selected = args.scenarios.split(",") if args.scenarios else list(scenarios)
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "requests_per_scenario": args.requests,
+        "seed": args.seed,
+        "dataset": manifest["counts"],
+        "endpoints": {}
+    }
+    for name in selected:
+        make_call, count = scenarios[name]
+        if count:
+            report["endpoints"][name] = run_scenario(name, make_call, count, args.concurrency)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent load test for the Startup Investor Platform API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--manifest", default="bench_manifest.json")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--token-users", type=int, default=20, help="Users per role to authenticate up front")
+    parser.add_argument("--scenarios", default="", help="Comma-separated subset, e.g. list_startups,download_deck")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_result.json")
+    main(parser.parse_args())
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Seed a database with synthetic users, profiles, applications and interest rows
+for benchmarking. Uses DATABASE_URL like the app (SQLite or Postgres).
+
+Writes a manifest JSON with the seeded credentials and ids for load_test.py.
+
+--reset drops every table first. It only runs with DATABASE_URL set
+explicitly and --yes-drop naming that database, so it can't fall back to the
+development database and wipe it.
+
+Example:
+    DATABASE_URL=sqlite:////tmp/bench.db python3 benchmarks/seed.py --reset --yes-drop bench.db \
+        --startups 200 --investors 100 --applications-per-startup 10
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import date
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+import bcrypt
+from sqlalchemy.engine import make_url
+from Database.db import DATABASE_URL, SessionLocal, engine
+from Models.base import Base
+from Models.Auth_models import User
+from Models.Startup_profile_models import StartupProfile, Founder, StartupRevenueMetrics, FundUsage
+from Models.Investor_profile_models import InvestorProfile
+from Models.Application_models import Application, InterestStatus
+import Models  # noqa: F401 - register all models
+
+BATCH_SIZE = 500
+
+INDUSTRIES = ["FinTech", "HealthTech", "EdTech", "AI/ML", "SaaS", "E-commerce", "CleanTech", "AgriTech"]
+STAGES = ["Pre-Seed", "Seed", "Series A", "Series B"]
+INVESTOR_TYPES = ["Angel Investor", "Venture Capital Partner", "Family Office", "Corporate VC"]
+
+# Smallest valid PDF, so downloads stream real bytes
+PDF_BYTES = b"%PDF-1.4\n1 0 obj<<>>endobj\ntrailer<<>>\n%%EOF\n" + b"0" * 4096
+
+
+def _commit_in_batches(db, objects):
+    for i in range(0, len(objects), BATCH_SIZE):
+        db.add_all(objects[i:i + BATCH_SIZE])
+        db.flush()
+    db.commit()
+
+
+def database_name(url: str) -> str:
+    """Name --yes-drop must match: the database, or the file name for SQLite"""
+    return os.path.basename(make_url(url).database or "")
+
+
+def seed(args) -> dict:
+    rng = random.Random(args.seed)
+
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    # One hash for every user keeps seeding fast; login still pays the full bcrypt cost
+    password_hash = bcrypt.hashpw(args.password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+    # Same place the upload endpoints write to when the server runs from backend/
+    deck_dir = os.path.join(backend_dir, "uploads", "pitch_decks")
+    os.makedirs(deck_dir, exist_ok=True)
+
+    db = SessionLocal()
+    try:
+        startups = [
+            User(email=f"bench-startup-{i}@bench.example.com", role="startup", password=password_hash,
+                 is_verified=True, profile_completed=True)
+            for i in range(args.startups)
+        ]
+        investors = [
+            User(email=f"bench-investor-{i}@bench.example.com", role="investor", password=password_hash,
+                 is_verified=True, profile_completed=True)
+            for i in range(args.investors)
+        ]
+        _commit_in_batches(db, startups + investors)
+
+        profiles = []
+        for i, user in enumerate(startups):
+            deck_name = f"bench_{user.id}.pdf"
+            deck_path = os.path.join(deck_dir, deck_name)
+            if not os.path.exists(deck_path):
+                with open(deck_path, "wb") as f:
+                    f.write(PDF_BYTES)
+            profiles.append(StartupProfile(
+                user_id=user.id,
+                company_name=f"Bench Startup {i}",
+                website_link=f"https://startup{i}.bench.example.com",
+                industry=rng.choice(INDUSTRIES),
+                company_description="Synthetic company used for benchmarking. " * rng.randint(3, 20),
+                founding_date=date(rng.randint(2012, 2023), rng.randint(1, 12), 1),
+                team_size=rng.randint(2, 200),
+                district="Bench District",
+                state="Bench State",
+                business_model_description="Subscription software. " * rng.randint(3, 15),
+                total_paying_customers=rng.randint(0, 10000),
+                monthly_customer_growth_rate=rng.uniform(0, 30),
+                customer_acquisition_cost=rng.uniform(10, 500),
+                customer_lifetime_value=rng.uniform(100, 5000),
+                competitive_advantage="Proprietary data and distribution. " * rng.randint(2, 10),
+                pitch_deck_filename=deck_name,
+                pitch_deck_file_path=f"uploads/pitch_decks/{deck_name}",
+                pitch_deck_file_size=len(PDF_BYTES),
+                pitch_deck_content_type="application/pdf",
+                product_demo_video_link="https://video.bench.example.com/demo",
+                pre_money_valuation=rng.randint(500000, 50000000),
+                amount_seeking=rng.randint(50000, 5000000),
+                investment_type="Equity",
+                max_equity_percentage=rng.uniform(5, 25),
+                funding_stage=rng.choice(STAGES),
+                total_funding_raised=rng.randint(0, 10000000),
+                last_round_amount=rng.randint(0, 2000000),
+                last_round_date=date(2023, rng.randint(1, 12), 1),
+                key_previous_investors="Bench Capital",
+                founders=[
+                    Founder(
+                        name=f"Founder {i}-{n}",
+                        educational_qualification="B.Tech",
+                        previous_work_experience="Previously built things. " * rng.randint(1, 8),
+                        linkedin_profile=f"https://linkedin.com/in/founder-{i}-{n}",
+                        photo_url=f"https://photos.bench.example.com/{i}-{n}.jpg"
+                    ) for n in range(rng.randint(1, 3))
+                ],
+                revenue_metrics=StartupRevenueMetrics(
+                    monthly_recurring_revenue=rng.randint(0, 200000),
+                    annual_recurring_revenue=rng.randint(0, 2400000),
+                    revenue_growth_rate=rng.uniform(0, 50),
+                    monthly_burn_rate=rng.randint(10000, 300000),
+                    current_cash_runway=rng.randint(3, 36),
+                    projected_revenue_12_months=rng.randint(0, 5000000),
+                    profitability_timeline="12-18 months",
+                    investment_timeline="3 months"
+                ),
+                fund_usage=FundUsage(
+                    product_development_percentage=40,
+                    marketing_percentage=30,
+                    team_expansion_percentage=20,
+                    operations_percentage=10
+                )
+            ))
+        for i, user in enumerate(investors):
+            profiles.append(InvestorProfile(
+                user_id=user.id,
+                full_name=f"Bench Investor {i}",
+                email=user.email,
+                country="India",
+                state="Bench State",
+                district="Bench District",
+                linkedin_profile=f"https://linkedin.com/in/investor-{i}",
+                investor_type=rng.choice(INVESTOR_TYPES),
+                firm_name=f"Bench Ventures {i}",
+                investment_experience="Experienced investor",
+                years_of_investment_experience="5-10 years",
+                professional_background=json.dumps(["Entrepreneur", "Operator"]),
+                investment_stages=json.dumps(rng.sample(STAGES, 2)),
+                check_size_range="$100K - $500K",
+                geographic_focus=json.dumps(["India"]),
+                industry_focus=json.dumps(rng.sample(INDUSTRIES, 3)),
+                investment_philosophy="Founder-first investor",
+                decision_timeline="2-4 weeks",
+                post_investment_involvement="Monthly check-ins",
+                areas_of_expertise=json.dumps(["Go-to-market", "Fundraising"]),
+                investment_thesis="Backing technical founders. " * rng.randint(2, 10),
+                profile_visibility="Public",
+                contact_permissions="Open to all"
+            ))
+        _commit_in_batches(db, profiles)
+
+        investor_ids = [user.id for user in investors]
+        applications = []
+        interests = []
+        unsent_pairs = []
+        for user in startups:
+            contacted = set(rng.sample(investor_ids, min(args.applications_per_startup, len(investor_ids))))
+            for investor_id in contacted:
+                applications.append(Application(
+                    startup_id=user.id,
+                    investor_id=investor_id,
+                    pitch_deck_filename=f"bench_{user.id}.pdf",
+                    pitch_deck_file_path=f"uploads/pitch_decks/bench_{user.id}.pdf",
+                    status="sent"
+                ))
+                if rng.random() < args.interest_ratio:
+                    interests.append(InterestStatus(
+                        startup_id=user.id,
+                        investor_id=investor_id,
+                        status=rng.choice(["interested", "not_interested"])
+                    ))
+            unsent_pairs.extend([user.id, investor_id] for investor_id in investor_ids if investor_id not in contacted)
+        _commit_in_batches(db, applications + interests)
+
+        rng.shuffle(unsent_pairs)
+        return {
+            "database_url": engine.url.render_as_string(hide_password=True),
+            "seed": args.seed,
+            "password": args.password,
+            "startups": [{"user_id": user.id, "email": user.email} for user in startups],
+            "investors": [{"user_id": user.id, "email": user.email} for user in investors],
+            "applications": [
+                {"id": app.id, "startup_id": app.startup_id, "investor_id": app.investor_id}
+                for app in applications
+            ],
+            "unsent_pairs": unsent_pairs[:args.max_unsent_pairs],
+            "counts": {
+                "users": len(startups) + len(investors),
+                "applications": len(applications),
+                "interest_statuses": len(interests)
+            }
+        }
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed a database for API benchmarks")
+    parser.add_argument("--startups", type=int, default=100)
+    parser.add_argument("--investors", type=int, default=50)
+    parser.add_argument("--applications-per-startup", type=int, default=5)
+    parser.add_argument("--interest-ratio", type=float, default=0.5,
+                        help="Fraction of applications that also get an interest row")
+    parser.add_argument("--max-unsent-pairs", type=int, default=5000,
+                        help="Startup/investor pairs kept in the manifest for send-pitch-deck requests")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for reproducible data")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    parser.add_argument("--yes-drop", metavar="DATABASE",
+                        help="Confirms --reset; must name the DATABASE_URL database (the file name for SQLite)")
+    parser.add_argument("--manifest", default="bench_manifest.json")
+    args = parser.parse_args()
+
+    if args.reset:
+        if not os.getenv("DATABASE_URL"):
+            parser.error("--reset needs DATABASE_URL set explicitly; it won't drop the default development database")
+        if args.yes_drop != database_name(DATABASE_URL):
+            parser.error(f"--reset drops every table in {database_name(DATABASE_URL)!r}; "
+                         f"confirm with --yes-drop {database_name(DATABASE_URL)}")
+
+    manifest = seed(args)
+    with open(args.manifest, "w") as f:
+        json.dump(manifest, f)
+    print(f"Seeded {manifest['counts']} into {manifest['database_url']}")
+    print(f"Manifest written to {args.manifest}")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Compare SQLite with SQLAlchemy's defaults against the engine configured in
+Database/db.py (WAL, synchronous=NORMAL, busy_timeout, mmap) under concurrent
+request-shaped sessions: mostly indexed reads with some short write
+transactions, each in its own session like an API request.
+
+Every configuration runs against a fresh database file in a temporary
+directory. Example:
+    python3 benchmarks/sqlite_pragmas.py --threads 16 --operations 4000 --write-ratio 0.2 \
+        --output bench_sqlite_pragmas.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from Database.db import create_configured_engine
+from Models.base import Base
+from Models.Auth_models import User
+from Models.Application_models import ApplicationLog
+import Models  # noqa: F401 - register all models
+from benchmarks.load_test import percentile, git_commit
+
+CONFIGURATIONS = {
+    # What Database/db.py did before: SQLAlchemy defaults, rollback journal, synchronous=FULL
+    "default": lambda url: create_engine(url, connect_args={"check_same_thread": False}),
+    "tuned": create_configured_engine,
+}
+
+
+def seed(engine, users: int):
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.bulk_save_objects([
+            User(email=f"bench{i}@example.com", role="startup", password="x", is_verified=True)
+            for i in range(users)
+        ])
+        db.commit()
+
+
+def run_configuration(name: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = CONFIGURATIONS[name](url)
+        seed(engine, args.users)
+        Session = sessionmaker(bind=engine)
+        rng_lock = threading.Lock()
+        rng = random.Random(args.seed)
+
+        def operation(i):
+            with rng_lock:
+                is_write = rng.random() < args.write_ratio
+                user_id = rng.randint(1, args.users)
+            start = time.perf_counter()
+            try:
+                with Session() as db:
+                    if is_write:
+                        db.add(ApplicationLog(action="viewed", actor_id=user_id, details="benchmark"))
+                        db.query(User).filter(User.id == user_id).update({"profile_completed": True})
+                        db.commit()
+                    else:
+                        db.query(User).filter(User.id == user_id).first()
+                        db.query(func.count(ApplicationLog.id)).filter(ApplicationLog.actor_id == user_id).scalar()
+                ok = True
+            except OperationalError:
+                # "database is locked"
+                ok = False
+            return is_write, ok, time.perf_counter() - start
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = list(pool.map(operation, range(args.operations)))
+        wall_time = time.perf_counter() - started
+
+        with engine.connect() as conn:
+            journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        engine.dispose()
+
+    report = {"journal_mode": journal_mode, "operations_per_second": round(len(results) / wall_time, 1)}
+    for kind, is_write in (("reads", False), ("writes", True)):
+        latencies = sorted(elapsed for write, ok, elapsed in results if write == is_write and ok)
+        report[kind] = {
+            "completed": len(latencies),
+            "locked_errors": sum(1 for write, ok, _ in results if write == is_write and not ok),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50) * 1000, 2),
+                "p95": round(percentile(latencies, 95) * 1000, 2),
+                "p99": round(percentile(latencies, 99) * 1000, 2),
+                "max": round(latencies[-1] * 1000, 2) if latencies else 0.0
+            }
+        }
+    return report
+
+
+def main(args):
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "parameters": vars(args),
+        "configurations": {name: run_configuration(name, args) for name in CONFIGURATIONS}
+    }
+    for name, result in report["configurations"].items():
+        print(
+            f"{name:8} {result['journal_mode']:8} {result['operations_per_second']:9.1f} ops/s  "
+            f"read p99 {result['reads']['latency_ms']['p99']:8.2f} ms  "
+            f"write p99 {result['writes']['latency_ms']['p99']:8.2f} ms  "
+            f"locked {result['reads']['locked_errors'] + result['writes']['locked_errors']}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--operations", type=int, default=4000)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    main(parser.parse_args())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Check the API's cold start against a budget.
+
+Starts uvicorn in a fresh interpreter, polls /health until it answers and
+reports the time to first response. It also imports main in a separate
+interpreter with -X importtime to list the slowest imports, and checks that
+optional heavy libraries (boto3, redis, Pillow, bcrypt, jose, smtplib) aren't
+loaded before they are used. Exits with status 1 if the time to first
+response exceeds --budget-ms or a deferred module was imported eagerly.
+
+Run from the backend directory:
+    python3 check_startup_time.py --budget-ms 2500 --runs 3 --top 15
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that must only be imported on first use
+DEFERRED_MODULES = ["boto3", "botocore", "redis", "PIL", "bcrypt", "jose", "smtplib"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_response(timeout: float) -> float:
+    """Seconds from launching uvicorn until GET /health returns 200"""
+    port = free_port()
+    env = dict(os.environ, MAINTENANCE_ENABLED="false")
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=backend_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited during startup:\n{server.stderr.read().decode()}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"No response from /health within {timeout} s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def import_report(top: int):
+    """Import main with -X importtime; returns the slowest modules and any deferred ones loaded"""
+    code = (
+        "import sys, main; "
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=backend_dir, env=dict(os.environ, MAINTENANCE_ENABLED="false"),
+        capture_output=True, text=True, check=True
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        timings.append((int(cumulative), module.rstrip()))
+    timings.sort(reverse=True)
+    # Startup logging may also write to stdout; the list is the last line
+    output = result.stdout.strip().splitlines()
+    loaded = [m for m in output[-1].split(",") if m] if output else []
+    return timings[:top], loaded
+
+
+def main(args) -> int:
+    slowest, loaded = import_report(args.top)
+    print("Slowest imports (cumulative):")
+    for cumulative, module in slowest:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+    samples = sorted(time_to_first_response(args.timeout) for _ in range(args.runs))
+    median_ms = samples[len(samples) // 2] * 1000
+    print(f"Time to first response: median {median_ms:.0f} ms over {args.runs} runs "
+          f"(min {samples[0] * 1000:.0f}, max {samples[-1] * 1000:.0f}; budget {args.budget_ms} ms)")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: imported at startup but should be deferred: {', '.join(loaded)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: startup exceeds the budget by {median_ms - args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=2500, help="Maximum median time to first response")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for each server to answer")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,149 @@
+"""
+Response compression.
+
+CompressionMiddleware gzip- or brotli-encodes text-like responses above a size
+threshold, picking the encoding from Accept-Encoding. Streamed bodies are
+compressed incrementally. Responses that already carry a Content-Encoding
+(such as pre-compressed cached payloads from payload_cache.py) and binary
+content like pitch decks and photos pass through untouched.
+
+Environment:
+    COMPRESSION_MIN_SIZE   smallest body in bytes worth compressing (default 1024)
+    GZIP_LEVEL             zlib level 1-9 (default 6)
+    BROTLI_QUALITY         brotli quality 0-11 (default 5)
+"""
+
+import gzip
+import os
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip only
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best encoding the client accepts: br when available, then gzip"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(coding.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+            self._write = self._compressor.process
+        else:
+            # wbits=31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+            self._write = self._compressor.compress
+
+    def chunk(self, data: bytes, last: bool) -> bytes:
+        out = self._write(data) if data else b""
+        return out + (self._finish() if last else self._flush())
+
+
+def _header(headers: list, name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware; buffers only the first body chunk to decide on compression"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding((_header(scope["headers"], b"accept-encoding") or b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                content_type = (_header(headers, b"content-type") or b"").decode("latin-1")
+                if _header(headers, b"content-encoding") or not content_type.startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None and start_message is not None:
+                headers = [(k, v) for k, v in start_message.get("headers", []) if k.lower() != b"content-length"]
+                headers.append((b"vary", b"Accept-Encoding"))
+
+                if not more_body:
+                    # Whole body in one message: compress it at once if it's big enough
+                    if len(body) < self.minimum_size:
+                        passthrough = True
+                        await send(start_message)
+                        await send(message)
+                        return
+                    body = compress(body, encoding)
+                    headers += [(b"content-encoding", encoding.encode()), (b"content-length", str(len(body)).encode())]
+                    await send({**start_message, "headers": headers})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                # Streaming response: compress chunk by chunk without a content-length
+                compressor = _StreamCompressor(encoding)
+                headers.append((b"content-encoding", encoding.encode()))
+                await send({**start_message, "headers": headers})
+
+            await send({
+                "type": "http.response.body",
+                "body": compressor.chunk(body, last=not more_body),
+                "more_body": more_body
+            })
+
+        await self.app(scope, receive, send_wrapper)
@@ -6,12 +6,15 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import all models explicitly
 from Models.base import Base
-from Models.Auth_models import User, OTP
-from Models.Startup_profile_models import StartupProfile, Founder, StartupRevenueMetrics, FundUsage
+from Models.Auth_models import User, OTP, RefreshToken, RevokedSession
+from Models.Startup_profile_models import StartupProfile, Founder, StartupRevenueMetrics, FundUsage, PitchDeckVersion
 from Models.Investor_profile_models import InvestorProfile
 from Models.Application_models import Application, ApplicationLog, InterestStatus
+from Models.Dashboard_models import DashboardCounter
 
 from Database.db import engine
+from alembic import command
+from alembic.config import Config
 
 def create_tables():
     """Create all database tables"""
@@ -34,6 +37,9 @@ def create_tables():
         print("Creating new tables...")
         Base.metadata.create_all(bind=engine)
         
+        # The new schema matches the latest migration; record that so migrate_db.py only applies later ones
+        command.stamp(Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")), "head")
+        
         print("Database tables created successfully!")
         
         # Verify tables were created
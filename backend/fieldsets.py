@@ -0,0 +1,57 @@
+"""
+Sparse fieldsets for list endpoints.
+
+Clients pass ?fields=company_name,industry to receive only those keys. The
+requested columns are pushed into the query with load_only and relationships
+are only loaded when asked for, so card views read and send far less data.
+"""
+
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+# Always returned so clients can key and link rows
+ALWAYS_INCLUDED = ("id", "user_id")
+
+
+def parse_fields(fields: Optional[str], model, relationships: tuple = ()) -> Optional[tuple]:
+    """
+    Split a fields= value into (columns, relationships) for the model, or
+    return None when no projection was requested. Only the relationships
+    listed by the caller may be requested.
+    """
+    if not fields:
+        return None
+
+    mapper = inspect(model)
+    column_names = set(mapper.columns.keys())
+    relationship_names = set(relationships)
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - column_names - relationship_names
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+
+    columns = [name for name in ALWAYS_INCLUDED if name in column_names]
+    columns += sorted((requested & column_names) - set(columns))
+    return columns, sorted(requested & relationship_names)
+
+
+def fieldset_key(projection: Optional[tuple]) -> str:
+    """
+    Canonical form of a parse_fields() result, for caching: reordered,
+    repeated or padded names map to the same key
+    """
+    if projection is None:
+        return ""
+    columns, relationships = projection
+    return ",".join(list(columns) + list(relationships))
+
+
+def load_only_columns(model, columns: list):
+    """load_only() option for the given column names"""
+    return load_only(*[getattr(model, name) for name in columns])
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Find uploaded files that no startup profile, founder, application or investor
+profile references any more. Reports them by default; pass --delete to remove
+them in batches. Files modified within the grace period are never touched, so
+uploads whose database commit is still in flight survive a concurrent run.
+"""
+
+import sys
+import os
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Database.db import SessionLocal
+import Models  # noqa: F401 - register all models
+from Crud.upload_crud import referenced_upload_keys, still_referenced, delete_orphaned_versions
+from storage import get_storage
+
+UPLOAD_PREFIX = "uploads/"
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+def collect_orphaned_uploads(grace_hours: float = 24, batch_size: int = 500, delete: bool = False) -> dict:
+    storage = get_storage()
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=grace_hours)
+    started = time.monotonic()
+    stats = {
+        "scanned": 0,
+        "referenced": 0,
+        "within_grace_period": 0,
+        "orphaned": 0,
+        "orphaned_bytes": 0,
+        "deleted": 0,
+        "bytes_reclaimed": 0,
+        "versions_removed": 0,
+    }
+
+    db = SessionLocal()
+    try:
+        referenced = referenced_upload_keys(db)
+
+        batch = []
+        def delete_batch():
+            keep = still_referenced(db, [key for key, _ in batch])
+            doomed = [(key, size) for key, size in batch if key not in keep]
+            storage.delete_many([key for key, _ in doomed])
+            stats["versions_removed"] += delete_orphaned_versions(db, [key for key, _ in doomed])
+            stats["deleted"] += len(doomed)
+            stats["bytes_reclaimed"] += sum(size for _, size in doomed)
+            batch.clear()
+
+        for key, size, modified in storage.list(UPLOAD_PREFIX):
+            stats["scanned"] += 1
+            if key in referenced:
+                stats["referenced"] += 1
+                continue
+            if modified > cutoff:
+                stats["within_grace_period"] += 1
+                continue
+
+            stats["orphaned"] += 1
+            stats["orphaned_bytes"] += size
+            print(f"Orphaned: {key} ({_format_bytes(size)}, modified {modified:%Y-%m-%d %H:%M})")
+            if delete:
+                batch.append((key, size))
+                if len(batch) >= batch_size:
+                    delete_batch()
+        if delete and batch:
+            delete_batch()
+    finally:
+        db.close()
+
+    stats["duration_seconds"] = round(time.monotonic() - started, 3)
+    print(
+        f"Scanned {stats['scanned']} files in {stats['duration_seconds']}s: {stats['referenced']} referenced, "
+        f"{stats['within_grace_period']} within the grace period, {stats['orphaned']} orphaned "
+        f"({_format_bytes(stats['orphaned_bytes'])})"
+    )
+    if delete:
+        print(
+            f"Deleted {stats['deleted']} files ({stats['versions_removed']} pitch deck versions), "
+            f"reclaimed {_format_bytes(stats['bytes_reclaimed'])}"
+        )
+    elif stats["orphaned"]:
+        print("Run with --delete to remove them")
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--delete", action="store_true", help="Delete orphaned files instead of only reporting them")
+    parser.add_argument("--grace-hours", type=float, default=24, help="Never delete files modified more recently than this (default 24)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Files deleted per batch (default 500)")
+    args = parser.parse_args()
+    collect_orphaned_uploads(grace_hours=args.grace_hours, batch_size=args.batch_size, delete=args.delete)
@@ -0,0 +1,116 @@
+"""
+Gunicorn settings for production:
+    gunicorn -c gunicorn_conf.py main:app
+
+Every worker runs one uvicorn event loop (DrainingUvicornWorker). The app is
+imported once in the master before the workers are forked, so they share its
+memory and a broken import fails the deploy instead of crash-looping workers;
+restart the master rather than sending HUP to pick up new code.
+
+On SIGTERM gunicorn stops accepting connections and each worker finishes the
+requests it is serving, uploads included, for GUNICORN_GRACEFUL_TIMEOUT minus
+10 seconds, then stops the maintenance scheduler and flushes its log queue.
+Requests still running after that are cancelled; resumable uploads continue
+from their last stored chunk. Give the container at least the graceful timeout
+to stop (docker stop -t, stop_grace_period).
+
+OTPs and rate-limit buckets must be shared by all workers: an OTP sent
+through one worker is unknown to the others, and each worker would allow the
+full rate. While OTP_STORE or RATE_LIMIT_BACKEND is memory, the default is a
+single worker, and an explicit WEB_CONCURRENCY above 1 refuses to start. Use
+OTP_STORE=sql or redis and RATE_LIMIT_BACKEND=redis (or RATE_LIMIT_ENABLED=false)
+to run several. READ_AFTER_WRITE_STORE=memory with several workers only logs
+a warning, since it at worst serves a read from a lagging replica.
+
+Environment:
+    PORT                       port to listen on, on all interfaces (default 8000)
+    GUNICORN_BIND              explicit bind address, overrides PORT
+    WEB_CONCURRENCY            worker processes (default one per CPU core available to the process,
+                               or 1 while an OTP or rate-limit store is per-process)
+    GUNICORN_KEEPALIVE         seconds idle client connections stay open (default 65); keep it above
+                               the load balancer's idle timeout so it never reuses a closed connection
+    GUNICORN_TIMEOUT           seconds a worker's event loop may stall before it is restarted (default 30)
+    GUNICORN_GRACEFUL_TIMEOUT  seconds a worker gets to drain and shut down after SIGTERM (default 40)
+    GUNICORN_PRELOAD           import the app in the master before forking (default true)
+    GUNICORN_MAX_REQUESTS      restart a worker after this many requests, 0 for never (default 0)
+"""
+
+import os
+import sys
+from importlib.util import find_spec
+
+
+def _cpu_count() -> int:
+    # Respects CPU affinity (taskset, cpusets), unlike os.cpu_count()
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _per_process_stores() -> list:
+    """Settings that break signup or rate limiting with more than one worker"""
+    # Read from the environment with the same defaults as otp_store.py and
+    # rate_limit.py; the app isn't imported yet when this file is loaded
+    stores = []
+    if os.getenv("OTP_STORE", "memory").lower() == "memory":
+        stores.append("OTP_STORE=memory")
+    if (os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+            and os.getenv("RATE_LIMIT_BACKEND", "memory").lower() == "memory"):
+        stores.append("RATE_LIMIT_BACKEND=memory")
+    return stores
+
+
+per_process_stores = _per_process_stores()
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv("WEB_CONCURRENCY") or (1 if per_process_stores else _cpu_count()))
+worker_class = "uvicorn_worker.DrainingUvicornWorker"
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "65"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "40"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+# Spread restarts so workers don't all recycle at once
+max_requests_jitter = max_requests // 10
+
+# Application logs are structured JSON (logging_config.py); gunicorn only logs its own events
+accesslog = None
+errorlog = "-"
+
+
+def on_starting(server):
+    # cfg.workers includes a -w/--workers given on the command line
+    if server.cfg.workers > 1 and per_process_stores:
+        server.log.error(
+            "%d workers with %s: OTPs and rate limits would not be shared between workers. "
+            "Set OTP_STORE=sql or redis and RATE_LIMIT_BACKEND=redis, or run one worker",
+            server.cfg.workers, " and ".join(per_process_stores)
+        )
+        sys.exit(1)
+
+
+def when_ready(server):
+    # With preload the app modules are already imported, so these imports are free
+    from Database.db import DB_POOL_SIZE, DB_MAX_OVERFLOW, DATABASE_READ_URL, READ_AFTER_WRITE_STORE
+
+    server.log.info(
+        "Serving with %d workers (loop=%s, http=%s, keepalive=%ss, graceful_timeout=%ss), "
+        "up to %d database connections",
+        server.cfg.workers,
+        "uvloop" if find_spec("uvloop") else "asyncio",
+        "httptools" if find_spec("httptools") else "h11",
+        keepalive, graceful_timeout,
+        server.cfg.workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    )
+
+    if per_process_stores and _cpu_count() > 1:
+        server.log.info(
+            "Running a single worker because of %s; set OTP_STORE=sql or redis and "
+            "RATE_LIMIT_BACKEND=redis to use all %d cores",
+            " and ".join(per_process_stores), _cpu_count()
+        )
+    if server.cfg.workers > 1 and DATABASE_READ_URL and READ_AFTER_WRITE_STORE == "memory":
+        server.log.warning(
+            "READ_AFTER_WRITE_STORE=memory with %d workers: a read after a write may go to a lagging replica; "
+            "use redis", server.cfg.workers
+        )
@@ -0,0 +1,140 @@
+"""
+Liveness and readiness for load balancers and orchestrators.
+
+/health/live only says the worker's event loop is answering. /health/ready
+reports whether it can serve requests. It reads results kept by a background
+thread that probes the dependencies every HEALTH_PROBE_INTERVAL_SECONDS, so
+however often the orchestrator asks, the database sees one `SELECT 1` per
+interval per worker. The probes are:
+    database           SELECT 1 on the primary (and database_replica on
+                       DATABASE_READ_URL when set)
+    storage            write and delete a small object in the upload storage
+    mail               OTP emails being sent; more than HEALTH_MAX_MAIL_IN_FLIGHT
+                       means SMTP is hanging and tying up request threads
+
+The worker is ready once every probe has passed and none of the results is
+older than HEALTH_STALE_SECONDS. A hung probe therefore turns the worker not
+ready instead of leaving a stale pass in place.
+
+Environment:
+    HEALTH_PROBE_INTERVAL_SECONDS  time between probe runs (default 10)
+    HEALTH_STALE_SECONDS           age at which a probe result no longer counts (default 3x the interval)
+    HEALTH_MAX_MAIL_IN_FLIGHT      concurrent OTP sends above which the worker reports not ready (default 20)
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import text
+from Database.db import DATABASE_READ_URL, get_engine, get_read_engine
+from storage import get_storage
+from utils import mail_in_flight
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "10"))
+HEALTH_STALE_SECONDS = float(os.getenv("HEALTH_STALE_SECONDS", str(HEALTH_PROBE_INTERVAL_SECONDS * 3)))
+HEALTH_MAX_MAIL_IN_FLIGHT = int(os.getenv("HEALTH_MAX_MAIL_IN_FLIGHT", "20"))
+
+
+def probe_database() -> dict:
+    with get_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return {}
+
+
+def probe_database_replica() -> dict:
+    with get_read_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return {}
+
+
+def probe_storage() -> dict:
+    storage = get_storage()
+    # One object per worker, so workers sharing a volume or bucket don't collide
+    key = f".health-probe-{socket.gethostname()}-{os.getpid()}"
+    storage.save_bytes(key, b"ok", content_type="text/plain")
+    storage.delete(key)
+    return {"backend": storage.name}
+
+
+def probe_mail() -> dict:
+    in_flight = mail_in_flight()
+    if in_flight > HEALTH_MAX_MAIL_IN_FLIGHT:
+        raise RuntimeError(f"{in_flight} OTP emails in progress (limit {HEALTH_MAX_MAIL_IN_FLIGHT})")
+    return {"in_flight": in_flight}
+
+
+HEALTH_PROBES = {
+    "database": probe_database,
+    "storage": probe_storage,
+    "mail": probe_mail,
+}
+if DATABASE_READ_URL:
+    HEALTH_PROBES["database_replica"] = probe_database_replica
+
+
+class HealthMonitor:
+    def __init__(self, probes: dict, interval: float, stale_after: float):
+        self.probes = probes
+        self.interval = interval
+        self.stale_after = stale_after
+        self._results = {}  # name -> (monotonic time checked, result dict)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        """Run every probe once; a failing probe is recorded and doesn't stop the others"""
+        for name, probe in self.probes.items():
+            started = time.monotonic()
+            result = {"checked_at": datetime.utcnow().isoformat() + "Z"}
+            try:
+                result.update(probe())
+                result["status"] = "ok"
+            except Exception as e:
+                result["status"] = "error"
+                result["error"] = str(e)
+            result["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+            previous = self._results.get(name)
+            if result["status"] == "error" and (previous is None or previous[1]["status"] == "ok"):
+                logger.warning("Health probe failed", extra={"probe": name, **result})
+            elif result["status"] == "ok" and previous is not None and previous[1]["status"] == "error":
+                logger.info("Health probe recovered", extra={"probe": name, **result})
+            self._results[name] = (time.monotonic(), result)
+
+    def readiness(self) -> tuple:
+        """(ready, per-probe results); a probe without a recent result counts as failing"""
+        now = time.monotonic()
+        ready = True
+        report = {}
+        for name in self.probes:
+            checked, result = self._results.get(name, (None, {"status": "pending"}))
+            if checked is not None and now - checked > self.stale_after:
+                result = {**result, "status": "stale"}
+            report[name] = result
+            ready = ready and result["status"] == "ok"
+        return ready, report
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.run_once()
+            self._stop_event.wait(self.interval)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+monitor = HealthMonitor(HEALTH_PROBES, HEALTH_PROBE_INTERVAL_SECONDS, HEALTH_STALE_SECONDS)
@@ -0,0 +1,105 @@
+"""
+Profile photo processing.
+
+Uploaded photos are decoded once in a background task, rotated according to
+their EXIF orientation and re-encoded without any metadata (EXIF, GPS, ICC
+comments) into fixed-size WebP and JPEG variants. Variant names include a hash
+of their bytes, so they can be served with immutable cache headers and change
+name whenever the image changes.
+
+Variants are written through the storage backend (storage.py). Pillow is
+optional: without it uploads are stored as sent and no variants are produced.
+"""
+
+import hashlib
+import io
+import logging
+from importlib.util import find_spec
+from typing import Optional
+
+# Pillow is optional (photos are then served as uploaded) and only imported when a photo is processed
+PILLOW_INSTALLED = find_spec("PIL") is not None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PHOTO_DIR = "uploads/profile_photos"
+PROFILE_PHOTO_URL = "/uploads/profile_photos"
+
+# name -> (width, height, crop to fill); "full" keeps the aspect ratio and never upscales
+PHOTO_VARIANTS = {
+    "thumb": (96, 96, True),
+    "card": (320, 320, True),
+    "full": (1024, 1024, False),
+}
+OUTPUT_FORMATS = {"webp": ("WEBP", {"quality": 80, "method": 4}), "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True})}
+
+# Refuse images that would decode to more pixels than this (decompression bombs)
+MAX_IMAGE_PIXELS = 40_000_000
+
+
+def pipeline_available() -> bool:
+    return PILLOW_INSTALLED
+
+
+def _encode(image, fmt: str) -> bytes:
+    from PIL import Image
+    pil_format, options = OUTPUT_FORMATS[fmt]
+    if pil_format == "JPEG" and image.mode != "RGB":
+        # JPEG has no alpha channel; flatten onto white
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A") if "A" in image.getbands() else None)
+        image = background
+    buffer = io.BytesIO()
+    # No exif/icc_profile arguments, so nothing from the upload is carried over
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def build_photo_variants(data: bytes, user_id: int) -> Optional[tuple]:
+    """
+    Build the photo variants for an uploaded image. Returns (variants, files):
+    variants is {variant: {"width", "height", "webp", "jpeg"}} with URLs and
+    files is a list of (storage key, bytes, content type) to store. Returns
+    None if the image can't be decoded.
+    """
+    from PIL import Image, ImageOps
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    try:
+        with Image.open(io.BytesIO(data)) as original:
+            original.load()
+            image = ImageOps.exif_transpose(original)
+    except (OSError, Image.DecompressionBombError) as e:
+        logger.warning("Could not decode profile photo", extra={"user_id": user_id, "error": str(e)})
+        return None
+
+    image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+
+    variants = {}
+    files = []
+    for name, (width, height, crop) in PHOTO_VARIANTS.items():
+        if crop:
+            resized = ImageOps.fit(image, (width, height), Image.LANCZOS)
+        else:
+            resized = image.copy()
+            resized.thumbnail((width, height), Image.LANCZOS)
+
+        variant = {"width": resized.width, "height": resized.height}
+        for fmt in OUTPUT_FORMATS:
+            encoded = _encode(resized, fmt)
+            digest = hashlib.sha256(encoded).hexdigest()[:16]
+            filename = f"{user_id}-{name}-{digest}.{'jpg' if fmt == 'jpeg' else fmt}"
+            files.append((f"{PROFILE_PHOTO_DIR}/{filename}", encoded, f"image/{fmt}"))
+            variant[fmt] = f"{PROFILE_PHOTO_URL}/{filename}"
+        variants[name] = variant
+    return variants, files
+
+
+def variant_keys(variants: Optional[dict]) -> set:
+    """Storage keys referenced by a variants dict"""
+    if not variants:
+        return set()
+    return {
+        url.lstrip("/")
+        for variant in variants.values()
+        for fmt, url in variant.items() if fmt in OUTPUT_FORMATS
+    }
@@ -0,0 +1,258 @@
+"""
+Request timing and SQL instrumentation.
+
+The ASGI middleware records per-route latency histograms and the number and
+duration of SQL statements issued while serving each request. SQL is measured
+through SQLAlchemy cursor events registered on the engine in Database/db.py,
+and the time spent waiting for a pooled connection through TimedQueuePool.
+Every response gets a Server-Timing header and the collected metrics are
+rendered in Prometheus text format for the /metrics endpoint.
+"""
+
+import os
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# Statement texts kept per request when a consumer (the slow-request profiler) asks for them
+MAX_RECORDED_STATEMENTS = 200
+
+SERVER_TIMING_ENABLED = os.getenv("ENABLE_SERVER_TIMING", "true").lower() == "true"
+
+# Per-request SQL stats; a mutable dict so threadpool workers update the same object
+_request_stats: ContextVar[Optional[dict]] = ContextVar("request_stats", default=None)
+
+_lock = threading.Lock()
+
+# HTTP requests this worker is serving; only touched on the event loop thread
+_in_flight = 0
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram keyed by a label tuple"""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple, buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, labels: tuple, value: float):
+        with _lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._series[labels] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with _lock:
+            for labels, series in sorted(self._series.items()):
+                base = _format_labels(self.label_names, labels)
+                prefix = f"{base}," if base else ""
+                suffix = f"{{{base}}}" if base else ""
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {count}')
+                lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series["count"]}')
+                lines.append(f"{self.name}_sum{suffix} {series['sum']}")
+                lines.append(f"{self.name}_count{suffix} {series['count']}")
+        return lines
+
+
+class Counter:
+    """Monotonic Prometheus-style counter keyed by a label tuple"""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        with _lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with _lock:
+            for labels, value in sorted(self._values.items()):
+                if self.label_names:
+                    lines.append(f"{self.name}{{{_format_labels(self.label_names, labels)}}} {value}")
+                else:
+                    lines.append(f"{self.name} {value}")
+        return lines
+
+
+class Gauge:
+    """Prometheus-style gauge whose value is read from a callback at render time"""
+
+    def __init__(self, name: str, help_text: str, read):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+
+    def render(self) -> list:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {self.read()}"]
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by route", ("method", "route"), LATENCY_BUCKETS
+)
+REQUESTS_TOTAL = Counter("http_requests_total", "Requests served by route and status", ("method", "route", "status"))
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements", "SQL statements executed per request", ("method", "route"), SQL_COUNT_BUCKETS
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "http_request_sql_duration_seconds", "Time spent in SQL per request", ("method", "route"), LATENCY_BUCKETS
+)
+SQL_STATEMENTS_TOTAL = Counter("sql_statements_total", "SQL statements executed, inside or outside requests", ())
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time to get a connection from the pool, including opening one", (), POOL_WAIT_BUCKETS
+)
+READ_ROUTING_TOTAL = Counter("db_read_sessions_total", "Read sessions by the engine they were routed to", ("target",))
+POOL_CHECKOUT_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT", ())
+
+# Pools created by the engines in this process
+_pools = weakref.WeakSet()
+
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently in use", lambda: sum(p.checkedout() for p in list(_pools)))
+POOL_IDLE = Gauge("db_pool_idle", "Idle connections kept by the pool", lambda: sum(p.checkedin() for p in list(_pools)))
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being served by this worker", lambda: _in_flight)
+
+METRICS = [
+    REQUEST_LATENCY, REQUESTS_TOTAL, REQUEST_SQL_STATEMENTS, REQUEST_SQL_SECONDS, SQL_STATEMENTS_TOTAL,
+    POOL_CHECKOUT_WAIT, POOL_CHECKOUT_TIMEOUTS, POOL_CHECKED_OUT, POOL_IDLE, READ_ROUTING_TOTAL, REQUESTS_IN_FLIGHT
+]
+
+
+def render_metrics() -> str:
+    """Render all registered metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def current_request_stats() -> Optional[dict]:
+    """SQL stats for the request being served, or None outside a request"""
+    return _request_stats.get()
+
+
+def requests_in_flight() -> int:
+    """Requests currently being served by this worker, including the caller's"""
+    return _in_flight
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _pools.add(self)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            POOL_CHECKOUT_WAIT.observe((), waited)
+            stats = _request_stats.get()
+            if stats is not None:
+                stats["pool_wait"] += waited
+
+
+def instrument_engine(engine):
+    """Register cursor events that attribute SQL count and time to the current request"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+        stats = _request_stats.get()
+        if stats is not None and "threads" in stats:
+            # Lets the slow-request profiler find threadpool threads serving this request
+            stats["threads"].add(threading.get_ident())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        SQL_STATEMENTS_TOTAL.inc()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats["sql_count"] += 1
+            stats["sql_time"] += elapsed
+            statements = stats.get("statements")
+            if statements is not None and len(statements) < MAX_RECORDED_STATEMENTS:
+                statements.append({"sql": statement[:2000], "ms": round(elapsed * 1000, 2)})
+
+
+class InstrumentationMiddleware:
+    """Pure ASGI middleware so timing wraps the whole app without buffering bodies"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global _in_flight
+        _in_flight += 1
+        stats = {"sql_count": 0, "sql_time": 0.0, "pool_wait": 0.0}
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SERVER_TIMING_ENABLED:
+                    app_ms = (time.perf_counter() - start) * 1000
+                    db_ms = stats["sql_time"] * 1000
+                    pool_ms = stats["pool_wait"] * 1000
+                    timing = f'app;dur={app_ms:.1f}, db;dur={db_ms:.1f};desc="{stats["sql_count"]} queries", pool;dur={pool_ms:.1f}'
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _in_flight -= 1
+            _request_stats.reset(token)
+            route = scope.get("route")
+            # Label by route template, not raw path, to keep series cardinality bounded
+            route_label = getattr(route, "path", None) or "unmatched"
+            labels = (scope["method"], route_label)
+            REQUEST_LATENCY.observe(labels, time.perf_counter() - start)
+            REQUESTS_TOTAL.inc(labels + (str(status_code),))
+            REQUEST_SQL_STATEMENTS.observe(labels, stats["sql_count"])
+            REQUEST_SQL_SECONDS.observe(labels, stats["sql_time"])
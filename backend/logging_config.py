@@ -0,0 +1,111 @@
+"""
+Structured, leveled logging for the API.
+
+Records are handed to a QueueHandler so request threads never block on stdout;
+a single QueueListener thread formats and writes them. Hot paths can log with
+extra={"sample_rate": HOT_PATH_SAMPLE_RATE} so only a fraction of those
+records are kept.
+
+Environment:
+    LOG_LEVEL              DEBUG, INFO, WARNING, ... (default INFO, WARNING in production)
+    LOG_FORMAT             json or text (default json)
+    LOG_HOT_PATH_SAMPLE    fraction of hot-path records to keep (default 1.0, 0.1 in production)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+IS_PRODUCTION = os.getenv("ENVIRONMENT") == "production"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING" if IS_PRODUCTION else "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+HOT_PATH_SAMPLE_RATE = float(os.getenv("LOG_HOT_PATH_SAMPLE", "0.1" if IS_PRODUCTION else "1.0"))
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "sample_rate"}
+
+_listener = None
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, including any fields passed through `extra`"""
+
+    def format(self, record):
+        payload = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Drop records probabilistically according to their `sample_rate` extra"""
+
+    def filter(self, record):
+        rate = getattr(record, "sample_rate", 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+def redact_email(email) -> str:
+    """Mask the local part of an email address for logging: jane@x.com -> j***@x.com"""
+    if not email or "@" not in str(email):
+        return "***"
+    local, domain = str(email).split("@", 1)
+    return f"{local[:1]}***@{domain}"
+
+
+def setup_logging():
+    """Configure the root logger with a non-blocking queue handler (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        stream_handler.setFormatter(JSONFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    os.register_at_fork(after_in_child=lambda: _restart_listener(queue_handler, stream_handler))
+
+
+def _restart_listener(queue_handler, stream_handler):
+    # Threads don't survive fork, so a worker forked after setup_logging (gunicorn
+    # --preload) starts its own listener on a fresh queue instead of one nobody drains
+    global _listener
+    if _listener is None:
+        return
+    log_queue = queue.SimpleQueue()
+    queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,23 +1,58 @@
 import os
 import sys
+import time
+
+# Measured from here so the startup log covers imports and app setup
+_import_started = time.perf_counter()
 
 # Add the current directory to Python path to ensure local imports work
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
-from fastapi import FastAPI
+# Configure logging before anything else logs at import time
+from logging_config import setup_logging
+setup_logging()
+
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, PlainTextResponse, RedirectResponse
 
 # Import all models to ensure they are registered
-from Models.Auth_models import User
-from Models.Startup_profile_models import StartupProfile, Founder, StartupRevenueMetrics, FundUsage
+from Models.Auth_models import User, RefreshToken, RevokedSession
+from Models.Startup_profile_models import StartupProfile, Founder, StartupRevenueMetrics, FundUsage, PitchDeckVersion
 from Models.Investor_profile_models import InvestorProfile
 from Models.Application_models import Application
-
-from Routers import Signup, investor_profile, startup_profile, application
-
-app = FastAPI(title="Startup Investor Platform API", version="1.0.0")
+from Models.Dashboard_models import DashboardCounter
+
+from compression import CompressionMiddleware
+from maintenance import MAINTENANCE_ENABLED, scheduler as maintenance_scheduler
+from health import monitor as health_monitor
+from instrumentation import InstrumentationMiddleware, render_metrics, requests_in_flight
+from profiling import SlowRequestProfilerMiddleware
+from static_files import HASHED_NAME, CachedStaticFiles
+from storage import IMMUTABLE_CACHE_CONTROL, S3_PRESIGN_EXPIRES, S3_PUBLIC_BASE_URL, get_storage
+from Routers import Signup, investor_profile, startup_profile, application, dashboard, admin, resumable_upload
+
+logger = logging.getLogger(__name__)
+
+# When this worker started serving (set in lifespan, which runs in each worker after fork)
+_worker_started = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _worker_started
+    _worker_started = time.monotonic()
+    logger.info("Application started", extra={"startup_ms": round((time.perf_counter() - _import_started) * 1000, 1)})
+    health_monitor.start()
+    if MAINTENANCE_ENABLED:
+        maintenance_scheduler.start()
+    yield
+    health_monitor.stop()
+    maintenance_scheduler.stop()
+
+app = FastAPI(title="Startup Investor Platform API", version="1.0.0", lifespan=lifespan)
 
 # Environment variables
 import os
@@ -40,18 +75,49 @@ app.add_middleware(
     allow_credentials=allow_credentials,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Read by the resumable upload client
+    expose_headers=["Upload-Offset", "Upload-Length", "Location"],
 )
 
-# Mount static files from project root
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-uploads_dir = os.path.join(project_root, "uploads")
-app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
+# gzip/brotli for JSON and text bodies; pre-compressed cached payloads pass through
+app.add_middleware(CompressionMiddleware)
+
+# Slow-request profiler runs inside the instrumentation middleware so it can read the SQL stats
+app.add_middleware(SlowRequestProfilerMiddleware)
+
+# Request timing and SQL instrumentation (added last so it wraps everything)
+app.add_middleware(InstrumentationMiddleware)
+
+# Uploaded files: served from disk for the local backend, via presigned redirects for s3
+storage = get_storage()
+if storage.name == "local":
+    uploads_dir = os.path.join(storage.root, "uploads")
+    os.makedirs(uploads_dir, exist_ok=True)
+    legacy_dirs = tuple(os.path.join(root, "uploads") for root in storage.fallback_roots)
+    app.mount("/uploads", CachedStaticFiles(directory=uploads_dir, fallback_directories=legacy_dirs), name="uploads")
+else:
+    # No existence check: a missing key gets its 404 from the bucket, not a HEAD per request
+    @app.get("/uploads/profile_photos/{filename}", include_in_schema=False)
+    def profile_photo(filename: str):
+        key = f"uploads/profile_photos/{filename}"
+        if S3_PUBLIC_BASE_URL:
+            # Variants are content-hashed, so their redirect never changes either
+            cache_control = IMMUTABLE_CACHE_CONTROL if HASHED_NAME.search(filename) else "public, max-age=300"
+            return RedirectResponse(f"{S3_PUBLIC_BASE_URL}/{key}", status_code=307, headers={"Cache-Control": cache_control})
+        # Reuse the signed URL for half its lifetime so browsers don't follow an expired one
+        return RedirectResponse(
+            storage.presigned_url(key), status_code=307,
+            headers={"Cache-Control": f"private, max-age={S3_PRESIGN_EXPIRES // 2}"}
+        )
 
 # Include routers with prefixes
 app.include_router(Signup.router, prefix="/auth", tags=["Authentication"])
 app.include_router(investor_profile.router, prefix="/investor-profile", tags=["Investor Profile"])
 app.include_router(startup_profile.router, prefix="/startup-profile", tags=["Startup Profile"])
+app.include_router(resumable_upload.router, prefix="/resumable-uploads", tags=["Resumable Uploads"])
 app.include_router(application.router, prefix="/applications", tags=["Applications"])
+app.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+app.include_router(admin.router, prefix="/admin", tags=["Admin"])
 
 @app.get("/")
 def read_root():
@@ -59,7 +125,35 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "message": "API is running"}
+    # Each gunicorn worker answers for itself; pid tells the workers behind one port apart
+    return {
+        "status": "healthy",
+        "message": "API is running",
+        "worker": {
+            "pid": os.getpid(),
+            "uptime_seconds": round(time.monotonic() - _worker_started, 1) if _worker_started else 0.0,
+            "requests_in_flight": requests_in_flight()
+        }
+    }
+
+@app.get("/health/live")
+def liveness():
+    """The worker is up; no dependencies are checked (liveness probe)"""
+    return {"status": "alive", "pid": os.getpid()}
+
+@app.get("/health/ready")
+def readiness():
+    """Dependency status from the background probes in health.py; 503 until all pass (readiness probe)"""
+    ready, checks = health_monitor.readiness()
+    return JSONResponse(
+        {"status": "ready" if ready else "not_ready", "pid": os.getpid(), "checks": checks},
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Prometheus metrics: route latency histograms and per-request SQL counts"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 @app.get("/test")
 def test_endpoint():
@@ -78,43 +172,24 @@ def debug_info():
 def check_database():
     """Check database tables and status"""
     try:
-        from sqlalchemy import text
-        from Database.db import engine
-        
-        with engine.connect() as conn:
-            # Get all tables
-            result = conn.execute(text("SELECT table_name FROM information_schema.tables WHERE table_schema = 'public' ORDER BY table_name"))
-            tables = [row[0] for row in result]
-            
-            # Check if users table exists and count users
-            user_count = 0
-            if 'users' in tables:
-                result = conn.execute(text("SELECT COUNT(*) FROM users"))
-                user_count = result.fetchone()[0]
-            
-            # Check startup profiles
-            startup_count = 0
-            if 'startup_profiles' in tables:
-                result = conn.execute(text("SELECT COUNT(*) FROM startup_profiles"))
-                startup_count = result.fetchone()[0]
-            
-            return {
-                "status": "connected",
-                "tables": tables,
-                "table_count": len(tables),
-                "users_count": user_count,
-                "startup_profiles_count": startup_count,
-                "users_table_exists": 'users' in tables,
-                "startup_profiles_table_exists": 'startup_profiles' in tables
-            }
+        from sqlalchemy import inspect
+        from Database.db import get_engine
+
+        # Reads the catalog of whichever database is configured; no row counts, so it stays cheap on large tables
+        tables = sorted(inspect(get_engine()).get_table_names())
+        return {
+            "status": "connected",
+            "tables": tables,
+            "table_count": len(tables),
+            "users_table_exists": 'users' in tables,
+            "startup_profiles_table_exists": 'startup_profiles' in tables
+        }
     except Exception as e:
         return {
             "status": "error",
             "error": str(e),
             "tables": [],
             "table_count": 0,
-            "users_count": 0,
-            "startup_profiles_count": 0,
             "users_table_exists": False,
             "startup_profiles_table_exists": False
         }
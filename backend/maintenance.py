@@ -0,0 +1,161 @@
+"""
+Periodic maintenance jobs run inside the API process.
+
+A single daemon thread wakes every MAINTENANCE_INTERVAL_SECONDS and runs each
+job in turn: expired OTPs, expired refresh tokens and session revocations,
+old application logs and abandoned resumable uploads. Rows are deleted MAINTENANCE_BATCH_SIZE at a time, one short
+transaction per batch with a pause in between, and at most
+MAINTENANCE_MAX_BATCHES per job per run, so a large backlog is worked off over
+several runs instead of holding locks. Each run logs and keeps, per job, its
+duration and the rows removed (GET /admin/maintenance).
+
+Every worker process runs its own scheduler; the jobs only delete rows that
+are already expired, so overlapping runs are harmless.
+
+Environment:
+    MAINTENANCE_ENABLED             run the scheduler (default true)
+    MAINTENANCE_INTERVAL_SECONDS    time between runs (default 300)
+    MAINTENANCE_BATCH_SIZE          rows deleted per transaction (default 500)
+    MAINTENANCE_MAX_BATCHES         batches per job per run (default 20)
+    APPLICATION_LOG_RETENTION_DAYS  age at which application_logs rows are deleted (default 365; 0 keeps them)
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from Database.db import SessionLocal
+from Models.Auth_models import OTP, RefreshToken, RevokedSession
+from Models.Application_models import ApplicationLog
+from otp_store import get_otp_store
+import partial_uploads
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_ENABLED = os.getenv("MAINTENANCE_ENABLED", "true").lower() == "true"
+MAINTENANCE_INTERVAL_SECONDS = float(os.getenv("MAINTENANCE_INTERVAL_SECONDS", "300"))
+MAINTENANCE_BATCH_SIZE = int(os.getenv("MAINTENANCE_BATCH_SIZE", "500"))
+MAINTENANCE_MAX_BATCHES = int(os.getenv("MAINTENANCE_MAX_BATCHES", "20"))
+APPLICATION_LOG_RETENTION_DAYS = int(os.getenv("APPLICATION_LOG_RETENTION_DAYS", "365"))
+
+# Pause between batches so other transactions get the table
+BATCH_PAUSE_SECONDS = 0.05
+
+
+def _delete_in_batches(model, condition, stop_event: threading.Event) -> int:
+    """Delete rows matching condition by primary key, one bounded transaction at a time"""
+    removed = 0
+    for _ in range(MAINTENANCE_MAX_BATCHES):
+        db = SessionLocal()
+        try:
+            ids = [row[0] for row in db.query(model.id).filter(condition).limit(MAINTENANCE_BATCH_SIZE)]
+            if ids:
+                db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        removed += len(ids)
+        if len(ids) < MAINTENANCE_BATCH_SIZE or stop_event.wait(BATCH_PAUSE_SECONDS):
+            break
+    return removed
+
+
+def purge_expired_otps(stop_event: threading.Event) -> int:
+    # The otps table is purged whichever store is active; rows from before a switch expire too
+    removed = _delete_in_batches(OTP, OTP.expires_at <= datetime.utcnow(), stop_event)
+    store = get_otp_store()
+    if store.name != "sql":
+        removed += store.purge_expired(limit=MAINTENANCE_BATCH_SIZE * MAINTENANCE_MAX_BATCHES)
+    return removed
+
+
+def purge_expired_tokens(stop_event: threading.Event) -> int:
+    now = datetime.utcnow()
+    removed = _delete_in_batches(RefreshToken, RefreshToken.expires_at <= now, stop_event)
+    return removed + _delete_in_batches(RevokedSession, RevokedSession.expires_at <= now, stop_event)
+
+
+def purge_application_logs(stop_event: threading.Event) -> int:
+    if APPLICATION_LOG_RETENTION_DAYS <= 0:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(days=APPLICATION_LOG_RETENTION_DAYS)
+    return _delete_in_batches(ApplicationLog, ApplicationLog.timestamp < cutoff, stop_event)
+
+
+def purge_abandoned_uploads(stop_event: threading.Event) -> int:
+    removed = 0
+    for upload_id, size in partial_uploads.iter_abandoned_uploads():
+        if removed >= MAINTENANCE_BATCH_SIZE * MAINTENANCE_MAX_BATCHES or stop_event.is_set():
+            break
+        partial_uploads.discard_upload(upload_id)
+        removed += 1
+    return removed
+
+
+MAINTENANCE_JOBS = {
+    "expired_otps": purge_expired_otps,
+    "expired_tokens": purge_expired_tokens,
+    "application_logs": purge_application_logs,
+    "abandoned_uploads": purge_abandoned_uploads,
+}
+
+
+class MaintenanceScheduler:
+    def __init__(self, jobs: dict, interval: float):
+        self.jobs = jobs
+        self.interval = interval
+        self.last_results = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def run_once(self) -> dict:
+        """Run every job once; a failing job is logged and doesn't stop the others"""
+        for name, job in self.jobs.items():
+            if self._stop_event.is_set():
+                break
+            started = time.monotonic()
+            result = {"started_at": datetime.utcnow().isoformat() + "Z"}
+            try:
+                result["rows_removed"] = job(self._stop_event)
+                result["status"] = "ok"
+            except Exception as e:
+                result["status"] = "error"
+                result["error"] = str(e)
+                logger.exception("Maintenance job failed", extra={"job": name})
+            result["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+            self.last_results[name] = result
+            if result.get("rows_removed"):
+                logger.info("Maintenance job finished", extra={"job": name, **result})
+            else:
+                logger.debug("Maintenance job finished", extra={"job": name, **result})
+        return self.last_results
+
+    def _run(self):
+        # Spread workers started together so their runs don't line up
+        if self._stop_event.wait(random.uniform(0, min(self.interval, 30))):
+            return
+        while not self._stop_event.is_set():
+            self.run_once()
+            self._stop_event.wait(self.interval)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="maintenance-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        """Signal the thread and wait for the job in progress to finish its current batch"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+scheduler = MaintenanceScheduler(MAINTENANCE_JOBS, MAINTENANCE_INTERVAL_SECONDS)
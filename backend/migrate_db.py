@@ -1,55 +1,157 @@
 #!/usr/bin/env python3
 """
 Database migration script for production environments.
-This script safely creates tables without dropping existing data.
+Applies the Alembic migrations in migrations/ (alembic upgrade head) without
+dropping existing data, then fills in data that needs application code.
+
+A database created with create_all before migrations existed has no
+alembic_version table; it is stamped at the baseline revision first, and the
+later revisions only add what it lacks.
 """
 
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import time
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, backend_dir)
 
-from sqlalchemy import text, inspect
-from Database.db import engine, Base
-from Models.Auth_models import User, OTP
-from Models.Startup_profile_models import StartupProfile, Founder, StartupRevenueMetrics, FundUsage
-from Models.Investor_profile_models import InvestorProfile
-from Models.Application_models import Application, ApplicationLog, InterestStatus
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from Database.db import engine, SessionLocal
+from storage import get_storage, storage_key
+from Models.Startup_profile_models import StartupProfile, PitchDeckVersion
+from Models.Application_models import Application
+import Models  # noqa: F401 - register all models
+from migrations.helpers import MIGRATION_BATCH_SIZE, MIGRATION_BATCH_PAUSE_SECONDS
 
-def migrate_database():
-    """Safely migrate database by creating missing tables"""
+# Revision matching the schema create_all produced before migrations were introduced
+BASELINE_REVISION = "0001"
+
+def alembic_config() -> Config:
+    return Config(os.path.join(backend_dir, "alembic.ini"))
+
+def _resolve_legacy_deck_key(storage, path):
+    """
+    Storage key of a deck saved before versioning, trying the locations older
+    code wrote to. A deck found only on local disk (e.g. under the project
+    root's uploads/ while storage is S3) is copied into storage first. Returns
+    None when the file is nowhere to be found.
+    """
+    basename = os.path.basename(path)
+    for key in (storage_key(path), f"uploads/pitch_decks/{basename}", f"uploads/{basename}"):
+        if storage.exists(key):
+            return key
+    
+    # The same places the old download endpoint probed
+    project_root = os.path.dirname(backend_dir)
+    local_candidates = [
+        os.path.join(project_root, path.lstrip("/")),
+        os.path.join(project_root, "uploads", "pitch_decks", basename),
+        os.path.join(backend_dir, "uploads", "pitch_decks", basename),
+        os.path.join(backend_dir, "uploads", basename)
+    ]
+    if os.path.isabs(path):
+        local_candidates.insert(0, path)
+    for candidate in local_candidates:
+        if os.path.isfile(candidate):
+            key = f"uploads/pitch_decks/{basename}"
+            with open(candidate, "rb") as f:
+                storage.save(key, f, "application/pdf" if basename.lower().endswith(".pdf") else None)
+            print(f"Copied pitch deck {candidate} into {storage.name} storage as {key}")
+            return key
+    return None
+
+def backfill_pitch_deck_versions(batch_size=MIGRATION_BATCH_SIZE):
+    """Create version rows for existing decks and pin profiles and applications to them"""
+    storage = get_storage()
+    db = SessionLocal()
     try:
-        print("Starting database migration...")
+        versions = {}
+        unresolved = set()
+        def version_for(user_id, path, filename, file_size=None, content_type=None):
+            """Version row for the deck, or None if its file is missing"""
+            if path in unresolved:
+                return None
+            key = _resolve_legacy_deck_key(storage, path)
+            if key is None:
+                unresolved.add(path)
+                print(f"Pitch deck file not found, leaving it unversioned: {path} (user {user_id})")
+                return None
+            if (user_id, key) not in versions:
+                version = PitchDeckVersion(
+                    user_id=user_id,
+                    filename=filename or os.path.basename(key),
+                    file_path=key,
+                    file_size=file_size,
+                    content_type=content_type
+                )
+                db.add(version)
+                versions[(user_id, key)] = version
+            return versions[(user_id, key)]
         
-        # Get existing tables
-        inspector = inspect(engine)
-        existing_tables = inspector.get_table_names()
-        print(f"Existing tables: {existing_tables}")
+        profiles = db.query(StartupProfile).filter(
+            StartupProfile.pitch_deck_file_path.isnot(None),
+            StartupProfile.pitch_deck_version_id.is_(None)
+        ).all()
+        pinned_profiles = 0
+        for profile in profiles:
+            version = version_for(profile.user_id, profile.pitch_deck_file_path, profile.pitch_deck_filename,
+                                  profile.pitch_deck_file_size, profile.pitch_deck_content_type)
+            if version is None:
+                continue
+            profile.pitch_deck_version = version
+            profile.pitch_deck_file_path = version.file_path
+            pinned_profiles += 1
+        db.commit()
         
-        # Get all required tables from metadata
-        required_tables = list(Base.metadata.tables.keys())
-        print(f"Required tables: {required_tables}")
+        pinned = 0
+        last_id = 0
+        while True:
+            # Keyset order: applications whose deck is missing stay unpinned and are skipped
+            applications = db.query(Application).filter(
+                Application.id > last_id,
+                Application.pitch_deck_version_id.is_(None),
+                Application.startup_id.isnot(None),
+                Application.pitch_deck_file_path.isnot(None)
+            ).order_by(Application.id).limit(batch_size).all()
+            if not applications:
+                break
+            for application in applications:
+                version = version_for(application.startup_id, application.pitch_deck_file_path, application.pitch_deck_filename)
+                if version is None:
+                    continue
+                application.pitch_deck_version = version
+                application.pitch_deck_file_path = version.file_path
+                pinned += 1
+            db.commit()
+            last_id = applications[-1].id
+            # Leave room for the API's writes between batches
+            time.sleep(MIGRATION_BATCH_PAUSE_SECONDS)
         
-        # Find missing tables
-        missing_tables = [table for table in required_tables if table not in existing_tables]
+        if pinned_profiles or pinned:
+            print(f"Backfilled pitch deck versions: {pinned_profiles} profiles, {pinned} applications")
+        if unresolved:
+            print(f"{len(unresolved)} pitch deck files were not found; their profiles and applications were "
+                  f"left unversioned and are retried on the next run")
+    finally:
+        db.close()
+
+def migrate_database():
+    """Bring the schema up to date with the migrations, then backfill"""
+    try:
+        print("Starting database migration...")
+        config = alembic_config()
         
-        if missing_tables:
-            print(f"Missing tables: {missing_tables}")
-            print("Creating missing tables...")
-            
-            # Create only missing tables
-            for table_name in missing_tables:
-                table = Base.metadata.tables[table_name]
-                table.create(engine)
-                print(f"Created table: {table_name}")
-        else:
-            print("All tables already exist!")
+        existing_tables = inspect(engine).get_table_names()
+        if "users" in existing_tables and "alembic_version" not in existing_tables:
+            print(f"Database predates migrations; stamping it at revision {BASELINE_REVISION}")
+            command.stamp(config, BASELINE_REVISION)
         
-        print("Database migration completed successfully!")
+        command.upgrade(config, "head")
+        backfill_pitch_deck_versions()
         
-        # Verify all tables exist
-        inspector = inspect(engine)
-        final_tables = inspector.get_table_names()
-        print(f"Final tables: {final_tables}")
+        print("Database migration completed successfully!")
         
     except Exception as e:
         print(f"Error during migration: {e}")
@@ -0,0 +1,78 @@
+"""
+Alembic environment (alembic.ini; run from the backend directory, or through migrate_db.py).
+
+The database is DATABASE_URL, resolved by Database/db.py exactly as the API
+resolves it. The target metadata is Models.base.Base with every model
+registered, so `alembic revision --autogenerate` compares the database
+against the models.
+
+Each revision runs in its own transaction, so it can step out of it for
+statements Postgres refuses inside one, such as CREATE INDEX CONCURRENTLY and
+batched backfills (migrations/helpers.py). On Postgres every statement waits
+at most MIGRATION_LOCK_TIMEOUT for its lock. A migration queued behind a long
+transaction fails and can be rerun, rather than stalling every request
+queued behind it.
+
+Environment:
+    MIGRATION_LOCK_TIMEOUT  Postgres lock_timeout for migration statements (default 5s)
+"""
+
+import os
+import sys
+from logging.config import fileConfig
+from alembic import context
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Database.db import DATABASE_URL, create_configured_engine
+from Models.base import Base
+import Models  # noqa: F401 - register all models
+
+MIGRATION_LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+
+config = context.config
+if config.config_file_name is not None:
+    # Keep the application's loggers when run from migrate_db.py
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Emit the SQL instead of running it (alembic upgrade head --sql)"""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=DATABASE_URL.startswith("sqlite"),
+        transaction_per_migration=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    engine = create_configured_engine(DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            if connection.dialect.name == "postgresql":
+                connection.exec_driver_sql(f"SET lock_timeout = '{MIGRATION_LOCK_TIMEOUT}'")
+                connection.commit()
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                # SQLite can't ALTER constraints; autogenerate emits batch operations for it
+                render_as_batch=connection.dialect.name == "sqlite",
+                transaction_per_migration=True
+            )
+            with context.begin_transaction():
+                context.run_migrations()
+    finally:
+        engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,137 @@
+"""
+Schema operations for revisions that must not block the API while they run.
+
+Postgres:
+    create_index / drop_index  CREATE/DROP INDEX CONCURRENTLY, outside the
+                               migration transaction (Postgres refuses it inside
+                               one). Writes continue during the build. An
+                               INVALID index left by a failed build is dropped
+                               and rebuilt.
+    add_foreign_key_column     adds the nullable column (metadata only), then
+                               the constraint NOT VALID and VALIDATE in separate
+                               transactions. Only the first takes a lock that
+                               blocks writes, and only briefly.
+SQLite can't alter constraints, so the column and its foreign key are added in
+batch mode, which copies the table. Indexes are built normally; SQLite holds
+the write lock for the build either way.
+
+backfill runs a statement in batches of MIGRATION_BATCH_SIZE rows, committing
+each and pausing MIGRATION_BATCH_PAUSE_SECONDS in between, so no lock is held
+long and replicas keep up.
+
+Every operation skips objects that already exist. Databases created with
+create_all before migrations existed are stamped at the baseline by
+migrate_db.py, and the later revisions then only add what they lack.
+
+Environment:
+    MIGRATION_BATCH_SIZE           rows per backfill transaction (default 1000)
+    MIGRATION_BATCH_PAUSE_SECONDS  pause between backfill batches (default 0.1)
+"""
+
+import os
+import time
+import sqlalchemy as sa
+from alembic import context, op
+
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "1000"))
+MIGRATION_BATCH_PAUSE_SECONDS = float(os.getenv("MIGRATION_BATCH_PAUSE_SECONDS", "0.1"))
+
+
+def _is_postgres() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+# Offline (--sql) there is no database to inspect; the script assumes none of the objects exist yet
+
+def has_table(table: str) -> bool:
+    return not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table(table)
+
+
+def has_column(table: str, column: str) -> bool:
+    return not context.is_offline_mode() and column in {
+        c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)
+    }
+
+
+def has_index(table: str, name: str) -> bool:
+    return not context.is_offline_mode() and name in {
+        i["name"] for i in sa.inspect(op.get_bind()).get_indexes(table)
+    }
+
+
+def has_foreign_key(table: str, column: str) -> bool:
+    return not context.is_offline_mode() and any(
+        fk["constrained_columns"] == [column] for fk in sa.inspect(op.get_bind()).get_foreign_keys(table)
+    )
+
+
+def _postgres_index_invalid(name: str) -> bool:
+    if context.is_offline_mode():
+        return False
+    return bool(op.get_bind().execute(sa.text(
+        "SELECT NOT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+    ), {"name": name}).scalar())
+
+
+def create_index(name: str, table: str, columns: list, unique: bool = False):
+    if not _is_postgres():
+        if not has_index(table, name):
+            op.create_index(name, table, columns, unique=unique)
+        return
+    with op.get_context().autocommit_block():
+        if _postgres_index_invalid(name):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True, if_not_exists=True)
+
+
+def drop_index(name: str, table: str):
+    if not _is_postgres():
+        if has_index(table, name):
+            op.drop_index(name, table_name=table)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def add_foreign_key_column(table: str, column: str, referent: str, constraint_name: str):
+    """Add a nullable integer column referencing referent.id"""
+    if not _is_postgres():
+        needs_column = not has_column(table, column)
+        needs_key = needs_column or not has_foreign_key(table, column)
+        if needs_key:
+            with op.batch_alter_table(table) as batch:
+                if needs_column:
+                    batch.add_column(sa.Column(column, sa.Integer(), nullable=True))
+                batch.create_foreign_key(constraint_name, referent, [column], ["id"])
+        return
+    if not has_column(table, column):
+        op.add_column(table, sa.Column(column, sa.Integer(), nullable=True))
+    if not has_foreign_key(table, column):
+        with op.get_context().autocommit_block():
+            op.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {constraint_name} "
+                f"FOREIGN KEY ({column}) REFERENCES {referent} (id) NOT VALID"
+            )
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {constraint_name}")
+
+
+def backfill(statement: str, **params) -> int:
+    """
+    Run statement until it changes no rows, one committed transaction per run.
+    It must touch at most :batch_size rows, picked among those still needing
+    the change, so each run makes progress and an interrupted backfill resumes.
+    """
+    params["batch_size"] = MIGRATION_BATCH_SIZE
+    if context.is_offline_mode():
+        # No row counts in a generated script; it runs one batch, to be repeated by hand
+        op.execute(sa.text(statement).bindparams(**params))
+        return 0
+    total = 0
+    with op.get_context().autocommit_block():
+        while True:
+            changed = op.get_bind().execute(sa.text(statement), params).rowcount
+            if changed <= 0:
+                break
+            total += changed
+            time.sleep(MIGRATION_BATCH_PAUSE_SECONDS)
+    return total
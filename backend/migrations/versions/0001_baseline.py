@@ -0,0 +1,240 @@
+"""Baseline: the schema as created by create_all before migrations were introduced
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('otps',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('otp', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_otps_email', 'otps', ['email'], unique=False)
+    op.create_index('ix_otps_id', 'otps', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('role', sa.String(), nullable=False),
+    sa.Column('password', sa.String(), nullable=False),
+    sa.Column('is_verified', sa.Boolean(), nullable=False),
+    sa.Column('profile_completed', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_role', 'users', ['role'], unique=False)
+    op.create_table('applications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('startup_id', sa.Integer(), nullable=True),
+    sa.Column('investor_id', sa.Integer(), nullable=True),
+    sa.Column('pitch_deck_filename', sa.String(), nullable=False),
+    sa.Column('pitch_deck_file_path', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('log', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['investor_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['startup_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_applications_id', 'applications', ['id'], unique=False)
+    op.create_table('interest_status',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('startup_id', sa.Integer(), nullable=True),
+    sa.Column('investor_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['investor_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['startup_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_interest_status_id', 'interest_status', ['id'], unique=False)
+    op.create_table('investor_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('phone_number', sa.String(), nullable=True),
+    sa.Column('country', sa.String(), nullable=False),
+    sa.Column('state', sa.String(), nullable=False),
+    sa.Column('district', sa.String(), nullable=False),
+    sa.Column('linkedin_profile', sa.String(), nullable=False),
+    sa.Column('investor_type', sa.String(), nullable=False),
+    sa.Column('firm_name', sa.String(), nullable=True),
+    sa.Column('investment_experience', sa.String(), nullable=False),
+    sa.Column('years_of_investment_experience', sa.String(), nullable=False),
+    sa.Column('professional_background', sa.Text(), nullable=False),
+    sa.Column('previous_experience', sa.Text(), nullable=True),
+    sa.Column('investment_stages', sa.Text(), nullable=False),
+    sa.Column('check_size_range', sa.String(), nullable=False),
+    sa.Column('geographic_focus', sa.Text(), nullable=False),
+    sa.Column('industry_focus', sa.Text(), nullable=False),
+    sa.Column('investment_philosophy', sa.String(), nullable=False),
+    sa.Column('decision_timeline', sa.String(), nullable=False),
+    sa.Column('number_of_portfolio_companies', sa.String(), nullable=True),
+    sa.Column('notable_investments', sa.Text(), nullable=True),
+    sa.Column('successful_exits', sa.String(), nullable=True),
+    sa.Column('post_investment_involvement', sa.String(), nullable=False),
+    sa.Column('areas_of_expertise', sa.Text(), nullable=False),
+    sa.Column('investment_thesis', sa.Text(), nullable=True),
+    sa.Column('additional_info', sa.Text(), nullable=True),
+    sa.Column('profile_visibility', sa.String(), nullable=False),
+    sa.Column('contact_permissions', sa.String(), nullable=False),
+    sa.Column('profile_photo_filename', sa.String(), nullable=True),
+    sa.Column('profile_photo_file_path', sa.String(), nullable=True),
+    sa.Column('profile_photo_file_size', sa.Integer(), nullable=True),
+    sa.Column('profile_photo_content_type', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_index('ix_investor_profiles_id', 'investor_profiles', ['id'], unique=False)
+    op.create_table('startup_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('company_name', sa.String(), nullable=False),
+    sa.Column('website_link', sa.String(), nullable=True),
+    sa.Column('industry', sa.String(), nullable=False),
+    sa.Column('company_description', sa.Text(), nullable=False),
+    sa.Column('founding_date', sa.Date(), nullable=False),
+    sa.Column('team_size', sa.Integer(), nullable=False),
+    sa.Column('district', sa.String(), nullable=False),
+    sa.Column('state', sa.String(), nullable=False),
+    sa.Column('social_media_1', sa.String(), nullable=True),
+    sa.Column('social_media_2', sa.String(), nullable=True),
+    sa.Column('business_model_description', sa.Text(), nullable=False),
+    sa.Column('total_paying_customers', sa.Integer(), nullable=False),
+    sa.Column('monthly_customer_growth_rate', sa.Float(), nullable=True),
+    sa.Column('customer_acquisition_cost', sa.Float(), nullable=True),
+    sa.Column('customer_lifetime_value', sa.Float(), nullable=True),
+    sa.Column('competitive_advantage', sa.Text(), nullable=False),
+    sa.Column('pitch_deck_filename', sa.String(), nullable=True),
+    sa.Column('pitch_deck_file_path', sa.String(), nullable=True),
+    sa.Column('pitch_deck_file_size', sa.Integer(), nullable=True),
+    sa.Column('pitch_deck_content_type', sa.String(), nullable=True),
+    sa.Column('product_demo_video_link', sa.String(), nullable=False),
+    sa.Column('pre_money_valuation', sa.Integer(), nullable=False),
+    sa.Column('amount_seeking', sa.Integer(), nullable=False),
+    sa.Column('investment_type', sa.String(), nullable=False),
+    sa.Column('max_equity_percentage', sa.Float(), nullable=False),
+    sa.Column('funding_stage', sa.String(), nullable=False),
+    sa.Column('total_funding_raised', sa.Integer(), nullable=False),
+    sa.Column('last_round_amount', sa.Integer(), nullable=False),
+    sa.Column('last_round_date', sa.Date(), nullable=False),
+    sa.Column('key_previous_investors', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_index('ix_startup_profiles_company_name', 'startup_profiles', ['company_name'], unique=False)
+    op.create_index('ix_startup_profiles_funding_stage', 'startup_profiles', ['funding_stage'], unique=False)
+    op.create_index('ix_startup_profiles_id', 'startup_profiles', ['id'], unique=False)
+    op.create_index('ix_startup_profiles_industry', 'startup_profiles', ['industry'], unique=False)
+    op.create_table('application_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=True),
+    sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('details', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['application_id'], ['applications.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_application_logs_id', 'application_logs', ['id'], unique=False)
+    op.create_table('founders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('startup_profile_id', sa.Integer(), nullable=True),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('educational_qualification', sa.String(), nullable=False),
+    sa.Column('previous_work_experience', sa.Text(), nullable=False),
+    sa.Column('linkedin_profile', sa.String(), nullable=False),
+    sa.Column('photo_url', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['startup_profile_id'], ['startup_profiles.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_founders_id', 'founders', ['id'], unique=False)
+    op.create_table('fund_usage',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('startup_profile_id', sa.Integer(), nullable=True),
+    sa.Column('product_development_percentage', sa.Float(), nullable=False),
+    sa.Column('marketing_percentage', sa.Float(), nullable=False),
+    sa.Column('team_expansion_percentage', sa.Float(), nullable=False),
+    sa.Column('operations_percentage', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['startup_profile_id'], ['startup_profiles.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('startup_profile_id')
+    )
+    op.create_index('ix_fund_usage_id', 'fund_usage', ['id'], unique=False)
+    op.create_table('startup_revenue_metrics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('startup_profile_id', sa.Integer(), nullable=True),
+    sa.Column('monthly_recurring_revenue', sa.Integer(), nullable=False),
+    sa.Column('annual_recurring_revenue', sa.Integer(), nullable=False),
+    sa.Column('revenue_growth_rate', sa.Float(), nullable=True),
+    sa.Column('monthly_burn_rate', sa.Integer(), nullable=True),
+    sa.Column('current_cash_runway', sa.Integer(), nullable=True),
+    sa.Column('projected_revenue_12_months', sa.Integer(), nullable=True),
+    sa.Column('profitability_timeline', sa.String(), nullable=False),
+    sa.Column('investment_timeline', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['startup_profile_id'], ['startup_profiles.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('startup_profile_id')
+    )
+    op.create_index('ix_startup_revenue_metrics_id', 'startup_revenue_metrics', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_startup_revenue_metrics_id', table_name='startup_revenue_metrics')
+    op.drop_table('startup_revenue_metrics')
+    op.drop_index('ix_fund_usage_id', table_name='fund_usage')
+    op.drop_table('fund_usage')
+    op.drop_index('ix_founders_id', table_name='founders')
+    op.drop_table('founders')
+    op.drop_index('ix_application_logs_id', table_name='application_logs')
+    op.drop_table('application_logs')
+    op.drop_index('ix_startup_profiles_industry', table_name='startup_profiles')
+    op.drop_index('ix_startup_profiles_id', table_name='startup_profiles')
+    op.drop_index('ix_startup_profiles_funding_stage', table_name='startup_profiles')
+    op.drop_index('ix_startup_profiles_company_name', table_name='startup_profiles')
+    op.drop_table('startup_profiles')
+    op.drop_index('ix_investor_profiles_id', table_name='investor_profiles')
+    op.drop_table('investor_profiles')
+    op.drop_index('ix_interest_status_id', table_name='interest_status')
+    op.drop_table('interest_status')
+    op.drop_index('ix_applications_id', table_name='applications')
+    op.drop_table('applications')
+    op.drop_index('ix_users_role', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+    op.drop_index('ix_otps_id', table_name='otps')
+    op.drop_index('ix_otps_email', table_name='otps')
+    op.drop_table('otps')
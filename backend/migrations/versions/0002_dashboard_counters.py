@@ -0,0 +1,64 @@
+"""Dashboard counters, seeded for existing users
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import backfill, has_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same totals as Crud/dashboard_crud.compute_counts, for users without a row yet
+SEED_COUNTERS = """
+INSERT INTO dashboard_counters (user_id, sent_decks, received_decks, interested, not_interested)
+SELECT u.id,
+    (SELECT COUNT(*) FROM applications a WHERE a.startup_id = u.id),
+    (SELECT COUNT(*) FROM applications a WHERE a.investor_id = u.id),
+    (SELECT COUNT(*) FROM interest_status s
+        WHERE (s.startup_id = u.id OR s.investor_id = u.id) AND s.status = 'interested'),
+    (SELECT COUNT(*) FROM interest_status s
+        WHERE (s.startup_id = u.id OR s.investor_id = u.id) AND s.status = 'not_interested')
+FROM users u
+WHERE NOT EXISTS (SELECT 1 FROM dashboard_counters d WHERE d.user_id = u.id)
+ORDER BY u.id
+LIMIT :batch_size
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not has_table('dashboard_counters'):
+        op.create_table('dashboard_counters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('sent_decks', sa.Integer(), nullable=False),
+        sa.Column('received_decks', sa.Integer(), nullable=False),
+        sa.Column('interested', sa.Integer(), nullable=False),
+        sa.Column('not_interested', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_dashboard_counters_id', 'dashboard_counters', ['id'], unique=False)
+        op.create_index('ix_dashboard_counters_user_id', 'dashboard_counters', ['user_id'], unique=True)
+    # Rows are otherwise created on each user's first dashboard request, which counts from the source tables
+    backfill(SEED_COUNTERS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_dashboard_counters_user_id', table_name='dashboard_counters')
+    op.drop_index('ix_dashboard_counters_id', table_name='dashboard_counters')
+    op.drop_table('dashboard_counters')
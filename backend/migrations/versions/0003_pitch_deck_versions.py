@@ -0,0 +1,60 @@
+"""Pitch deck versions, referenced by startup profiles and applications
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import add_foreign_key_column, has_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not has_table('pitch_deck_versions'):
+        op.create_table('pitch_deck_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('file_path', sa.String(), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('content_type', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_pitch_deck_versions_file_path', 'pitch_deck_versions', ['file_path'], unique=False)
+        op.create_index('ix_pitch_deck_versions_id', 'pitch_deck_versions', ['id'], unique=False)
+        op.create_index('ix_pitch_deck_versions_user_id', 'pitch_deck_versions', ['user_id'], unique=False)
+    add_foreign_key_column('startup_profiles', 'pitch_deck_version_id', 'pitch_deck_versions',
+                           'fk_startup_profiles_pitch_deck_version_id')
+    add_foreign_key_column('applications', 'pitch_deck_version_id', 'pitch_deck_versions',
+                           'fk_applications_pitch_deck_version_id')
+    # Version rows for existing decks need the storage backend to resolve old paths;
+    # migrate_db.py creates them after upgrading
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('applications') as batch:
+        batch.drop_constraint('fk_applications_pitch_deck_version_id', type_='foreignkey')
+        batch.drop_column('pitch_deck_version_id')
+    with op.batch_alter_table('startup_profiles') as batch:
+        batch.drop_constraint('fk_startup_profiles_pitch_deck_version_id', type_='foreignkey')
+        batch.drop_column('pitch_deck_version_id')
+    op.drop_index('ix_pitch_deck_versions_user_id', table_name='pitch_deck_versions')
+    op.drop_index('ix_pitch_deck_versions_id', table_name='pitch_deck_versions')
+    op.drop_index('ix_pitch_deck_versions_file_path', table_name='pitch_deck_versions')
+    op.drop_table('pitch_deck_versions')
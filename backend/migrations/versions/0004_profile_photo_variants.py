@@ -0,0 +1,34 @@
+"""Resized profile photo variants on investor profiles
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import has_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable without a default: a catalog-only change on Postgres and SQLite
+    if not has_column('investor_profiles', 'profile_photo_variants'):
+        op.add_column('investor_profiles', sa.Column('profile_photo_variants', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('investor_profiles') as batch:
+        batch.drop_column('profile_photo_variants')
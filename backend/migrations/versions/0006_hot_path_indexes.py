@@ -0,0 +1,33 @@
+"""Indexes for the duplicate-send check and the maintenance purges
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from migrations.helpers import create_index, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently on Postgres, so these large tables stay writable
+    create_index('ix_applications_startup_investor', 'applications', ['startup_id', 'investor_id'])
+    create_index('ix_otps_expires_at', 'otps', ['expires_at'])
+    create_index('ix_application_logs_timestamp', 'application_logs', ['timestamp'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index('ix_application_logs_timestamp', 'application_logs')
+    drop_index('ix_otps_expires_at', 'otps')
+    drop_index('ix_applications_startup_investor', 'applications')
@@ -0,0 +1,180 @@
+"""
+Short-lived storage for signup OTPs.
+
+An OTP lives for OTP_TTL_SECONDS and is replaced whenever a new one is sent
+for the same email, so it doesn't need the durability of the main database.
+The default store keeps OTPs in process memory and sweeps expired entries as
+it goes; the database only sees the user lookup.
+
+Backends:
+    memory  in-process dict (default). Only correct when send-otp and verify
+            reach the same process, i.e. a single worker.
+    redis   any Redis-compatible server (Redis, Valkey, KeyDB, ...) shared by
+            all workers; expiry is handled by the server. Requires redis-py.
+    sql     the otps table, for multi-worker deployments without Redis.
+
+Environment:
+    OTP_STORE           memory, redis or sql (default memory)
+    OTP_TTL_SECONDS     lifetime of an OTP (default 120)
+    REDIS_URL           connection URL for the redis backend (default redis://localhost:6379/0)
+"""
+
+import hmac
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from Database.db import SessionLocal
+from Models.Auth_models import OTP
+
+logger = logging.getLogger(__name__)
+
+OTP_STORE = os.getenv("OTP_STORE", "memory").lower()
+OTP_TTL_SECONDS = int(os.getenv("OTP_TTL_SECONDS", "120"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Minimum time between opportunistic sweeps of the memory store
+SWEEP_INTERVAL_SECONDS = 30
+
+
+def _matches(expected: Optional[str], otp: str) -> bool:
+    return expected is not None and hmac.compare_digest(expected.encode(), otp.encode())
+
+
+class MemoryOTPStore:
+    name = "memory"
+
+    def __init__(self):
+        self._entries = {}  # email -> (otp, expires_at on the monotonic clock)
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def put(self, email: str, otp: str, ttl: int = OTP_TTL_SECONDS):
+        """Store an OTP, replacing any earlier one for the email"""
+        now = time.monotonic()
+        with self._lock:
+            self._entries[email] = (otp, now + ttl)
+            if now - self._last_sweep > SWEEP_INTERVAL_SECONDS:
+                self._sweep(now)
+
+    def verify(self, email: str, otp: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(email)
+        if entry is None or entry[1] <= time.monotonic():
+            return False
+        return _matches(entry[0], otp)
+
+    def discard(self, email: str):
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def purge_expired(self, limit: int = None) -> int:
+        with self._lock:
+            return self._sweep(time.monotonic(), limit)
+
+    def _sweep(self, now: float, limit: int = None) -> int:
+        expired = [email for email, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for email in expired[:limit]:
+            del self._entries[email]
+        self._last_sweep = now
+        return len(expired[:limit])
+
+
+class RedisOTPStore:
+    name = "redis"
+
+    def __init__(self, url: str):
+        # Imported here: redis-py is only needed for OTP_STORE=redis and is slow to import
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("OTP_STORE=redis requires the redis package (pip install redis)")
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return f"otp:{email}"
+
+    def put(self, email: str, otp: str, ttl: int = OTP_TTL_SECONDS):
+        self.client.set(self._key(email), otp, ex=ttl)
+
+    def verify(self, email: str, otp: str) -> bool:
+        return _matches(self.client.get(self._key(email)), otp)
+
+    def discard(self, email: str):
+        self.client.delete(self._key(email))
+
+    def purge_expired(self, limit: int = None) -> int:
+        # Keys expire on the server
+        return 0
+
+
+class SQLOTPStore:
+    name = "sql"
+
+    def put(self, email: str, otp: str, ttl: int = OTP_TTL_SECONDS):
+        db = SessionLocal()
+        try:
+            # Replace the previous OTP in a single transaction
+            db.query(OTP).filter(OTP.email == email).delete(synchronize_session=False)
+            db.add(OTP(email=email, otp=otp, expires_at=datetime.utcnow() + timedelta(seconds=ttl)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def verify(self, email: str, otp: str) -> bool:
+        db = SessionLocal()
+        try:
+            stored = db.query(OTP.otp).filter(
+                OTP.email == email,
+                OTP.expires_at > datetime.utcnow()
+            ).order_by(OTP.id.desc()).first()
+            return _matches(stored[0] if stored else None, otp)
+        finally:
+            db.close()
+
+    def discard(self, email: str):
+        db = SessionLocal()
+        try:
+            db.query(OTP).filter(OTP.email == email).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def purge_expired(self, limit: int = None) -> int:
+        """Delete expired rows, at most limit of them"""
+        db = SessionLocal()
+        try:
+            expired_ids = db.query(OTP.id).filter(OTP.expires_at <= datetime.utcnow()).limit(limit)
+            deleted = db.query(OTP).filter(OTP.id.in_(expired_ids.scalar_subquery())).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_otp_store():
+    """The configured OTP store (created on first use)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if OTP_STORE == "memory":
+                    _store = MemoryOTPStore()
+                elif OTP_STORE == "redis":
+                    _store = RedisOTPStore(REDIS_URL)
+                elif OTP_STORE == "sql":
+                    _store = SQLOTPStore()
+                else:
+                    raise ValueError(f"Unknown OTP_STORE: {OTP_STORE}")
+                logger.info("OTP store initialised", extra={"backend": _store.name})
+    return _store
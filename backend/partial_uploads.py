@@ -0,0 +1,152 @@
+"""
+On-disk state for resumable uploads (Routers/resumable_upload.py).
+
+Each upload is a pair of files in RESUMABLE_UPLOAD_DIR: {id}.json with the
+owner, filename, content type and declared size, and {id}.part with the bytes
+received so far. The size of the .part file is the upload offset, so a chunk
+cut off mid-transfer still counts for the bytes that reached the disk and the
+client resumes from there. Writers hold an exclusive flock on the .part file,
+so two requests can't append to the same upload at once, even across worker
+processes.
+
+Partial files always live on local disk, whatever the storage backend; they
+are moved into storage.py when the upload is finalized. An upload with no
+writes for RESUMABLE_UPLOAD_EXPIRE_HOURS is considered abandoned.
+
+Environment:
+    RESUMABLE_UPLOAD_DIR           directory for partial uploads (default <STORAGE_LOCAL_ROOT>/partial_uploads)
+    RESUMABLE_UPLOAD_MAX_MB        largest upload accepted (default 100)
+    RESUMABLE_UPLOAD_EXPIRE_HOURS  idle time before an upload is abandoned (default 24)
+"""
+
+import fcntl
+import json
+import os
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+from storage import STORAGE_LOCAL_ROOT
+
+RESUMABLE_UPLOAD_DIR = os.getenv("RESUMABLE_UPLOAD_DIR", os.path.join(STORAGE_LOCAL_ROOT, "partial_uploads"))
+RESUMABLE_UPLOAD_MAX_SIZE = int(float(os.getenv("RESUMABLE_UPLOAD_MAX_MB", "100")) * 1024 * 1024)
+RESUMABLE_UPLOAD_EXPIRE_SECONDS = float(os.getenv("RESUMABLE_UPLOAD_EXPIRE_HOURS", "24")) * 3600
+
+UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class UploadBusy(Exception):
+    """Another request is writing to the upload"""
+
+
+class OffsetMismatch(Exception):
+    def __init__(self, offset: int):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+def _paths(upload_id: str) -> tuple:
+    return (
+        os.path.join(RESUMABLE_UPLOAD_DIR, f"{upload_id}.json"),
+        os.path.join(RESUMABLE_UPLOAD_DIR, f"{upload_id}.part"),
+    )
+
+
+def create_upload(user_id: int, filename: str, content_type: str, size: int) -> dict:
+    """Register a new upload with an empty .part file"""
+    os.makedirs(RESUMABLE_UPLOAD_DIR, exist_ok=True)
+    upload_id = uuid.uuid4().hex
+    meta = {
+        "id": upload_id,
+        "user_id": user_id,
+        "filename": filename,
+        "content_type": content_type,
+        "size": size,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    meta_path, part_path = _paths(upload_id)
+    open(part_path, "xb").close()
+    tmp_path = f"{meta_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+    return meta
+
+
+def load_upload(upload_id: str) -> Optional[dict]:
+    """Upload metadata plus its current offset, or None if unknown or expired"""
+    if not UPLOAD_ID.match(upload_id):
+        return None
+    meta_path, part_path = _paths(upload_id)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        stat = os.stat(part_path)
+    except (FileNotFoundError, ValueError):
+        return None
+    if time.time() - stat.st_mtime > RESUMABLE_UPLOAD_EXPIRE_SECONDS:
+        return None
+    meta["offset"] = stat.st_size
+    meta["expires_at"] = datetime.fromtimestamp(stat.st_mtime + RESUMABLE_UPLOAD_EXPIRE_SECONDS, tz=timezone.utc)
+    return meta
+
+
+@contextmanager
+def locked_part(upload_id: str, mode: str = "ab"):
+    """Open the .part file under an exclusive lock; raises UploadBusy if already held"""
+    _, part_path = _paths(upload_id)
+    with open(part_path, mode) as f:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadBusy(upload_id)
+        try:
+            yield f
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def open_for_append(upload_id: str, offset: int):
+    """Locked append handle, provided the client's offset matches what is on disk"""
+    with locked_part(upload_id) as f:
+        f.seek(0, os.SEEK_END)
+        current = f.tell()
+        if offset != current:
+            raise OffsetMismatch(current)
+        yield f
+
+
+def discard_upload(upload_id: str):
+    """Remove both files of an upload; missing files are ignored"""
+    for path in _paths(upload_id):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def iter_abandoned_uploads(now: float = None) -> Iterator[tuple]:
+    """(upload_id, bytes on disk) for uploads idle past the expiry, including orphaned halves"""
+    if not os.path.isdir(RESUMABLE_UPLOAD_DIR):
+        return
+    now = now or time.time()
+    seen = set()
+    for name in os.listdir(RESUMABLE_UPLOAD_DIR):
+        upload_id = name.split(".", 1)[0]
+        if upload_id in seen or not UPLOAD_ID.match(upload_id):
+            continue
+        seen.add(upload_id)
+        size = 0
+        newest = 0.0
+        for path in _paths(upload_id):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            size += stat.st_size
+            newest = max(newest, stat.st_mtime)
+        if now - newest > RESUMABLE_UPLOAD_EXPIRE_SECONDS:
+            yield upload_id, size
@@ -0,0 +1,131 @@
+"""
+In-process cache of serialized list payloads.
+
+Entries hold the JSON bytes plus each compressed encoding, produced once on
+first request and then served as-is, so hot listing endpoints skip both the
+query and re-compression. Every namespace carries a version that profile
+writes bump; a payload built from a read that started before the bump is
+never stored, and older entries are dropped. The TTL bounds staleness across
+worker processes, which do not see each other's invalidations.
+
+With a read replica, listings built within READ_AFTER_WRITE_SECONDS of an
+invalidation are served but not stored, since the replica may not have the
+write yet.
+
+Keys are normalized fieldsets (fieldsets.fieldset_key), but clients can still
+ask for many different ones. Expired entries are dropped when they are next
+looked up or when a new entry is stored, and each namespace keeps at most
+PROFILE_LIST_CACHE_MAX_ENTRIES, evicting the oldest first.
+
+Environment:
+    PROFILE_LIST_CACHE_TTL          seconds a cached listing stays valid (default 30; 0 disables)
+    PROFILE_LIST_CACHE_MAX_ENTRIES  cached fieldsets per listing (default 32)
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from compression import COMPRESSION_MIN_SIZE, choose_encoding, compress
+from Database.db import DATABASE_READ_URL, READ_AFTER_WRITE_SECONDS
+
+PROFILE_LIST_CACHE_TTL = float(os.getenv("PROFILE_LIST_CACHE_TTL", "30"))
+PROFILE_LIST_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_LIST_CACHE_MAX_ENTRIES", "32"))
+
+STARTUP_PROFILES = "startup_profiles"
+INVESTOR_PROFILES = "investor_profiles"
+
+
+class CachedPayload:
+    """Serialized response body with lazily built, memoized compressed variants"""
+
+    def __init__(self, body: bytes, expires_at: float):
+        self.body = body
+        self.expires_at = expires_at
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: str) -> bytes:
+        with self._lock:
+            if encoding not in self._encoded:
+                self._encoded[encoding] = compress(self.body, encoding)
+            return self._encoded[encoding]
+
+
+class PayloadCache:
+    def __init__(self, ttl: float, settle_seconds: float = 0, max_entries: int = PROFILE_LIST_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.settle_seconds = settle_seconds
+        self.max_entries = max_entries
+        self._versions = {}
+        self._invalidated_at = {}
+        self._entries = {}  # (namespace, version, key) -> CachedPayload, oldest first
+        self._lock = threading.Lock()
+
+    def version(self, namespace: str) -> int:
+        """Read before querying and pass to set() so stale builds are discarded"""
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def get(self, namespace: str, key: str) -> Optional[CachedPayload]:
+        with self._lock:
+            cache_key = (namespace, self._versions.get(namespace, 0), key)
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return None
+            if entry.expires_at < time.monotonic():
+                del self._entries[cache_key]
+                return None
+            return entry
+
+    def set(self, namespace: str, key: str, content, version: int) -> CachedPayload:
+        body = json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+        payload = CachedPayload(body, time.monotonic() + self.ttl)
+        with self._lock:
+            settled = time.monotonic() - self._invalidated_at.get(namespace, float("-inf")) >= self.settle_seconds
+            if self.ttl > 0 and settled and version == self._versions.get(namespace, 0):
+                self._evict(namespace, time.monotonic())
+                self._entries.pop((namespace, version, key), None)
+                self._entries[(namespace, version, key)] = payload
+        return payload
+
+    def _evict(self, namespace: str, now: float):
+        """Drop the namespace's expired entries, then the oldest ones beyond max_entries - 1"""
+        keys = [k for k in self._entries if k[0] == namespace]
+        live = []
+        for cache_key in keys:
+            if self._entries[cache_key].expires_at < now:
+                del self._entries[cache_key]
+            else:
+                live.append(cache_key)
+        for cache_key in live[:max(0, len(live) - self.max_entries + 1)]:
+            del self._entries[cache_key]
+
+    def invalidate(self, namespace: str):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            self._invalidated_at[namespace] = time.monotonic()
+            for cache_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[cache_key]
+
+
+profile_list_cache = PayloadCache(
+    PROFILE_LIST_CACHE_TTL,
+    settle_seconds=READ_AFTER_WRITE_SECONDS if DATABASE_READ_URL else 0
+)
+
+
+def payload_response(request: Request, payload: CachedPayload) -> Response:
+    """JSON response using the client's preferred pre-compressed variant when worthwhile"""
+    headers = {"Vary": "Accept-Encoding"}
+    body = payload.body
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    if encoding and len(body) >= COMPRESSION_MIN_SIZE:
+        body = payload.encoded(encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,258 @@
+"""
+Sampling profiler for slow requests.
+
+While profiling is enabled, a single background thread samples the Python
+stacks of the threads serving in-flight requests (sys._current_frames, in the
+style of py-spy). It watches the event loop thread plus every threadpool
+thread that ran SQL for the request. When a request exceeds the latency
+threshold, the folded stack samples are written to PROFILE_DIR as JSON,
+together with the route and the SQL statements it issued. Faster requests
+discard their samples.
+
+The event loop thread is shared by every request in the worker, and a
+threadpool thread moves on to other requests once it is done with this
+one. Samples are therefore only attributed to the request ("stacks") while
+it is the only one in flight. Samples taken while other requests were also
+in flight are kept separately as "loop_wide_stacks": they show what the
+worker was busy with, which may be another request's work.
+
+Environment:
+    SLOW_REQUEST_PROFILE_MS      latency threshold in ms; unset or 0 disables profiling
+    PROFILE_SAMPLE_INTERVAL_MS   time between stack samples (default 10)
+    PROFILE_DIR                  where profiles are stored (default <project root>/profiles)
+    PROFILE_MAX_FILES            number of profiles kept before the oldest are removed (default 100)
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from starlette.concurrency import run_in_threadpool
+from instrumentation import current_request_stats
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_PROFILE_MS", "0"))
+SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "10"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "100"))
+MAX_STACKS = 500  # Distinct folded stacks kept per profile
+
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(backend_dir)
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(project_root, "profiles"))
+
+
+def profiling_enabled() -> bool:
+    return SLOW_REQUEST_THRESHOLD_MS > 0
+
+
+def _frame_label(frame) -> str:
+    filename = frame.f_code.co_filename
+    if filename.startswith(backend_dir):
+        filename = os.path.relpath(filename, backend_dir)
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{frame.f_code.co_name}:{frame.f_lineno}"
+
+
+def _fold_stack(frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class _ProfileSession:
+    def __init__(self, stats: dict):
+        self.stats = stats
+        self.samples = Counter()  # Taken while this was the only request in flight
+        self.loop_wide_samples = Counter()  # Taken alongside other requests; may include their frames
+        self.sample_count = 0
+        self.loop_wide_sample_count = 0
+
+
+class StackSampler:
+    """One sampling thread shared by all in-flight requests; idle while none are active"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def start(self, stats: dict) -> _ProfileSession:
+        session = _ProfileSession(stats)
+        with self._lock:
+            self._ensure_started()
+            self._sessions[id(session)] = session
+        self._wakeup.set()
+        return session
+
+    def stop(self, session: _ProfileSession):
+        with self._lock:
+            self._sessions.pop(id(session), None)
+
+    def _sample(self, sessions: list):
+        frames = sys._current_frames()
+        exclusive = len(sessions) == 1
+        for session in sessions:
+            if exclusive:
+                session.sample_count += 1
+                samples = session.samples
+            else:
+                session.loop_wide_sample_count += 1
+                samples = session.loop_wide_samples
+            for thread_id in list(session.stats["threads"]):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    samples[_fold_stack(frame)] += 1
+
+    def _run(self):
+        failing = False
+        while True:
+            with self._lock:
+                sessions = list(self._sessions.values())
+                if not sessions:
+                    self._wakeup.clear()
+            if not sessions:
+                self._wakeup.wait()
+                continue
+
+            # An error must not end the thread, which would silently stop all profiling
+            try:
+                self._sample(sessions)
+                failing = False
+            except Exception:
+                if not failing:
+                    logger.exception("Stack sampling failed")
+                failing = True
+            time.sleep(self.interval)
+
+
+_sampler = StackSampler(SAMPLE_INTERVAL_MS / 1000)
+
+
+def _prune_profiles():
+    profiles = sorted(
+        (entry for entry in os.scandir(PROFILE_DIR) if entry.name.endswith(".json")),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in profiles[:max(0, len(profiles) - PROFILE_MAX_FILES)]:
+        os.remove(entry.path)
+
+
+def _write_profile(profile: dict):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{profile['id']}.json")
+    with open(path, "w") as f:
+        json.dump(profile, f)
+    _prune_profiles()
+
+
+def profile_path(profile_id: str):
+    """Path of a stored profile, or None if the id is malformed or unknown"""
+    if not profile_id.replace("-", "").isalnum():
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.json")
+    return path if os.path.exists(path) else None
+
+
+def list_profiles() -> list:
+    """Summaries of stored profiles, newest first"""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+
+    summaries = []
+    for entry in os.scandir(PROFILE_DIR):
+        if not entry.name.endswith(".json"):
+            continue
+        try:
+            with open(entry.path) as f:
+                profile = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        summaries.append({key: profile.get(key) for key in (
+            "id", "captured_at", "method", "route", "path", "status", "duration_ms", "sql_count", "sql_time_ms"
+        )})
+    summaries.sort(key=lambda summary: summary["captured_at"] or "", reverse=True)
+    return summaries
+
+
+class SlowRequestProfilerMiddleware:
+    """
+    Pure ASGI middleware; must sit inside InstrumentationMiddleware so the
+    per-request SQL stats already exist when it runs.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        stats = current_request_stats() if scope["type"] == "http" else None
+        if not profiling_enabled() or stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        # The SQL cursor hook fills these in from whichever threads serve the request
+        stats["threads"] = {threading.get_ident()}
+        stats["statements"] = []
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        session = _sampler.start(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _sampler.stop(session)
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= SLOW_REQUEST_THRESHOLD_MS:
+                route = scope.get("route")
+                profile = {
+                    "id": f"{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}",
+                    "captured_at": datetime.utcnow().isoformat(),
+                    "method": scope["method"],
+                    "route": getattr(route, "path", None) or "unmatched",
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(duration_ms, 1),
+                    "sql_count": stats["sql_count"],
+                    "sql_time_ms": round(stats["sql_time"] * 1000, 1),
+                    "statements": stats["statements"],
+                    "sample_interval_ms": SAMPLE_INTERVAL_MS,
+                    "sample_count": session.sample_count,
+                    "stacks": [
+                        {"stack": stack, "count": count}
+                        for stack, count in session.samples.most_common(MAX_STACKS)
+                    ],
+                    "loop_wide_sample_count": session.loop_wide_sample_count,
+                    "loop_wide_stacks": [
+                        {"stack": stack, "count": count}
+                        for stack, count in session.loop_wide_samples.most_common(MAX_STACKS)
+                    ]
+                }
+                try:
+                    await run_in_threadpool(_write_profile, profile)
+                    logger.warning(
+                        "Slow request profiled",
+                        extra={"profile_id": profile["id"], "route": profile["route"], "duration_ms": profile["duration_ms"]}
+                    )
+                except OSError:
+                    logger.exception("Failed to store slow request profile")
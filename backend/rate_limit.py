@@ -0,0 +1,197 @@
+"""
+Token-bucket rate limiting for expensive endpoints.
+
+Every rule is a bucket of `capacity` tokens refilled at capacity/period tokens
+per second; a request takes one token and is refused with 429 and Retry-After
+when the bucket is empty. /auth/send-otp (an SMTP session) and /auth/login
+(bcrypt) are limited per client IP and per email, so neither one address nor
+one account can tie up the workers. /auth/verify-otp-and-signup is limited the
+same way, so a 6-digit OTP can't be guessed within its lifetime.
+
+Backends:
+    memory  per-process buckets (default). With several workers each one
+            allows the full rate.
+    redis   buckets shared by all workers, updated atomically by a Lua script
+            using the server clock. Requires redis-py. If Redis is unreachable
+            requests are let through and a warning is logged.
+
+The client IP is request.client.host. Behind a reverse proxy run uvicorn or
+gunicorn with --forwarded-allow-ips set to the proxy so it reflects
+X-Forwarded-For.
+
+Environment:
+    RATE_LIMIT_ENABLED               turn limiting on (default true)
+    RATE_LIMIT_BACKEND               memory or redis (default memory)
+    REDIS_URL                        connection URL for the redis backend (default redis://localhost:6379/0)
+    RATE_LIMIT_OTP_PER_IP            send-otp requests per IP, as count/seconds (default 10/600)
+    RATE_LIMIT_OTP_PER_EMAIL         send-otp requests per email (default 3/600)
+    RATE_LIMIT_LOGIN_PER_IP          login attempts per IP (default 30/60)
+    RATE_LIMIT_LOGIN_PER_EMAIL       login attempts per email (default 10/300)
+    RATE_LIMIT_OTP_VERIFY_PER_IP     OTP verification attempts per IP (default 30/600)
+    RATE_LIMIT_OTP_VERIFY_PER_EMAIL  OTP verification attempts per email (default 5/600)
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from typing import NamedTuple
+from fastapi import HTTPException, Request, status
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Minimum time between sweeps of full buckets from the memory backend
+SWEEP_INTERVAL_SECONDS = 60
+
+
+class Rule(NamedTuple):
+    name: str
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+def _rule(name: str, env_var: str, default: str) -> Rule:
+    count, seconds = os.getenv(env_var, default).split("/")
+    return Rule(name, int(count), float(seconds))
+
+
+OTP_PER_IP = _rule("otp_ip", "RATE_LIMIT_OTP_PER_IP", "10/600")
+OTP_PER_EMAIL = _rule("otp_email", "RATE_LIMIT_OTP_PER_EMAIL", "3/600")
+LOGIN_PER_IP = _rule("login_ip", "RATE_LIMIT_LOGIN_PER_IP", "30/60")
+LOGIN_PER_EMAIL = _rule("login_email", "RATE_LIMIT_LOGIN_PER_EMAIL", "10/300")
+OTP_VERIFY_PER_IP = _rule("otp_verify_ip", "RATE_LIMIT_OTP_VERIFY_PER_IP", "30/600")
+OTP_VERIFY_PER_EMAIL = _rule("otp_verify_email", "RATE_LIMIT_OTP_VERIFY_PER_EMAIL", "5/600")
+
+
+class MemoryRateLimiter:
+    name = "memory"
+
+    def __init__(self):
+        self._buckets = {}  # (rule, key) -> (tokens, updated at on the monotonic clock)
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def hit(self, rule: Rule, key: str) -> float:
+        """Take a token; returns 0 if allowed, otherwise seconds until one is available"""
+        now = time.monotonic()
+        bucket_key = (rule, key)
+        with self._lock:
+            tokens, updated = self._buckets.get(bucket_key, (rule.capacity, now))
+            tokens = min(rule.capacity, tokens + (now - updated) * rule.rate)
+            if tokens >= 1:
+                self._buckets[bucket_key] = (tokens - 1, now)
+                retry_after = 0.0
+            else:
+                self._buckets[bucket_key] = (tokens, now)
+                retry_after = (1 - tokens) / rule.rate
+            if now - self._last_sweep > SWEEP_INTERVAL_SECONDS:
+                self._sweep(now)
+        return retry_after
+
+    def _sweep(self, now: float):
+        # A bucket untouched for a full period is full again and equivalent to no entry
+        stale = [
+            bucket_key for bucket_key, (_, updated) in self._buckets.items()
+            if now - updated >= bucket_key[0].period
+        ]
+        for bucket_key in stale:
+            del self._buckets[bucket_key]
+        self._last_sweep = now
+
+
+# KEYS[1] bucket; ARGV capacity, refill rate per second. Returns the retry delay as a string.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimiter:
+    name = "redis"
+
+    def __init__(self, url: str):
+        # Imported here: redis-py is only needed for this backend and is slow to import
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the redis package (pip install redis)")
+        self.client = redis.Redis.from_url(url, decode_responses=True, socket_timeout=0.5)
+        self._script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._errors = redis.RedisError
+
+    def hit(self, rule: Rule, key: str) -> float:
+        try:
+            return float(self._script(keys=[f"ratelimit:{rule.name}:{key}"], args=[rule.capacity, rule.rate]))
+        except self._errors as e:
+            # Fail open: an unreachable limiter shouldn't take login down with it
+            logger.warning("Rate limiter unavailable", extra={"error": str(e)})
+            return 0.0
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """The configured rate limiter backend (created on first use)"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                if RATE_LIMIT_BACKEND == "memory":
+                    _limiter = MemoryRateLimiter()
+                elif RATE_LIMIT_BACKEND == "redis":
+                    _limiter = RedisRateLimiter(REDIS_URL)
+                else:
+                    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {RATE_LIMIT_BACKEND}")
+                logger.info("Rate limiter initialised", extra={"backend": _limiter.name})
+    return _limiter
+
+
+def get_client_ip(request: Request) -> str:
+    """Dependency: the client address used as the per-IP rate limit key"""
+    return request.client.host if request.client else "unknown"
+
+
+def enforce_rate_limit(*checks):
+    """
+    Take a token from each (rule, key) bucket in order and raise 429 with
+    Retry-After at the first empty one.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+    limiter = get_rate_limiter()
+    for rule, key in checks:
+        retry_after = limiter.hit(rule, key)
+        if retry_after > 0:
+            seconds = max(1, math.ceil(retry_after))
+            logger.info("Rate limit exceeded", extra={"rule": rule.name, "retry_after": seconds})
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Too many requests. Please try again in {seconds} seconds.",
+                headers={"Retry-After": str(seconds)}
+            )
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Reconcile the denormalized dashboard counters against the applications and
+interest_status tables. Reports drift by default; pass --fix to correct it.
+"""
+
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Database.db import SessionLocal
+import Models  # noqa: F401 - register all models
+from Crud.dashboard_crud import find_counter_drift
+
+def reconcile_counters(fix: bool = False) -> int:
+    db = SessionLocal()
+    try:
+        drifted = find_counter_drift(db, fix=fix)
+        for entry in drifted:
+            print(f"User {entry['user_id']}: stored={entry['stored']} actual={entry['actual']}")
+        
+        if not drifted:
+            print("No counter drift detected")
+        elif fix:
+            print(f"Fixed {len(drifted)} drifted counter rows")
+        else:
+            print(f"Found {len(drifted)} drifted counter rows (run with --fix to correct)")
+        return len(drifted)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fix", action="store_true", help="Correct drifted rows instead of only reporting them")
+    args = parser.parse_args()
+    drift_count = reconcile_counters(fix=args.fix)
+    # Non-zero exit lets a cron job or CI alert on drift
+    sys.exit(1 if drift_count and not args.fix else 0)
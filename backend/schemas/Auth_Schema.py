@@ -34,12 +34,25 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+class CurrentUser(BaseModel):
+    """The authenticated user as described by the access token claims"""
+    id: int
+    email: str
+    role: str
+    is_verified: bool
+    session_id: Optional[str] = None
+
 class LoginResponse(BaseModel):
     access_token: str
     token_type: str
     user_id: int
     role: str
     email: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 class OTPResponse(BaseModel):
     message: str
@@ -22,6 +22,7 @@ class ApplicationUpdate(BaseModel):
 
 class ApplicationSchema(ApplicationBase):
     id: int
+    pitch_deck_version_id: Optional[int] = None
     log: Optional[str] = None
     sent_at: datetime
     updated_at: datetime
@@ -69,4 +70,19 @@ class ApplicationLog(ApplicationLogBase):
     timestamp: datetime
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class AvailableInvestor(BaseModel):
+    user_id: int
+    full_name: str
+    investor_type: str
+    district: str
+    state: str
+    country: str
+    profile_photo_file_path: Optional[str] = None
+
+class AvailableInvestorsPage(BaseModel):
+    items: List[AvailableInvestor]
+    page: int
+    page_size: int
+    has_more: bool
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class DashboardSummary(BaseModel):
+    user_id: int
+    role: str
+    sent_decks: int
+    received_decks: int
+    interested: int
+    not_interested: int
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
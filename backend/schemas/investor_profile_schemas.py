@@ -177,6 +177,7 @@ class InvestorProfile(InvestorProfileBase):
     profile_photo_file_path: Optional[str] = None
     profile_photo_file_size: Optional[int] = None
     profile_photo_content_type: Optional[str] = None
+    profile_photo_variants: Optional[dict] = None
     created_at: datetime
     updated_at: datetime
     
@@ -21,6 +21,10 @@ class FounderUpdate(BaseModel):
     linkedin_profile: Optional[str] = None
     photo_url: Optional[str] = None
 
+class FounderUpsert(FounderUpdate):
+    # Existing founders are matched by id; entries without one are created
+    id: Optional[int] = None
+
 class Founder(FounderBase):
     id: int
     startup_profile_id: int
@@ -149,6 +153,8 @@ class StartupProfileUpdate(BaseModel):
     last_round_amount: Optional[int] = None
     last_round_date: Optional[date] = None
     key_previous_investors: Optional[str] = None
+    # Full desired founder list; founders missing from it are removed
+    founders: Optional[List[FounderUpsert]] = None
 
 class StartupProfile(StartupProfileBase):
     id: int
@@ -157,6 +163,7 @@ class StartupProfile(StartupProfileBase):
     pitch_deck_file_path: Optional[str] = None
     pitch_deck_file_size: Optional[int] = None
     pitch_deck_content_type: Optional[str] = None
+    pitch_deck_version_id: Optional[int] = None
     created_at: datetime
     updated_at: datetime
     founders: List[Founder] = []
@@ -166,9 +173,34 @@ class StartupProfile(StartupProfileBase):
     class Config:
         from_attributes = True
 
+class FounderChanges(BaseModel):
+    created: List[int] = []
+    updated: List[int] = []
+    deleted: List[int] = []
+    unchanged: List[int] = []
+
+class StartupProfileUpdateResponse(StartupProfile):
+    founder_changes: Optional[FounderChanges] = None
+
 class PitchDeckUploadResponse(BaseModel):
     filename: str
     file_path: str
     file_size: int
     content_type: str
-    upload_successful: bool
\ No newline at end of file
+    upload_successful: bool
+# Resumable pitch deck uploads
+class ResumableUploadCreate(BaseModel):
+    filename: str
+    content_type: str
+    size: int = Field(..., gt=0)
+
+class ResumableUploadStatus(BaseModel):
+    id: str
+    filename: str
+    content_type: str
+    size: int
+    offset: int
+    expires_at: datetime
+
+class ResumableUploadFinalize(BaseModel):
+    sha256: Optional[str] = None  # hex digest of the whole file, checked before the deck is swapped
@@ -13,7 +13,7 @@ if [ ! -z "$DATABASE_URL" ]; then
     python3 -c "
 import time
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
 
 max_attempts = 30
@@ -23,7 +23,7 @@ while attempt < max_attempts:
     try:
         engine = create_engine(os.getenv('DATABASE_URL'))
         with engine.connect() as conn:
-            conn.execute('SELECT 1')
+            conn.execute(text('SELECT 1'))
         print('Database is ready!')
         break
     except OperationalError:
@@ -31,17 +31,20 @@ while attempt < max_attempts:
         print(f'Database not ready, attempt {attempt}/{max_attempts}')
         time.sleep(2)
 else:
-    print('No DATABASE_URL set, skipping database check')
+    print('Database still not ready, continuing anyway')
 "
+else
+    echo "No DATABASE_URL set, skipping database check"
+fi
 
 # Run database migration
 echo "Running database migration..."
 python3 migrate_db.py
 
-# Start the application
+# Start the application (workers, keep-alive and shutdown draining are set in gunicorn_conf.py)
 echo "Starting FastAPI application..."
 if [ "$ENVIRONMENT" = "production" ]; then
-    exec gunicorn main:app -w 4 -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:8000
+    exec gunicorn -c gunicorn_conf.py main:app
 else
     exec uvicorn main:app --host 0.0.0.0 --port 8000 --reload
 fi 
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+Static file serving for /uploads.
+
+Content-hashed files (such as the profile photo variants from image_pipeline.py)
+never change under the same name, so they are served with a one-year immutable
+Cache-Control. Everything else keeps the default revalidation behaviour.
+
+Like LocalStorage, files missing from the storage root are looked up in the
+fallback directories, so uploads older deployments wrote under the project root
+keep being served.
+"""
+
+import os
+import re
+from fastapi.staticfiles import StaticFiles
+from storage import IMMUTABLE_CACHE_CONTROL
+
+# e.g. 42-card-3f2a9c0d1b7e6a54.webp
+HASHED_NAME = re.compile(r"-[0-9a-f]{16}\.[a-z0-9]+$")
+
+
+class CachedStaticFiles(StaticFiles):
+    def __init__(self, *, fallback_directories: tuple = (), **kwargs):
+        super().__init__(**kwargs)
+        # Searched in order after `directory`; missing ones are skipped
+        self.all_directories += [d for d in fallback_directories if os.path.isdir(d)]
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304) and HASHED_NAME.search(path):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
@@ -0,0 +1,334 @@
+"""
+Object storage for uploaded files.
+
+Files are addressed by keys such as "uploads/pitch_decks/7_deck.pdf", the same
+relative paths already stored in the database, so existing rows keep working
+whichever backend is active. Paths saved with a leading slash
+("/uploads/profile_photos/...") map to the same key.
+
+Backends:
+    local   files under STORAGE_LOCAL_ROOT (default: the backend directory, where
+            the upload endpoints have always written). Downloads are served by
+            the API, or handed to nginx with X-Accel-Redirect when
+            LOCAL_ACCEL_REDIRECT_PREFIX is set.
+    s3      any S3-compatible service (AWS S3, MinIO). Large uploads go through
+            multipart transfers and downloads redirect to short-lived presigned
+            URLs, so the bytes never pass through API workers. Requires boto3.
+
+Environment:
+    STORAGE_BACKEND              local or s3 (default local)
+    STORAGE_LOCAL_ROOT           root directory for the local backend
+    LOCAL_ACCEL_REDIRECT_PREFIX  internal nginx location for local downloads, e.g. /protected/
+    S3_BUCKET                    bucket name (default startup-investor-uploads)
+    S3_ENDPOINT_URL              custom endpoint, e.g. http://minio:9000 (unset for AWS)
+    S3_REGION                    region name (default us-east-1)
+    S3_CREATE_BUCKET             create the bucket on first use if missing (default false)
+    S3_PRESIGN_EXPIRES           presigned URL lifetime in seconds (default 300)
+    S3_PUBLIC_BASE_URL           public or CDN base URL for profile photos, e.g. https://cdn.example.com
+                                 (unset: profile photos redirect to presigned URLs)
+    S3_MULTIPART_THRESHOLD_MB    uploads above this size use multipart (default 8)
+    S3_MULTIPART_CHUNK_MB        multipart part size (default 8)
+    S3_PROXY_DOWNLOADS           stream S3 downloads through the API instead of redirecting (default false)
+    AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY  credentials, read by boto3
+"""
+
+import io
+import logging
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import BinaryIO, Iterator, Optional, Tuple
+from urllib.parse import quote
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(backend_dir)
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").lower()
+STORAGE_LOCAL_ROOT = os.getenv("STORAGE_LOCAL_ROOT", backend_dir)
+LOCAL_ACCEL_REDIRECT_PREFIX = os.getenv("LOCAL_ACCEL_REDIRECT_PREFIX", "")
+
+S3_BUCKET = os.getenv("S3_BUCKET", "startup-investor-uploads")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+S3_REGION = os.getenv("S3_REGION", "us-east-1")
+S3_CREATE_BUCKET = os.getenv("S3_CREATE_BUCKET", "false").lower() == "true"
+S3_PRESIGN_EXPIRES = int(os.getenv("S3_PRESIGN_EXPIRES", "300"))
+S3_MULTIPART_THRESHOLD = int(float(os.getenv("S3_MULTIPART_THRESHOLD_MB", "8")) * 1024 * 1024)
+S3_MULTIPART_CHUNK = int(float(os.getenv("S3_MULTIPART_CHUNK_MB", "8")) * 1024 * 1024)
+S3_PROXY_DOWNLOADS = os.getenv("S3_PROXY_DOWNLOADS", "false").lower() == "true"
+S3_PUBLIC_BASE_URL = os.getenv("S3_PUBLIC_BASE_URL", "").rstrip("/")
+
+# Long-lived caching for content-hashed objects
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+MEDIA_TYPES = {
+    '.pdf': 'application/pdf',
+    '.ppt': 'application/vnd.ms-powerpoint',
+    '.pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.webp': 'image/webp',
+}
+
+
+def media_type_for(filename: str) -> str:
+    """Content type from a filename's extension"""
+    return MEDIA_TYPES.get(os.path.splitext(filename)[1].lower(), 'application/octet-stream')
+
+
+def storage_key(path: str) -> str:
+    """Normalize a stored file path (relative, leading slash or absolute local path) to a key"""
+    if os.path.isabs(path):
+        for root in (STORAGE_LOCAL_ROOT, project_root):
+            if path.startswith(root.rstrip(os.sep) + os.sep):
+                return os.path.relpath(path, root).replace(os.sep, "/")
+    return path.lstrip("/")
+
+
+def _content_disposition(filename: str) -> str:
+    return f"attachment; filename*=UTF-8''{quote(filename)}"
+
+
+class StorageError(Exception):
+    pass
+
+
+class LocalStorage:
+    name = "local"
+
+    def __init__(self, root: str, fallback_roots: tuple = ()):
+        self.root = root
+        # Older deployments wrote some files relative to the project root; read-only fallback
+        self.fallback_roots = fallback_roots
+
+    def path(self, key: str) -> Optional[str]:
+        """Absolute path of an existing object, or None"""
+        key = storage_key(key)
+        roots = (self.root,) + (self.fallback_roots if key.startswith("uploads/") else ())
+        for root in roots:
+            candidate = os.path.normpath(os.path.join(root, key))
+            # Keys must never escape the storage root
+            if candidate.startswith(os.path.normpath(root) + os.sep) and os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def save(self, key: str, fileobj: BinaryIO, content_type: str = None, cache_control: str = None) -> int:
+        """Store a stream under key, atomically replacing any existing object; returns its size"""
+        target = os.path.normpath(os.path.join(self.root, storage_key(key)))
+        if not target.startswith(os.path.normpath(self.root) + os.sep):
+            raise StorageError(f"Invalid storage key: {key}")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                shutil.copyfileobj(fileobj, f, length=1024 * 1024)
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return os.path.getsize(target)
+
+    def save_bytes(self, key: str, data: bytes, content_type: str = None, cache_control: str = None) -> int:
+        return self.save(key, io.BytesIO(data), content_type, cache_control)
+
+    def read(self, key: str) -> bytes:
+        path = self.path(key)
+        if path is None:
+            raise FileNotFoundError(key)
+        with open(path, "rb") as f:
+            return f.read()
+
+    def exists(self, key: str) -> bool:
+        return self.path(key) is not None
+
+    def size(self, key: str) -> Optional[int]:
+        path = self.path(key)
+        return os.path.getsize(path) if path else None
+
+    def delete(self, key: str):
+        path = self.path(key)
+        if path:
+            os.remove(path)
+
+    def delete_many(self, keys: list):
+        for key in keys:
+            self.delete(key)
+
+    def list(self, prefix: str) -> Iterator[Tuple[str, int, datetime]]:
+        """(key, size, last_modified) for every object under prefix"""
+        base = os.path.join(self.root, storage_key(prefix))
+        for dirpath, _, filenames in os.walk(base):
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                stat = os.stat(full_path)
+                key = os.path.relpath(full_path, self.root).replace(os.sep, "/")
+                yield key, stat.st_size, datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+
+    def download_response(self, key: str, filename: str, media_type: str = None) -> Response:
+        path = self.path(key)
+        if path is None:
+            raise FileNotFoundError(key)
+        media_type = media_type or media_type_for(filename)
+        if LOCAL_ACCEL_REDIRECT_PREFIX:
+            # nginx serves the bytes from its internal location
+            return Response(headers={
+                "X-Accel-Redirect": LOCAL_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + quote(storage_key(key)),
+                "Content-Type": media_type,
+                "Content-Disposition": _content_disposition(filename),
+            })
+        return FileResponse(path=path, filename=filename, media_type=media_type)
+
+
+class S3Storage:
+    name = "s3"
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str], region: str):
+        # Imported here: boto3 is only needed for the s3 backend and takes ~0.1 s to import
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config as BotoConfig
+            from botocore.exceptions import ClientError
+        except ImportError:
+            raise StorageError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)")
+        self.ClientError = ClientError
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            # Path-style addressing works with MinIO and other self-hosted endpoints
+            config=BotoConfig(signature_version="s3v4", s3={"addressing_style": "path" if endpoint_url else "auto"})
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD, multipart_chunksize=S3_MULTIPART_CHUNK
+        )
+        self._bucket_checked = not S3_CREATE_BUCKET
+        self._lock = threading.Lock()
+
+    def _ensure_bucket(self):
+        if self._bucket_checked:
+            return
+        with self._lock:
+            if self._bucket_checked:
+                return
+            try:
+                self.client.head_bucket(Bucket=self.bucket)
+            except self.ClientError:
+                self.client.create_bucket(Bucket=self.bucket)
+                logger.info("Created storage bucket", extra={"bucket": self.bucket})
+            self._bucket_checked = True
+
+    def save(self, key: str, fileobj: BinaryIO, content_type: str = None, cache_control: str = None) -> int:
+        """Upload a stream (multipart above S3_MULTIPART_THRESHOLD_MB); returns its size"""
+        self._ensure_bucket()
+        start = fileobj.tell()
+        fileobj.seek(0, os.SEEK_END)
+        size = fileobj.tell() - start
+        fileobj.seek(start)
+
+        extra_args = {"ContentType": content_type or media_type_for(key)}
+        if cache_control:
+            extra_args["CacheControl"] = cache_control
+        self.client.upload_fileobj(fileobj, self.bucket, storage_key(key), ExtraArgs=extra_args, Config=self.transfer_config)
+        return size
+
+    def save_bytes(self, key: str, data: bytes, content_type: str = None, cache_control: str = None) -> int:
+        return self.save(key, io.BytesIO(data), content_type, cache_control)
+
+    def read(self, key: str) -> bytes:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=storage_key(key))["Body"].read()
+        except self.ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                raise FileNotFoundError(key)
+            raise
+
+    def _head(self, key: str) -> Optional[dict]:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=storage_key(key))
+        except self.ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def exists(self, key: str) -> bool:
+        return self._head(key) is not None
+
+    def size(self, key: str) -> Optional[int]:
+        head = self._head(key)
+        return head["ContentLength"] if head else None
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=storage_key(key))
+
+    def delete_many(self, keys: list):
+        """One DeleteObjects request per 1000 keys"""
+        keys = [storage_key(key) for key in keys]
+        for start in range(0, len(keys), 1000):
+            batch = keys[start:start + 1000]
+            response = self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+            )
+            if response.get("Errors"):
+                raise StorageError(f"Failed to delete {len(response['Errors'])} objects: {response['Errors'][0]}")
+
+    def list(self, prefix: str) -> Iterator[Tuple[str, int, datetime]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=storage_key(prefix)):
+            for item in page.get("Contents", []):
+                yield item["Key"], item["Size"], item["LastModified"]
+
+    def presigned_url(self, key: str, filename: str = None, media_type: str = None) -> str:
+        params = {"Bucket": self.bucket, "Key": storage_key(key)}
+        if filename:
+            params["ResponseContentDisposition"] = _content_disposition(filename)
+        if media_type:
+            params["ResponseContentType"] = media_type
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=S3_PRESIGN_EXPIRES)
+
+    def download_response(self, key: str, filename: str, media_type: str = None) -> Response:
+        media_type = media_type or media_type_for(filename)
+        if not S3_PROXY_DOWNLOADS:
+            # The client fetches the bytes straight from the object store
+            return RedirectResponse(self.presigned_url(key, filename, media_type), status_code=307)
+
+        try:
+            body = self.client.get_object(Bucket=self.bucket, Key=storage_key(key))["Body"]
+        except self.ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                raise FileNotFoundError(key)
+            raise
+        return StreamingResponse(
+            body.iter_chunks(chunk_size=1024 * 1024),
+            media_type=media_type,
+            headers={"Content-Disposition": _content_disposition(filename)}
+        )
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """The configured storage backend (created on first use)"""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                if STORAGE_BACKEND == "s3":
+                    _storage = S3Storage(S3_BUCKET, S3_ENDPOINT_URL, S3_REGION)
+                elif STORAGE_BACKEND == "local":
+                    _storage = LocalStorage(STORAGE_LOCAL_ROOT, fallback_roots=(project_root,))
+                else:
+                    raise StorageError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+    return _storage
@@ -0,0 +1,77 @@
+"""
+Revocation list for access tokens.
+
+Access tokens are self-contained and short-lived, so they can't be deleted on
+logout. Every token carries the id of the login session it belongs to (`sid`),
+and a revoked session is refused until its last access token would have
+expired anyway. The list therefore stays small: one entry per session revoked
+within the last ACCESS_TOKEN_EXPIRE_MINUTES.
+
+Each worker checks tokens against an in-memory copy. Revocations are written to
+the revoked_sessions table and every worker reloads all unexpired rows every
+TOKEN_REVOCATION_SYNC_SECONDS with one indexed query. The whole (small) list is
+reloaded rather than only rows past the last id seen: ids are assigned before
+commit, so concurrent logouts can commit out of id order.
+
+Environment:
+    TOKEN_REVOCATION_SYNC_SECONDS  how often a worker reloads revocations from other workers (default 5)
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from Database.db import SessionLocal
+from Models.Auth_models import RevokedSession
+
+logger = logging.getLogger(__name__)
+
+TOKEN_REVOCATION_SYNC_SECONDS = float(os.getenv("TOKEN_REVOCATION_SYNC_SECONDS", "5"))
+
+
+class RevocationList:
+    def __init__(self, sync_interval: float):
+        self.sync_interval = sync_interval
+        self._revoked = {}  # session id -> expires_at (naive UTC)
+        self._last_sync = 0.0
+        self._lock = threading.Lock()
+
+    def is_revoked(self, session_id: str) -> bool:
+        if time.monotonic() - self._last_sync > self.sync_interval:
+            self._sync()
+        expires_at = self._revoked.get(session_id)
+        return expires_at is not None and expires_at > datetime.utcnow()
+
+    def add(self, session_id: str, expires_at: datetime):
+        """Record a revocation made by this worker; the caller has written the row"""
+        with self._lock:
+            self._revoked[session_id] = max(expires_at, self._revoked.get(session_id, expires_at))
+
+    def _sync(self):
+        # One request per worker reloads; the others keep using the current copy
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            now = datetime.utcnow()
+            db = SessionLocal()
+            try:
+                rows = db.query(RevokedSession.session_id, RevokedSession.expires_at).filter(
+                    RevokedSession.expires_at > now
+                ).all()
+            finally:
+                db.close()
+            # Keep entries added by this worker whose rows aren't visible yet; a revocation is never undone
+            revoked = {sid: exp for sid, exp in self._revoked.items() if exp > now}
+            for session_id, expires_at in rows:
+                revoked[session_id] = max(expires_at, revoked.get(session_id, expires_at))
+            self._revoked = revoked
+        except Exception as e:
+            # Keep serving from the current copy until the next interval
+            logger.warning("Failed to sync token revocations", extra={"error": str(e)})
+        finally:
+            self._last_sync = time.monotonic()
+            self._lock.release()
+
+
+revocation_list = RevocationList(TOKEN_REVOCATION_SYNC_SECONDS)
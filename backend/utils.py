@@ -1,21 +1,28 @@
 import random
 import os
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from Database.db import get_db
+from Database.db import get_db, SessionLocal
 from Models.Auth_models import User
+from schemas.Auth_Schema import CurrentUser
+from logging_config import redact_email
+from token_revocation import revocation_list
+
+logger = logging.getLogger(__name__)
 
 # JWT Configuration
-SECRET_KEY = "your-secret-key-here-make-it-long-and-secure-in-production"
+SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here-make-it-long-and-secure-in-production")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
+# Access tokens are checked without a database lookup, so they stay short-lived; clients renew them with a refresh token
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+# A rotated refresh token presented again within this window is refused without revoking the session
+REFRESH_TOKEN_REUSE_GRACE_SECONDS = 10
 
 # Security scheme
 security = HTTPBearer()
@@ -26,12 +33,21 @@ EMAIL_PORT = int(os.getenv("EMAIL_PORT", "587"))
 EMAIL_USER = os.getenv("EMAIL_USER", "your-email@gmail.com")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD", "your-app-password")
 
+# OTP emails are sent inline on a threadpool thread; the readiness check reports how many are in progress
+_mail_in_flight = 0
+_mail_lock = threading.Lock()
+
 def generate_otp():
     """Generate a 6-digit OTP"""
     return str(random.randint(100000, 999999))
 
 def send_email(email: str, otp: str) -> bool:
     """Send OTP email and return True if successful, False if failed"""
+    # Mail modules are imported on first send rather than at startup
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+
     # Use environment variables or fallback to hardcoded values
     sender_email = os.getenv("SENDER_EMAIL", "jaswanthb1711@gmail.com")
     sender_password = os.getenv("SENDER_PASSWORD", "gdlxiisslvafbdvr")
@@ -69,21 +85,23 @@ def send_email(email: str, otp: str) -> bool:
         server.sendmail(sender_email, email, text)
         server.quit()
         
-        print(f"✅ Email successfully sent to {email}")
+        logger.info("OTP email sent", extra={"recipient": redact_email(email)})
         return True
         
     except smtplib.SMTPAuthenticationError as e:
-        print(f"❌ SMTP Authentication failed: {e}")
-        print("Please check your email credentials and ensure you're using an App Password for Gmail.")
+        logger.error(
+            "SMTP authentication failed; check the sender credentials (Gmail needs an App Password)",
+            extra={"error": str(e)}
+        )
         return False
     except smtplib.SMTPRecipientsRefused as e:
-        print(f"❌ Recipient {email} was refused by the server: {e}")
+        logger.warning("OTP email recipient refused", extra={"recipient": redact_email(email), "error": str(e)})
         return False
     except smtplib.SMTPException as e:
-        print(f"❌ SMTP error occurred: {e}")
+        logger.error("SMTP error while sending OTP email", extra={"recipient": redact_email(email), "error": str(e)})
         return False
     except Exception as e:
-        print(f"❌ Failed to send email to {email}. Error: {e}")
+        logger.exception("Failed to send OTP email", extra={"recipient": redact_email(email)})
         return False
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -95,42 +113,102 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
+    # jose pulls in its crypto backends (~40 ms), so it's imported on first use rather than at startup
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_user_access_token(user: User, session_id: str):
+    """Access token carrying the claims get_current_user needs, tied to a login session"""
+    return create_access_token(data={
+        "sub": str(user.id),
+        "email": user.email,
+        "role": user.role,
+        "ver": user.is_verified,
+        "sid": session_id
+    })
+
 def verify_token(token: str):
-    """Verify JWT token"""
+    """Verify JWT token and return its claims"""
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
+        if payload.get("sub") is None:
             return None
-        return user_id
+        return payload
     except JWTError:
         return None
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    """Get current user from JWT token"""
-    token = credentials.credentials
-    user_id = verify_token(token)
-    
-    if user_id is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+def _credentials_error(detail: str = "Could not validate credentials"):
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> CurrentUser:
+    """Get current user from the JWT claims, without a database lookup"""
+    payload = verify_token(credentials.credentials)
+    if payload is None:
+        raise _credentials_error()
+
+    session_id = payload.get("sid")
+    if session_id is None:
+        # Token issued before access tokens carried a session; look the user up until it expires
+        user = _get_legacy_token_user(payload)
+    elif revocation_list.is_revoked(session_id):
+        raise _credentials_error("Session has been logged out")
+    else:
+        user = CurrentUser(
+            id=int(payload["sub"]),
+            email=payload["email"],
+            role=payload["role"],
+            is_verified=payload.get("ver", False),
+            session_id=session_id
         )
-    
-    user = db.query(User).filter(User.id == user_id).first()
+
+    # Read-after-write routing in Database/db.py keys on the request's user
+    request.state.user_id = user.id
+    return user
+
+def _get_legacy_token_user(payload: dict) -> CurrentUser:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == int(payload["sub"])).first()
+    finally:
+        db.close()
     if user is None:
+        raise _credentials_error("User not found")
+    return CurrentUser(id=user.id, email=user.email, role=user.role, is_verified=user.is_verified)
+
+def get_current_user_record(current_user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)):
+    """The current user's row, for endpoints that need fields beyond the token claims"""
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if user is None:
+        raise _credentials_error("User not found")
+    return user
+
+def get_admin_user(current_user: CurrentUser = Depends(get_current_user)):
+    """Allow only users whose email is listed in ADMIN_EMAILS (comma-separated)"""
+    admin_emails = {email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()}
+    if current_user.email.lower() not in admin_emails:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
         )
-    
-    return user
+    return current_user
 
 def send_otp_email(email: str, otp: str):
     """Send OTP email - wrapper for send_email"""
-    return send_email(email, otp)
\ No newline at end of file
+    global _mail_in_flight
+    with _mail_lock:
+        _mail_in_flight += 1
+    try:
+        return send_email(email, otp)
+    finally:
+        with _mail_lock:
+            _mail_in_flight -= 1
+
+def mail_in_flight() -> int:
+    """OTP emails currently being sent by this worker"""
+    return _mail_in_flight
\ No newline at end of file
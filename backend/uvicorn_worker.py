@@ -0,0 +1,24 @@
+"""
+Gunicorn worker class for the API (see gunicorn_conf.py).
+
+uvicorn's UvicornWorker waits for open connections indefinitely after SIGTERM,
+so a slow upload keeps it alive until gunicorn kills it at graceful_timeout and
+the lifespan shutdown (stopping the maintenance scheduler) never runs. This
+worker gives in-flight requests graceful_timeout minus SHUTDOWN_RESERVE_SECONDS
+to finish, then cancels what is left and shuts the application down in the
+remaining time.
+"""
+
+from uvicorn.workers import UvicornWorker
+
+# Time kept back from graceful_timeout for the lifespan shutdown and log flush
+SHUTDOWN_RESERVE_SECONDS = 10
+
+
+class DrainingUvicornWorker(UvicornWorker):
+    # uvloop and httptools when installed (uvicorn[standard]), asyncio and h11 otherwise
+    CONFIG_KWARGS = {"loop": "auto", "http": "auto"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = max(1, self.cfg.graceful_timeout - SHUTDOWN_RESERVE_SECONDS)
@@ -54,7 +54,7 @@ case $choice in
         echo "   2. Connect your GitHub repository"
         echo "   3. Create new Web Service"
         echo "   4. Set Build Command: pip install -r backend/requirements.txt"
-        echo "   5. Set Start Command: cd backend && python3 migrate_db.py && gunicorn main:app -w 4 -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:\$PORT"
+        echo "   5. Set Start Command: cd backend && python3 migrate_db.py && gunicorn -c gunicorn_conf.py main:app"
         echo "   6. Create PostgreSQL database"
         echo "   7. Set environment variables:"
         echo "      - DATABASE_URL (from PostgreSQL service)"
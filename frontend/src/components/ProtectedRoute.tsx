@@ -1,6 +1,6 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { Navigate } from 'react-router-dom';
-import { isAuthenticated, isTokenExpired } from '../utils/auth';
+import { isAuthenticated, isTokenExpired, refreshAccessToken, logout } from '../utils/auth';
 
 interface ProtectedRouteProps {
   children: React.ReactNode;
@@ -8,13 +8,42 @@ interface ProtectedRouteProps {
 }
 
 const ProtectedRoute: React.FC<ProtectedRouteProps> = ({ children, requiredRole }) => {
+  // An expired access token is renewed with the refresh token before deciding
+  const [refreshing, setRefreshing] = useState(() => isAuthenticated() && isTokenExpired());
+  const [refreshFailed, setRefreshFailed] = useState(false);
+
+  useEffect(() => {
+    if (!refreshing) return;
+    let cancelled = false;
+    refreshAccessToken().then(refreshed => {
+      if (cancelled) return;
+      if (!refreshed && isTokenExpired()) {
+        // Clear the dead session so /login doesn't bounce back here
+        logout();
+      }
+      setRefreshFailed(!refreshed);
+      setRefreshing(false);
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [refreshing]);
+
   // Check if user is authenticated
   if (!isAuthenticated()) {
     return <Navigate to="/login" replace />;
   }
 
-  // Check if token is expired
-  if (isTokenExpired()) {
+  if (refreshing) {
+    return (
+      <div className="flex items-center justify-center min-h-[50vh] text-gray-500">
+        Loading...
+      </div>
+    );
+  }
+
+  // Check if token is expired and could not be renewed
+  if (refreshFailed || isTokenExpired()) {
     return <Navigate to="/login" replace />;
   }
 
@@ -29,4 +58,4 @@ const ProtectedRoute: React.FC<ProtectedRouteProps> = ({ children, requiredRole
   return <>{children}</>;
 };
 
-export default ProtectedRoute; 
\ No newline at end of file
+export default ProtectedRoute;
@@ -1,7 +1,9 @@
 import React, { useEffect, useState } from 'react';
 import { useParams } from 'react-router-dom';
+import { getAuthHeaders, authFetch } from '../utils/auth';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+const INVESTOR_PAGE_SIZE = 100;
 
 const InvestorBrowseAndSend: React.FC = () => {
   const { id } = useParams<{ id: string }>();
@@ -10,20 +12,28 @@ const InvestorBrowseAndSend: React.FC = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
+  const [page, setPage] = useState(1);
+  const [hasMore, setHasMore] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // Investors this startup hasn't contacted yet, filtered and paginated server-side
+  const fetchInvestorPage = async (pageNumber: number) => {
+    const availRes = await authFetch(`${API_BASE_URL}/applications/available-investors/${id}?page=${pageNumber}&page_size=${INVESTOR_PAGE_SIZE}`, {
+      headers: getAuthHeaders(),
+    });
+    if (!availRes.ok) throw new Error(`Failed to load investors: ${availRes.status}`);
+    return availRes.json();
+  };
 
   useEffect(() => {
     const fetchInvestors = async () => {
       if (!id) return;
       setLoading(true);
       try {
-        // Get available investor user_ids
-        const availRes = await fetch(`${API_BASE_URL}/applications/available-investors/${id}`);
-        const availableIds: number[] = availRes.ok ? await availRes.json() : [];
-        // Get investor profiles
-        const profRes = await fetch(`${API_BASE_URL}/investor-profile/user/0`); // 0 returns all
-        const allProfiles = profRes.ok ? await profRes.json() : [];
-        // Filter to only available
-        setInvestors(allProfiles.filter((inv: any) => availableIds.includes(inv.user_id)));
+        const firstPage = await fetchInvestorPage(1);
+        setInvestors(firstPage.items);
+        setPage(1);
+        setHasMore(firstPage.has_more);
       } catch (err) {
         setError('Failed to load investors');
       } finally {
@@ -33,6 +43,20 @@ const InvestorBrowseAndSend: React.FC = () => {
     fetchInvestors();
   }, [id]);
 
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    try {
+      const nextPage = await fetchInvestorPage(page + 1);
+      setInvestors(prev => [...prev, ...nextPage.items]);
+      setPage(page + 1);
+      setHasMore(nextPage.has_more);
+    } catch (err) {
+      setError('Failed to load investors');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleSelect = (userId: number, checked: boolean) => {
     setSelected(prev => checked ? [...prev, userId] : prev.filter(id => id !== userId));
   };
@@ -86,7 +110,7 @@ const InvestorBrowseAndSend: React.FC = () => {
         {success && <div style={{ background: '#d4edda', color: '#155724', borderRadius: 8, padding: 12, marginBottom: 16 }}>{success}</div>}
         <ul style={{ listStyle: 'none', padding: 0, margin: 0 }}>
           {investors.map(inv => (
-            <li key={inv.id} style={{ background: '#f7f7f7', borderRadius: 8, marginBottom: 12, padding: 16, display: 'flex', alignItems: 'center', gap: 16 }}>
+            <li key={inv.user_id} style={{ background: '#f7f7f7', borderRadius: 8, marginBottom: 12, padding: 16, display: 'flex', alignItems: 'center', gap: 16 }}>
               <input
                 type="checkbox"
                 checked={selected.includes(inv.user_id)}
@@ -101,6 +125,25 @@ const InvestorBrowseAndSend: React.FC = () => {
             </li>
           ))}
         </ul>
+        {hasMore && (
+          <button
+            onClick={handleLoadMore}
+            disabled={loadingMore}
+            style={{
+              background: '#fff',
+              color: '#222',
+              border: '1px solid #ddd',
+              borderRadius: 8,
+              padding: '8px 16px',
+              cursor: loadingMore ? 'not-allowed' : 'pointer',
+              opacity: loadingMore ? 0.6 : 1,
+              marginTop: 4,
+              marginBottom: 8
+            }}
+          >
+            {loadingMore ? 'Loading...' : 'Load more investors'}
+          </button>
+        )}
         {selected.length > 0 && (
           <button
             onClick={handleSend}
@@ -1,9 +1,15 @@
 import React, { useState, useEffect } from 'react';
 import { Search, Filter, Send, Clock, CheckCircle, XCircle, Settings, Eye, Heart, TrendingUp, Users, DollarSign, MapPin } from 'lucide-react';
-import { getAuthHeaders, getUserId, viewPitchDeck } from '../utils/auth';
+import { getAuthHeaders, getUserId, viewPitchDeck, authFetch } from '../utils/auth';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// Only the columns the startup cards render; the profile modal loads the full profile (openStartupProfile)
+const STARTUP_CARD_FIELDS = [
+  'company_name', 'industry', 'company_description', 'district', 'state', 'team_size',
+  'funding_stage', 'amount_seeking', 'pitch_deck_filename'
+].join(',');
+
 interface Startup {
   id: number;
   user_id: number;
@@ -110,7 +116,7 @@ const InvestorDashboard: React.FC = () => {
     setLoading(true); // Use the main loading state
     try {
       console.log('🔍 Fetching startups...');
-      const response = await fetch(`${API_BASE_URL}/startup-profile/all`, {
+      const response = await authFetch(`${API_BASE_URL}/startup-profile/all?fields=${STARTUP_CARD_FIELDS}`, {
         headers: getAuthHeaders(),
       });
       
@@ -135,12 +141,33 @@ const InvestorDashboard: React.FC = () => {
 
 
 
+  // Show the card's data right away, then fill in the fields the listing doesn't include
+  const openStartupProfile = async (startup: Startup) => {
+    setViewingStartupProfile(startup);
+    try {
+      const response = await authFetch(`${API_BASE_URL}/startup-profile/${startup.user_id}`, {
+        headers: getAuthHeaders(),
+      });
+      if (response.ok) {
+        const profile = await response.json();
+        // Ignore the response if the modal was closed or another profile opened meanwhile
+        setViewingStartupProfile(current =>
+          current && current.user_id === startup.user_id ? { ...current, ...profile } : current
+        );
+      } else {
+        console.error('❌ Failed to fetch startup profile:', response.status);
+      }
+    } catch (err) {
+      console.error('❌ Network error:', err);
+    }
+  };
+
   const fetchLogs = async () => {
     setLoadingLogs(true);
     setErrorLogs('');
     try {
       const userId = getUserId();
-      const response = await fetch(`${API_BASE_URL}/applications/investor/${userId}/received-pitch-decks`, {
+      const response = await authFetch(`${API_BASE_URL}/applications/investor/${userId}/received-pitch-decks`, {
         headers: getAuthHeaders(),
       });
       
@@ -164,7 +191,7 @@ const InvestorDashboard: React.FC = () => {
     setError('');
     
     try {
-      const response = await fetch(`${API_BASE_URL}/applications/update-interest`, {
+      const response = await authFetch(`${API_BASE_URL}/applications/update-interest`, {
         method: 'POST',
         headers: {
           ...getAuthHeaders(),
@@ -206,7 +233,7 @@ const InvestorDashboard: React.FC = () => {
 
     setSendingApplication(true);
     try {
-      const response = await fetch(`${API_BASE_URL}/applications/update-interest`, {
+      const response = await authFetch(`${API_BASE_URL}/applications/update-interest`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -526,7 +553,7 @@ const InvestorDashboard: React.FC = () => {
                       <div className="p-6">
                         <div className="flex space-x-3 mb-4">
                           <button
-                            onClick={() => setViewingStartupProfile(startup)}
+                            onClick={() => openStartupProfile(startup)}
                             className="flex-1 flex items-center justify-center space-x-2 px-4 py-3 bg-gradient-to-r from-yellow-500 to-orange-500 text-white rounded-xl font-medium hover:from-yellow-600 hover:to-orange-600 transition-all duration-300 shadow-lg hover:shadow-xl transform hover:-translate-y-0.5"
                           >
                             <Eye className="w-4 h-4" />
@@ -635,7 +662,7 @@ const InvestorDashboard: React.FC = () => {
                               
                               <div className="flex gap-2 mt-4">
                                 <button
-                                  onClick={() => setViewingStartupProfile(startup)}
+                                  onClick={() => openStartupProfile(startup)}
                                   className="flex-1 px-3 py-2 bg-blue-500 text-white text-sm rounded-lg hover:bg-blue-600 transition-colors"
                                 >
                                   View Profile
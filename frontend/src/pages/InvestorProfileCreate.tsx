@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { getAuthHeaders } from '../utils/auth';
+import { getAuthHeaders, authFetch } from '../utils/auth';
 
 const InvestorProfileCreate: React.FC = () => {
   const navigate = useNavigate();
@@ -46,7 +46,7 @@ const InvestorProfileCreate: React.FC = () => {
 
     try {
       const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
-      const response = await fetch(`${API_BASE_URL}/investor-profile/`, {
+      const response = await authFetch(`${API_BASE_URL}/investor-profile/`, {
         method: 'POST',
         headers: getAuthHeaders(),
         body: JSON.stringify(formData),
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { getAuthHeaders, getUserId } from '../utils/auth';
+import { getAuthHeaders, getUserId, authFetch } from '../utils/auth';
 import { Edit, Save, X, User, DollarSign, MapPin, Briefcase } from 'lucide-react';
 
 interface InvestorProfile {
@@ -57,7 +57,7 @@ const InvestorProfileEdit: React.FC = () => {
   const fetchProfile = async () => {
     try {
       const userId = getUserId();
-      const response = await fetch(`${API_BASE_URL}/investor-profile/user/${userId}`, {
+      const response = await authFetch(`${API_BASE_URL}/investor-profile/user/${userId}`, {
         headers: getAuthHeaders(),
       });
 
@@ -97,7 +97,7 @@ const InvestorProfileEdit: React.FC = () => {
     setError('');
 
     try {
-      const response = await fetch(`${API_BASE_URL}/investor-profile/${profile?.user_id}`, {
+      const response = await authFetch(`${API_BASE_URL}/investor-profile/${profile?.user_id}`, {
         method: 'PUT',
         headers: {
           ...getAuthHeaders(),
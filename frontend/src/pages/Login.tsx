@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { setToken, setUserId, setUserRole } from '../utils/auth';
+import { setToken, setRefreshToken, setUserId, setUserRole } from '../utils/auth';
 import { Eye, EyeOff, Lock, Mail, Sparkles, ArrowRight } from 'lucide-react';
 
 const Login: React.FC = () => {
@@ -37,6 +37,7 @@ const Login: React.FC = () => {
         
         // Store authentication data
         setToken(data.access_token);
+        setRefreshToken(data.refresh_token);
         setUserId(data.user_id);
         setUserRole(data.role);
 
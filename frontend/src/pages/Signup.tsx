@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { setToken, setUserId, setUserRole } from '../utils/auth';
+import { setToken, setRefreshToken, setUserId, setUserRole } from '../utils/auth';
 
 const Signup: React.FC = () => {
   const navigate = useNavigate();
@@ -80,6 +80,7 @@ const Signup: React.FC = () => {
         
         // Store authentication data
         setToken(data.access_token);
+        setRefreshToken(data.refresh_token);
         setUserId(data.user_id);
         setUserRole(data.role);
 
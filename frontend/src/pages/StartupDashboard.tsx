@@ -1,9 +1,16 @@
 import React, { useState, useEffect } from 'react';
 import { Search, Filter, Send, XCircle, User, FileText, Settings } from 'lucide-react';
-import { getAuthHeaders, getUserId, viewPitchDeck } from '../utils/auth';
+import { getAuthHeaders, getUserId, viewPitchDeck, authFetch } from '../utils/auth';
+import { uploadPitchDeckResumable } from '../utils/resumableUpload';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// Only the columns the investor list renders
+const INVESTOR_CARD_FIELDS = [
+  'full_name', 'firm_name', 'investor_type', 'investment_stages', 'industry_focus',
+  'check_size_range', 'professional_background', 'profile_photo_filename', 'profile_photo_variants'
+].join(',');
+
 interface Investor {
   id: number;
   user_id: number;
@@ -18,6 +25,7 @@ interface Investor {
   investment_philosophy: string;
   profile_photo_filename?: string;
   profile_photo_file_path?: string;
+  profile_photo_variants?: Record<'thumb' | 'card' | 'full', { width: number; height: number; webp: string; jpeg: string }> | null;
   professional_background?: string[];
   created_at: string;
 }
@@ -122,7 +130,7 @@ const StartupDashboard: React.FC = () => {
     setLoading(true);
     setError('');
     try {
-      const response = await fetch(`${API_BASE_URL}/investor-profile/all`, {
+      const response = await authFetch(`${API_BASE_URL}/investor-profile/all?fields=${INVESTOR_CARD_FIELDS}`, {
         headers: getAuthHeaders(),
       });
       
@@ -142,7 +150,7 @@ const StartupDashboard: React.FC = () => {
   const fetchApplications = async () => {
     try {
       const userId = getUserId();
-      const response = await fetch(`${API_BASE_URL}/applications/startup/${userId}/sent-pitch-decks`, {
+      const response = await authFetch(`${API_BASE_URL}/applications/startup/${userId}/sent-pitch-decks`, {
         headers: getAuthHeaders(),
       });
       if (response.ok) {
@@ -165,7 +173,7 @@ const StartupDashboard: React.FC = () => {
     setSendingApplication(true);
     try {
       const userId = getUserId();
-      const response = await fetch(`${API_BASE_URL}/applications/`, {
+      const response = await authFetch(`${API_BASE_URL}/applications/`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -210,7 +218,7 @@ const StartupDashboard: React.FC = () => {
     
     try {
       const promises = selectedInvestors.map(investorId =>
-        fetch(`${API_BASE_URL}/applications/send-pitch-deck`, {
+        authFetch(`${API_BASE_URL}/applications/send-pitch-deck`, {
           method: 'POST',
           headers: {
             ...getAuthHeaders(),
@@ -243,7 +251,7 @@ const StartupDashboard: React.FC = () => {
     setErrorLogs('');
     try {
       const userId = getUserId();
-      const response = await fetch(`${API_BASE_URL}/applications/startup/${userId}/sent-pitch-decks`, {
+      const response = await authFetch(`${API_BASE_URL}/applications/startup/${userId}/sent-pitch-decks`, {
         headers: getAuthHeaders(),
       });
       if (response.ok) {
@@ -318,7 +326,7 @@ const StartupDashboard: React.FC = () => {
   const fetchCurrentPitchDeck = async () => {
     try {
       const userId = getUserId();
-      const response = await fetch(`${API_BASE_URL}/startup-profile/user/${userId}`, {
+      const response = await authFetch(`${API_BASE_URL}/startup-profile/user/${userId}`, {
         headers: getAuthHeaders(),
       });
       
@@ -344,32 +352,17 @@ const StartupDashboard: React.FC = () => {
 
     setUpdatingPitchDeck(true);
     try {
-      const formData = new FormData();
-      formData.append('pitch_deck', newPitchDeckFile);
-
-      const response = await fetch(`${API_BASE_URL}/startup-profile/update-pitch-deck`, {
-        method: 'PUT',
-        headers: {
-          'Authorization': `Bearer ${localStorage.getItem('access_token')}`,
-        },
-        body: formData,
+      // Chunked and resumable, so a dropped connection doesn't restart the whole deck
+      const data = await uploadPitchDeckResumable(newPitchDeckFile);
+      setCurrentPitchDeck({
+        filename: data.filename,
+        file_path: data.pitch_deck_file_path
       });
-
-      if (response.ok) {
-        const data = await response.json();
-        setCurrentPitchDeck({
-          filename: data.filename,
-          file_path: `uploads/pitch_decks/${data.filename}`
-        });
-        setNewPitchDeckFile(null);
-        alert('Pitch deck updated successfully!');
-      } else {
-        const errorData = await response.json();
-        alert(`Failed to update pitch deck: ${errorData.detail || 'Unknown error'}`);
-      }
+      setNewPitchDeckFile(null);
+      alert('Pitch deck updated successfully!');
     } catch (err) {
       console.error('Update pitch deck error:', err);
-      alert('Network error. Please try again.');
+      alert(`Failed to update pitch deck: ${err instanceof Error ? err.message : 'Network error. Please try again.'}`);
     } finally {
       setUpdatingPitchDeck(false);
     }
@@ -600,7 +593,20 @@ const StartupDashboard: React.FC = () => {
                         )}
                         {/* Photo */}
                         <div className={selectMode ? "col-span-2" : "col-span-2" + " flex items-center justify-center"}>
-                          {investor.profile_photo_filename ? (
+                          {investor.profile_photo_variants ? (
+                            <picture>
+                              <source srcSet={`${API_BASE_URL}${investor.profile_photo_variants.thumb.webp}`} type="image/webp" />
+                              <img
+                                src={`${API_BASE_URL}${investor.profile_photo_variants.thumb.jpeg}`}
+                                alt={investor.full_name}
+                                width={48}
+                                height={48}
+                                loading="lazy"
+                                className="w-12 h-12 rounded-full object-cover border border-gray-200"
+                                onError={e => { e.currentTarget.onerror = null; e.currentTarget.src = '/default-profile.png'; }}
+                              />
+                            </picture>
+                          ) : investor.profile_photo_filename ? (
                             <img
                               src={`${API_BASE_URL}/uploads/profile_photos/${investor.profile_photo_filename}`}
                               alt={investor.full_name}
@@ -901,7 +907,7 @@ const StartupDashboard: React.FC = () => {
                           onClick={async () => {
                             try {
                               const userId = getUserId();
-                              const response = await fetch(`${API_BASE_URL}/startup-profile/download-pitch-deck/${userId}`, {
+                              const response = await authFetch(`${API_BASE_URL}/startup-profile/download-pitch-deck/${userId}`, {
                                 headers: getAuthHeaders(),
                               });
                               
@@ -1,5 +1,6 @@
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
+import { authFetch } from '../utils/auth';
 
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
@@ -141,7 +142,7 @@ const StartupProfileCreate: React.FC = () => {
         formDataToSend.append('pitch_deck', pitchDeckFile);
       }
 
-      const response = await fetch(`${API_BASE_URL}/startup-profile/create-with-files`, {
+      const response = await authFetch(`${API_BASE_URL}/startup-profile/create-with-files`, {
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${localStorage.getItem('access_token')}`,
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { getAuthHeaders, getUserId } from '../utils/auth';
+import { getAuthHeaders, getUserId, authFetch } from '../utils/auth';
 import { Edit, Save, X, Building, DollarSign, FileText } from 'lucide-react';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
@@ -55,7 +55,7 @@ const StartupProfileEdit: React.FC = () => {
   const fetchProfile = async () => {
     try {
       const userId = getUserId();
-      const response = await fetch(`${API_BASE_URL}/startup-profile/user/${userId}`, {
+      const response = await authFetch(`${API_BASE_URL}/startup-profile/user/${userId}`, {
         headers: getAuthHeaders(),
       });
 
@@ -97,7 +97,7 @@ const StartupProfileEdit: React.FC = () => {
         submitData.founding_date = undefined;
       }
       
-      const response = await fetch(`${API_BASE_URL}/startup-profile/${profile?.user_id}`, {
+      const response = await authFetch(`${API_BASE_URL}/startup-profile/${profile?.user_id}`, {
         method: 'PUT',
         headers: {
           ...getAuthHeaders(),
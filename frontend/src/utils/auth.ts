@@ -4,8 +4,15 @@ export interface AuthToken {
   token_type: string;
   user_id: number;
   role: string;
+  refresh_token?: string;
+  expires_in?: number;
 }
 
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
+// Renew the access token when it has less than this left
+const REFRESH_MARGIN_SECONDS = 120;
+
 export interface User {
   id: number;
   email: string;
@@ -26,6 +33,18 @@ export const removeToken = (): void => {
   localStorage.removeItem('access_token');
 };
 
+export const getRefreshToken = (): string | null => {
+  return localStorage.getItem('refresh_token');
+};
+
+export const setRefreshToken = (token: string): void => {
+  localStorage.setItem('refresh_token', token);
+};
+
+export const removeRefreshToken = (): void => {
+  localStorage.removeItem('refresh_token');
+};
+
 export const getUserId = (): number | null => {
   const userId = localStorage.getItem('user_id');
   return userId ? parseInt(userId) : null;
@@ -58,7 +77,17 @@ export const isAuthenticated = (): boolean => {
 };
 
 export const logout = (): void => {
+  const refreshToken = getRefreshToken();
+  if (refreshToken) {
+    // End the session on the server too; local state is cleared either way
+    fetch(`${API_BASE_URL}/auth/logout`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    }).catch(() => undefined);
+  }
   removeToken();
+  removeRefreshToken();
   removeUserId();
   removeUserRole();
 };
@@ -73,37 +102,87 @@ export const getAuthHeaders = (): HeadersInit => {
 };
 
 // Token expiration check
-export const isTokenExpired = (): boolean => {
+export const isTokenExpired = (marginSeconds = 0): boolean => {
   const token = getToken();
   if (!token) return true;
   
   try {
     const payload = JSON.parse(atob(token.split('.')[1]));
     const currentTime = Date.now() / 1000;
-    return payload.exp < currentTime;
+    return payload.exp < currentTime + marginSeconds;
   } catch {
     return true;
   }
 };
 
-// Auto logout on token expiration
-export const checkTokenExpiration = (): void => {
+let refreshInFlight: Promise<boolean> | null = null;
+
+// Exchange the refresh token for a new pair; concurrent callers share one request,
+// since each refresh token can only be used once
+export const refreshAccessToken = (): Promise<boolean> => {
+  const refreshToken = getRefreshToken();
+  if (!refreshToken) {
+    return Promise.resolve(false);
+  }
+  if (!refreshInFlight) {
+    refreshInFlight = fetch(`${API_BASE_URL}/auth/refresh`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    })
+      .then(async response => {
+        if (!response.ok) {
+          return false;
+        }
+        const data: AuthToken = await response.json();
+        setToken(data.access_token);
+        if (data.refresh_token) {
+          setRefreshToken(data.refresh_token);
+        }
+        return true;
+      })
+      .catch(() => false)
+      .finally(() => {
+        refreshInFlight = null;
+      });
+  }
+  return refreshInFlight;
+};
+
+// Renew the access token before it expires; log out when that is no longer possible
+export const checkTokenExpiration = async (): Promise<void> => {
   // Don't redirect if we're on the signup or login page
   const currentPath = window.location.pathname;
   if (currentPath === '/signup' || currentPath === '/login') {
     return;
   }
   
-  if (isTokenExpired()) {
-    logout();
-    window.location.href = '/login';
+  if (isTokenExpired(REFRESH_MARGIN_SECONDS)) {
+    if (await refreshAccessToken()) {
+      return;
+    }
+    if (isTokenExpired()) {
+      logout();
+      window.location.href = '/login';
+    }
   }
 };
 
+// fetch for API calls: on a 401, renew the access token and retry once with it.
+// The body must be re-sendable (string, FormData or Blob), as every caller's is.
+export const authFetch = async (input: RequestInfo | URL, init: RequestInit = {}): Promise<Response> => {
+  const response = await fetch(input, init);
+  if (response.status !== 401 || !(await refreshAccessToken())) {
+    return response;
+  }
+  const headers = new Headers(init.headers);
+  headers.set('Authorization', `Bearer ${getToken()}`);
+  return fetch(input, { ...init, headers });
+};
+
 // Check token expiration every minute
 setInterval(checkTokenExpiration, 60000); 
-
-const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+checkTokenExpiration();
 
 export const viewPitchDeck = async (applicationId: number): Promise<string> => {
   const token = localStorage.getItem('access_token');
@@ -113,7 +192,7 @@ export const viewPitchDeck = async (applicationId: number): Promise<string> => {
   }
 
   try {
-    const response = await fetch(`${API_BASE_URL}/applications/download-pitch-deck/${applicationId}`, {
+    const response = await authFetch(`${API_BASE_URL}/applications/download-pitch-deck/${applicationId}`, {
       headers: {
         'Authorization': `Bearer ${token}`
       }
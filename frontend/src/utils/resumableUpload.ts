@@ -0,0 +1,130 @@
+// Resumable pitch deck uploads (backend: /resumable-uploads)
+import { authFetch } from './auth';
+
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
+const CHUNK_SIZE = 2 * 1024 * 1024;
+const MAX_RETRIES = 5;
+const STORAGE_PREFIX = 'resumable_upload:';
+
+export interface ResumableUploadResult {
+  message: string;
+  filename: string;
+  pitch_deck_file_path: string;
+  pitch_deck_file_size: number;
+}
+
+const authHeaders = (): Record<string, string> => ({
+  'Authorization': `Bearer ${localStorage.getItem('access_token')}`,
+});
+
+// Same file picked again (e.g. after a reload) resumes the earlier upload
+const fileKey = (file: File): string => `${STORAGE_PREFIX}${file.name}:${file.size}:${file.lastModified}`;
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+const errorDetail = async (response: Response): Promise<string> => {
+  try {
+    const data = await response.json();
+    return data.detail || response.statusText;
+  } catch {
+    return response.statusText;
+  }
+};
+
+const createUpload = async (file: File): Promise<string> => {
+  const response = await authFetch(`${API_BASE_URL}/resumable-uploads`, {
+    method: 'POST',
+    headers: { ...authHeaders(), 'Content-Type': 'application/json' },
+    body: JSON.stringify({ filename: file.name, content_type: file.type, size: file.size }),
+  });
+  if (!response.ok) {
+    throw new Error(await errorDetail(response));
+  }
+  const data = await response.json();
+  return data.id;
+};
+
+// Bytes the server already has, or null if the upload is gone
+const fetchOffset = async (uploadId: string): Promise<number | null> => {
+  const response = await authFetch(`${API_BASE_URL}/resumable-uploads/${uploadId}`, {
+    method: 'HEAD',
+    headers: authHeaders(),
+  });
+  if (!response.ok) {
+    return null;
+  }
+  return parseInt(response.headers.get('Upload-Offset') || '0');
+};
+
+export const uploadPitchDeckResumable = async (
+  file: File,
+  onProgress?: (fraction: number) => void
+): Promise<ResumableUploadResult> => {
+  const key = fileKey(file);
+  let uploadId = localStorage.getItem(key);
+  let offset = uploadId ? await fetchOffset(uploadId) : null;
+  if (uploadId === null || offset === null) {
+    uploadId = await createUpload(file);
+    localStorage.setItem(key, uploadId);
+    offset = 0;
+  }
+
+  let retries = 0;
+  while (offset < file.size) {
+    onProgress?.(offset / file.size);
+    try {
+      const response = await authFetch(`${API_BASE_URL}/resumable-uploads/${uploadId}`, {
+        method: 'PATCH',
+        headers: {
+          ...authHeaders(),
+          'Content-Type': 'application/offset+octet-stream',
+          'Upload-Offset': offset.toString(),
+        },
+        body: file.slice(offset, offset + CHUNK_SIZE),
+      });
+      if (response.ok || response.status === 409) {
+        // 409: the server has a different offset (e.g. a chunk landed before the connection dropped)
+        const serverOffset = response.headers.get('Upload-Offset');
+        if (serverOffset === null) {
+          throw new Error(await errorDetail(response));
+        }
+        offset = parseInt(serverOffset);
+        retries = 0;
+        continue;
+      }
+      if (response.status < 500) {
+        localStorage.removeItem(key);
+        throw new Error(await errorDetail(response));
+      }
+    } catch (err) {
+      if (!(err instanceof TypeError)) {
+        throw err;
+      }
+      // Network error: fall through and retry from the server's offset
+    }
+
+    retries += 1;
+    if (retries > MAX_RETRIES) {
+      throw new Error('Upload interrupted. Select the same file again to resume.');
+    }
+    await sleep(1000 * 2 ** retries);
+    const serverOffset = await fetchOffset(uploadId).catch(() => offset);
+    if (serverOffset === null) {
+      localStorage.removeItem(key);
+      throw new Error('Upload expired. Please try again.');
+    }
+    offset = serverOffset;
+  }
+  onProgress?.(1);
+
+  const response = await authFetch(`${API_BASE_URL}/resumable-uploads/${uploadId}/finalize`, {
+    method: 'POST',
+    headers: authHeaders(),
+  });
+  if (!response.ok) {
+    throw new Error(await errorDetail(response));
+  }
+  localStorage.removeItem(key);
+  return response.json();
+};